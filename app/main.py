@@ -1,5 +1,9 @@
 from fastapi import FastAPI
 from app.routes.customer_api import router as customer_router
+from app.routes.ai_routes import router as ai_router
+from app.services.llm_gateway import get_metrics as get_llm_metrics
+from app.utils.shared_cache import get_shared_cache
+from app.services.semantic_cache import semantic_cache
 
 app = FastAPI(
     title="금융 데이터 분석 API",
@@ -9,10 +13,21 @@ app = FastAPI(
 
 # 라우터 등록
 app.include_router(customer_router, prefix="/api", tags=["고객 데이터"])
+app.include_router(ai_router, prefix="/api/ai", tags=["AI 분석"])
 
 @app.get("/")
 def read_root():
     return {
         "message": "금융 데이터 분석 API에 오신 것을 환영합니다.",
         "documentation": "/docs"
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics/llm")
+def read_llm_metrics():
+    """LLM 게이트웨이 호출/재시도 지표와 서킷 브레이커 상태를 반환합니다."""
+    return get_llm_metrics()
+
+@app.get("/metrics/cache")
+def read_cache_metrics():
+    """워커 간 공유 캐시와 현재 워커의 질문 의미 캐시 상태를 반환합니다."""
+    return {**get_shared_cache().stats(), "semantic": semantic_cache.stats()}
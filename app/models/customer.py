@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, field_serializer, model_validator
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from typing import List, Optional
 
@@ -18,18 +19,48 @@ class MonthlyCustomerData(BaseModel):
     debt: float
     loan_payments: float
     overdue_payments: Optional[int] = 0
-    
+
+    @field_serializer("month", when_used="json")
+    def serialize_month(self, month: datetime) -> str:
+        # 저장 파일과 같은 YYYY-MM-DD 형식으로 응답
+        return month.strftime("%Y-%m-%d")
+
 class CustomerTimeSeriesData(BaseModel):
     customer_id: str
     name: str
+    profile_type: Optional[str] = None
     monthly_data: List[MonthlyCustomerData]
-    
-    def get_latest_data(self) -> MonthlyCustomerData:
+
+    # 이진 탐색용 월 목록 (monthly_data와 같은 순서)
+    _months: Optional[List[datetime]] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def sort_monthly_data(self):
+        """월별 데이터를 시간순으로 유지합니다. (이미 정렬된 경우 O(n) 확인만 수행)"""
+        data = self.monthly_data
+        if any(data[i].month > data[i + 1].month for i in range(len(data) - 1)):
+            data.sort(key=lambda x: x.month)
+        return self
+
+    def _month_keys(self) -> List[datetime]:
+        if self._months is None or len(self._months) != len(self.monthly_data):
+            self._months = [data.month for data in self.monthly_data]
+        return self._months
+
+    def append(self, data: MonthlyCustomerData) -> None:
+        """마지막 월 이후의 월별 데이터를 추가합니다."""
+        if self.monthly_data and data.month <= self.monthly_data[-1].month:
+            raise ValueError("추가할 월은 마지막 월 이후여야 합니다.")
+        self._month_keys().append(data.month)
+        self.monthly_data.append(data)
+
+    def get_latest_data(self) -> Optional[MonthlyCustomerData]:
         """가장 최근 월 데이터 반환"""
-        return sorted(self.monthly_data, key=lambda x: x.month, reverse=True)[0]
-    
+        return self.monthly_data[-1] if self.monthly_data else None
+
     def get_data_for_period(self, start_month: datetime, end_month: datetime) -> List[MonthlyCustomerData]:
         """특정 기간의 데이터 반환"""
-        return [data for data in self.monthly_data 
-                if start_month <= data.month <= end_month]
-
+        months = self._month_keys()
+        start = bisect_left(months, start_month) if start_month else 0
+        end = bisect_right(months, end_month) if end_month else len(months)
+        return self.monthly_data[start:end]
@@ -1,43 +1,56 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.services.ai_agent import analyze_credit_info, analyze_credit_trend, predict_future_credit, recommend_financial_products
-from app.routes.customer_routes import customers_db  # 실제 고객 정보 저장소 불러오기
-import openai
-from config.settings import OPENAI_API_KEY
+from typing import List, Optional
+from app.utils.responses import ORJSONResponse
+from app.services.ai_analyzer import CustomerAnalyzer, analyze_customer_data, analyze_credit_trend
+from app.services.credit_simulation import forecast_customer, DEFAULT_MONTHS_AHEAD, DEFAULT_PATHS
+from app.services.text_summarizer import summarize_texts, DEFAULT_SENTENCES
 
-router = APIRouter()
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+router = APIRouter(default_response_class=ORJSONResponse)
+
+def _response(result):
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return {"response": result}
 
 @router.post("/analyze_credit/")
-def analyze_credit(name: str, request_text: str):
+def analyze_credit(name: str, request_text: Optional[str] = None, explain: bool = False):
     """
-    고객 신용 정보를 바탕으로 GPT 분석을 수행하는 API
+    고객 신용 정보를 분석하는 API
+
+    질문이 없으면 로컬 신용 위험 모델의 대출 심사 결과를 반환하고, explain이 참이면 LLM 설명을 덧붙입니다.
     """
-    # 실제 고객 정보 조회 (딕셔너리에서 찾기)
-    if name not in customers_db:
-        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    return _response(analyze_customer_data(customer_name=name, request_text=request_text, explain=explain))
 
-    customer_data = customers_db[name]  # 등록된 고객 정보 가져오기
+@router.post("/summarize/")
+def summarize(texts: List[str],
+              sentences: int = Query(DEFAULT_SENTENCES, ge=1, le=10),
+              mode: str = Query("auto", description="auto, extractive, llm")):
+    """
+    여러 텍스트를 한 번에 요약하는 API
 
-    response = analyze_credit_info(customer_data, request_text)
-    return {"response": response}
+    로컬 TF-IDF 추출 요약을 먼저 사용하고, 그것으로 부족한 텍스트만 모아 LLM을 한 번 호출합니다.
+    요약 결과는 텍스트 해시로 캐시됩니다.
+
+    Args:
+        texts: 요약할 텍스트 목록 (요청 본문)
+        sentences: 텍스트당 요약 문장 수
+        mode: 요약 방식 (auto: 필요한 텍스트만 LLM, extractive: 로컬만, llm: 모두 LLM)
+    """
+    try:
+        return summarize_texts(texts, sentences, mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/summarize_response/")
 def summarize_response(text: str = Query(..., description="요약할 텍스트")):
     """
-    GPT-4o-mini를 사용하여 긴 응답을 요약하는 API
+    긴 분석 응답 하나를 3문장으로 요약하는 API (summarize와 같은 방식)
     """
-    summary_prompt = f"다음 분석 결과를 3줄 요약해 주세요:\n\n{text}"
-
-    summary_response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "당신은 금융 전문가입니다."},
-            {"role": "user", "content": summary_prompt}
-        ],
-        max_tokens=150
-    )
-
-    return {"summary": summary_response.choices[0].message.content}
+    try:
+        result = summarize_texts([text], 3)["results"][0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"summary": result["summary"], "method": result["method"]}
 
 @router.get("/analyze_credit_trend/{customer_id}")
 def analyze_credit_trend_route(
@@ -48,21 +61,27 @@ def analyze_credit_trend_route(
     """
     고객의 신용도 추세를 분석하는 API
     """
-    response = analyze_credit_trend(customer_id, start_date, end_date)
-    return {"response": response}
+    return _response(analyze_credit_trend(customer_id, None, start_date, end_date))
 
 @router.get("/predict_future_credit/{customer_id}")
-def predict_future_credit_route(customer_id: str, months_ahead: int = 6):
+def predict_future_credit_route(customer_id: str, months_ahead: int = Query(DEFAULT_MONTHS_AHEAD, ge=1, le=36)):
     """
-    고객의 미래 신용 점수를 예측하는 API
+    고객의 미래 신용 점수를 예측하는 API (몬테카를로 예측 구간)
     """
-    response = predict_future_credit(customer_id, months_ahead)
-    return {"response": response}
+    try:
+        return {"response": forecast_customer(customer_id, months_ahead, DEFAULT_PATHS)}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/recommend_financial_products/{customer_id}")
 def recommend_financial_products_route(customer_id: str):
     """
     고객에게 적합한 금융 상품을 추천하는 API
     """
-    response = recommend_financial_products(customer_id)
-    return {"response": response}
+    try:
+        analyzer = CustomerAnalyzer(customer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _response(analyzer.recommend_financial_products())
@@ -1,12 +1,51 @@
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
-from fastapi.responses import FileResponse
-from app.utils.data_generator import generate_multiple_customers, save_to_json, load_customer_data
-from app.services.ai_analyzer import analyze_customer_data, analyze_credit_trend
-from app.services.report_generator import generate_credit_report, generate_timeseries_report
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request, File, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from app.utils.data_generator import generate_multiple_customers
+from app.utils.customer_store import get_store
+from app.utils.responses import ORJSONResponse
+from app.utils.analysis_store import get_analyses
+from app.utils.portfolio_arrays import get_portfolio
+from app.utils.report_store import record_not_modified, storage_stats
+from app.utils.alert_log import follow_alerts, recent_alerts
+from app.utils.http_cache import make_etag, cache_headers, is_not_modified, not_modified
+from app.models.customer import MonthlyCustomerData, CustomerTimeSeriesData
+from app.services.ai_analyzer import analyze_customer_data, analyze_credit_trend, explain_credit_score, decision_key
+from app.services.analysis_schemas import select_fields
+from app.services.credit_scorer import train_model, score_customers, score_factors, model_version
+from app.services.data_import import detect_format, import_customer_file
+from app.services.data_export import check_export_options, export_portfolio, export_filename, export_media_type
+from app.services.anomaly_detector import detect_appended, get_detector, ALERT_KINDS
+from app.services.credit_simulation import forecast_customer, forecast_portfolio, DEFAULT_MONTHS_AHEAD, DEFAULT_PATHS
+from app.services.timeseries import build_series
+from app.services.report_generator import (generate_credit_report, generate_timeseries_report, get_report_key,
+                                          generate_portfolio_report, get_portfolio_report_key)
 from typing import Optional, List
+import base64
 import os
+import numpy as np
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+def _model_response(model, headers=None):
+    """
+    캐시된 검증 모델을 orjson으로 직렬화하여 반환합니다.
+    
+    모델은 저장소에서 이미 검증되었으므로 응답 시 재검증하지 않습니다.
+    """
+    return ORJSONResponse(model.model_dump(mode="json"), headers=headers)
+
+def _data_etag(customer_id=None, *parts):
+    """
+    저장소의 데이터 버전으로 ETag를 만듭니다. (매니페스트만 참조)
+    
+    Returns:
+        (ETag, 마지막 수정 시각)
+    """
+    version = get_store().data_version(customer_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    tag, updated_at = version
+    return make_etag(customer_id or "customers", tag, *parts), updated_at
 
 @router.post("/generate_customers/")
 def create_customers(count: int = 5, profile_distribution: dict = None):
@@ -19,15 +58,8 @@ def create_customers(count: int = 5, profile_distribution: dict = None):
     """
     customers = generate_multiple_customers(count, profile_distribution)
     
-    # JSON 파일로 저장
-    filepath = save_to_json(customers)
-    
-    # 개별 고객 파일로도 저장
-    for customer in customers:
-        customer_filepath = save_to_json(
-            customer, 
-            f"customer_{customer['customer_id']}.json"
-        )
+    # JSON 파일로 저장 (전체 파일, 개별 고객 파일, 저장소 매니페스트)
+    filepath = get_store().replace_all(customers)
     
     return {
         "message": f"{count}명의 고객 데이터가 생성되었습니다.",
@@ -35,51 +67,469 @@ def create_customers(count: int = 5, profile_distribution: dict = None):
         "customers": [{"id": c["customer_id"], "name": c["name"]} for c in customers]
     }
 
+# 고객 목록에서 선택 가능한 필드 (매니페스트 항목에서 추출)
+CUSTOMER_LIST_FIELDS = {
+    "id": lambda cid, e: cid,
+    "name": lambda cid, e: e["name"],
+    "profile_type": lambda cid, e: e.get("profile_type"),
+    "version": lambda cid, e: e["version"],
+    "months": lambda cid, e: e["summary"]["months"],
+    "first_month": lambda cid, e: e["summary"]["first_month"],
+    "last_month": lambda cid, e: e["summary"]["last_month"],
+    "credit_score": lambda cid, e: (e["summary"]["latest"] or {}).get("credit_score"),
+    "overdue_total": lambda cid, e: e["summary"]["overdue_total"],
+}
+
+def _encode_cursor(customer_id):
+    return base64.urlsafe_b64encode(customer_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
 @router.get("/customers/")
-def get_customers():
-    """모든 고객 목록을 반환합니다."""
-    customers = load_customer_data()
-    return {
-        "count": len(customers),
-        "customers": [{"id": c["customer_id"], "name": c["name"]} for c in customers]
-    }
+def get_customers(request: Request,
+                 cursor: Optional[str] = None, 
+                 limit: int = Query(100, ge=1, le=1000),
+                 fields: str = "id,name",
+                 profile_type: Optional[str] = None):
+    """
+    고객 목록을 페이지 단위로 반환합니다.
+    
+    Args:
+        cursor: 이전 응답의 next_cursor 값
+        limit: 페이지 크기 (최대 1000)
+        fields: 반환할 필드 (쉼표 구분, 예: id,name,profile_type,credit_score)
+        profile_type: 프로필 유형 필터 (average, high_risk, premium)
+    """
+    field_names = [f.strip() for f in fields.split(",") if f.strip()]
+    invalid = [f for f in field_names if f not in CUSTOMER_LIST_FIELDS]
+    if invalid or not field_names:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"지원하지 않는 필드입니다: {', '.join(invalid)} (가능: {', '.join(CUSTOMER_LIST_FIELDS)})"
+        )
+    
+    etag, updated_at = _data_etag(None, request.url.query)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    after = _decode_cursor(cursor) if cursor else None
+    page, next_after, total = get_store().list_customers(profile_type, after, limit)
+    getters = [(f, CUSTOMER_LIST_FIELDS[f]) for f in field_names]
+    
+    return ORJSONResponse({
+        "count": total,
+        "customers": [{f: getter(cid, entry) for f, getter in getters} for cid, entry in page],
+        "next_cursor": _encode_cursor(next_after) if next_after else None
+    }, headers=cache_headers(etag, updated_at))
 
-@router.get("/customer/{customer_id}")
-def get_customer(customer_id: str):
+@router.get("/portfolio/")
+def get_portfolio_overview(request: Request):
+    """
+    전체 고객 포트폴리오의 최신 월 항목별 평균/합계를 반환합니다.
+    
+    워커 간 공유되는 포트폴리오 배열 세그먼트에서 바로 계산합니다.
+    """
+    etag, updated_at = _data_etag(None, "portfolio")
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    segment = get_portfolio()
+    latest = segment.latest()
+    has_data = bool(len(latest))
+    return ORJSONResponse({
+        "generation": segment.generation,
+        "customers": len(segment.customer_ids),
+        "months": len(segment.months),
+        "period": [str(segment.months[0]), str(segment.months[-1])] if len(segment.months) else None,
+        "latest_mean": {f: round(float(v), 2) for f, v in zip(segment.metrics, np.nanmean(latest, axis=0))} if has_data else {},
+        "latest_total": {f: float(v) for f, v in zip(segment.metrics, np.nansum(latest, axis=0))} if has_data else {}
+    }, headers=cache_headers(etag, updated_at))
+
+@router.get("/customer/{customer_id}", response_model=CustomerTimeSeriesData)
+def get_customer(customer_id: str, request: Request):
     """특정 고객의 정보를 반환합니다."""
-    customer = load_customer_data(customer_id)
+    etag, updated_at = _data_etag(customer_id)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    customer = get_store().get_customer_model(customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
-    return customer
+    return _model_response(customer, cache_headers(etag, updated_at))
+
+@router.get("/customer/{customer_id}/series")
+def get_customer_series(customer_id: str, 
+                       request: Request,
+                       metrics: str = "credit_score",
+                       start: Optional[str] = None, 
+                       end: Optional[str] = None,
+                       max_points: Optional[int] = Query(None, ge=3),
+                       method: str = "lttb"):
+    """
+    차트용 시계열 데이터를 반환합니다.
+    
+    Args:
+        customer_id: 고객 ID
+        metrics: 반환할 항목 (쉼표 구분, 예: credit_score,debt)
+        start: 시작 월 (YYYY-MM 형식)
+        end: 종료 월 (YYYY-MM 형식)
+        max_points: 최대 점 수 (초과 시 서버에서 다운샘플링)
+        method: 다운샘플링 방식 (lttb, mean)
+    """
+    etag, updated_at = _data_etag(customer_id, "series", request.url.query)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    columns = get_store().get_columns(customer_id)
+    if columns is None:
+        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    
+    metric_names = [m.strip() for m in metrics.split(",") if m.strip()]
+    try:
+        series = build_series(columns, metric_names, start, end, max_points, method)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ORJSONResponse(
+        {"customer_id": customer_id, "start": start, "end": end, **series},
+        headers=cache_headers(etag, updated_at)
+    )
+
+@router.get("/customer/{customer_id}/analyses")
+def get_customer_analyses(customer_id: str, current_only: bool = True,
+                          analysis_type: Optional[str] = None, fields: Optional[str] = None):
+    """
+    온라인/배치 분석에서 저장된 고객 분석 결과를 LLM 호출 없이 반환합니다.
+    
+    구조화 분석은 필드 단위로 저장되므로 필요한 부분만 골라 받을 수 있습니다.
+    (예: analysis_type=financial_products&fields=loans)
+    
+    Args:
+        customer_id: 고객 ID
+        current_only: 현재 데이터 버전으로 만든 결과만 반환할지 여부
+        analysis_type: 지정하면 해당 유형만 반환
+        fields: 반환할 필드 목록 (쉼표 구분, analysis_type 필요)
+    """
+    version = get_store().data_version(customer_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    
+    analyses = get_analyses(customer_id, version[0] if current_only else None)
+    if analysis_type == "credit_decision":
+        # 대출 심사 의견은 현재 신용 위험 모델 버전의 키로 저장됨
+        analysis_type = decision_key(model_version())
+    if analysis_type:
+        if analysis_type not in analyses:
+            raise HTTPException(status_code=404, detail="저장된 분석 결과가 없습니다.")
+        analyses = {analysis_type: analyses[analysis_type]}
+    if fields:
+        if not analysis_type:
+            raise HTTPException(status_code=400, detail="fields를 사용하려면 analysis_type을 지정해야 합니다.")
+        record = analyses[analysis_type]
+        if not isinstance(record["result"], dict):
+            raise HTTPException(status_code=400, detail="구조화되지 않은 분석 결과입니다.")
+        try:
+            result = select_fields(record["result"], [name.strip() for name in fields.split(",") if name.strip()])
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=e.args[0])
+        analyses = {analysis_type: {**record, "result": result}}
+    return {"customer_id": customer_id, "data_version": version[0], "analyses": analyses}
+
+@router.post("/customer/{customer_id}/monthly_data/")
+def append_monthly_data(customer_id: str, monthly_data: List[MonthlyCustomerData], background_tasks: BackgroundTasks):
+    """
+    기존 고객에게 새로운 월별 데이터를 추가합니다.
+    
+    전체 데이터셋을 다시 쓰지 않고 샤드 로그에 추가하며, 로그가 커지면 백그라운드에서 병합합니다.
+    
+    Args:
+        customer_id: 고객 ID
+        monthly_data: 추가할 월별 데이터 목록
+    """
+    if not monthly_data:
+        raise HTTPException(status_code=400, detail="추가할 월별 데이터가 없습니다.")
+    
+    rows = []
+    for data in monthly_data:
+        row = data.model_dump()
+        row["month"] = data.month.strftime("%Y-%m-%d")
+        rows.append(row)
+    
+    store = get_store()
+    try:
+        entry, shard_to_compact = store.append_monthly_data(customer_id, rows)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 로그가 임계치를 넘은 샤드는 백그라운드에서 병합
+    if shard_to_compact is not None:
+        background_tasks.add_task(store.compact, shard_to_compact)
+    
+    # 이상 감지 (경보는 /api/alerts/stream 구독자에게 전달)
+    background_tasks.add_task(detect_appended, customer_id, rows)
+    
+    return {
+        "message": f"{len(rows)}개월의 데이터가 추가되었습니다.",
+        "customer_id": customer_id,
+        "version": entry["version"],
+        "summary": entry["summary"]
+    }
+
+@router.get("/alerts/")
+def get_alerts(limit: int = Query(100, ge=1, le=1000)):
+    """최근 이상 감지 경보를 최신순으로 반환합니다."""
+    return {"alerts": recent_alerts(limit), "detector": get_detector().stats()}
+
+@router.get("/alerts/stream")
+def stream_alerts(request: Request, customer_id: Optional[str] = None, kinds: Optional[str] = None):
+    """
+    이상 감지 경보를 Server-Sent Events로 실시간 전달합니다.
+    
+    연결이 끊긴 뒤 다시 연결하면 Last-Event-ID 이후의 경보부터 이어서 받습니다.
+    
+    Args:
+        customer_id: 특정 고객의 경보만 받기
+        kinds: 받을 경보 종류 (쉼표 구분, 예: credit_score_drop,overdue_spike)
+    """
+    kind_set = set(kinds.split(",")) if kinds else None
+    unknown = sorted(kind_set - set(ALERT_KINDS)) if kind_set else []
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 경보 종류입니다: {', '.join(unknown)}")
+    
+    last_event_id = request.headers.get("last-event-id")
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        follow_alerts(after, customer_id, kind_set),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/customers/import/")
+def import_customers(background_tasks: BackgroundTasks, file: UploadFile = File(...), format: Optional[str] = None):
+    """
+    CSV 또는 Parquet 파일의 고객 월별 데이터를 저장소로 가져옵니다.
+    
+    파일은 청크 단위로 읽고 검증하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+    컬럼: customer_id, name(새 고객), profile_type(선택), month, credit_score, income, expenses,
+    savings, debt, loan_payments, overdue_payments(선택)
+    
+    Args:
+        file: 업로드 파일
+        format: 파일 형식 (csv, parquet / 생략하면 확장자로 판단)
+    """
+    try:
+        fmt = detect_format(file.filename, format)
+        result = import_customer_file(file.file, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 로그가 임계치를 넘은 샤드는 백그라운드에서 병합
+    store = get_store()
+    for shard in result["compact_shards"]:
+        background_tasks.add_task(store.compact, shard)
+    return result
+
+@router.get("/customers/export/")
+def export_customers(format: str = "csv",
+                     compression: Optional[str] = None,
+                     start_date: Optional[str] = None,
+                     end_date: Optional[str] = None,
+                     profile_type: Optional[str] = None):
+    """
+    전체 고객의 월별 데이터를 한 번의 요청으로 내려받습니다.
+    
+    고객을 묶음 단위로 읽어 바로 전송하므로 고객 수와 관계없이 서버 메모리 사용량이 일정합니다.
+    컬럼은 가져오기(/customers/import/)와 같아 내보낸 파일을 그대로 다시 가져올 수 있습니다.
+    
+    Args:
+        format: 파일 형식 (csv, ndjson, parquet)
+        compression: 압축 방식 (gzip, zstd / parquet은 파일 내부 코덱으로 적용)
+        start_date: 시작 월 (YYYY-MM 형식)
+        end_date: 종료 월 (YYYY-MM 형식)
+        profile_type: 프로필 유형 필터 (average, high_risk, premium)
+    """
+    try:
+        fmt, compression, start_date, end_date = check_export_options(format, compression, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        export_portfolio(fmt, compression, start_date, end_date, profile_type),
+        media_type=export_media_type(fmt, compression),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(fmt, compression)}"',
+            "Cache-Control": "no-store"
+        }
+    )
+
+@router.post("/store/compact/")
+def compact_store():
+    """샤드 로그에 쌓인 월별 데이터를 고객 파일에 병합합니다."""
+    merged = get_store().compact()
+    return {"message": f"{merged}건의 월별 데이터가 병합되었습니다."}
 
-@router.get("/customer/name/{customer_name}")
-def get_customer_by_name(customer_name: str):
+@router.get("/reports/stats")
+def get_report_stats():
+    """보고서 저장 용량(중복 제거 포함)과 재사용 비율을 반환합니다."""
+    return storage_stats()
+
+@router.get("/customers/search/")
+def search_customers(request: Request,
+                    q: str = Query(..., min_length=1, max_length=50),
+                    limit: int = Query(20, ge=1, le=1000),
+                    fuzzy: bool = True):
+    """
+    고객 이름으로 검색하여 일치하는 모든 고객을 순위순으로 반환합니다.
+    
+    정확히 일치 → 접두어 일치(음절 중간까지 입력해도 일치) → 초성 일치(ㄱㅁㅈ, 김ㅁㅈ)
+    → 오타 허용 일치(자모 하나 차이) 순으로 정렬합니다.
+    
+    Args:
+        q: 검색어 (예: 김민준, 김민, 김미, ㄱㅁㅈ, 김민존)
+        limit: 최대 반환 고객 수
+        fuzzy: 오타 허용 검색 여부
+    """
+    etag, updated_at = _data_etag(None, "search", request.url.query)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    store = get_store()
+    results, total = store.name_index().search(q, limit, fuzzy)
+    customers = []
+    for result in results:
+        entry = store.get_entry(result["customer_id"]) or {}
+        latest = (entry.get("summary") or {}).get("latest") or {}
+        customers.append({
+            "id": result["customer_id"],
+            "name": result["name"],
+            "profile_type": entry.get("profile_type"),
+            "credit_score": latest.get("credit_score"),
+            "match": result["match"],
+            "distance": result["distance"]
+        })
+    
+    return ORJSONResponse({"query": q, "count": total, "customers": customers},
+                          headers=cache_headers(etag, updated_at))
+
+@router.get("/customer/name/{customer_name}", response_model=CustomerTimeSeriesData)
+def get_customer_by_name(customer_name: str, request: Request):
     """고객 이름으로 정보를 반환합니다."""
-    customer = load_customer_data(customer_name=customer_name)
+    store = get_store()
+    customer_id = store.find_id_by_name(customer_name)
+    if not customer_id:
+        raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
+    
+    etag, updated_at = _data_etag(customer_id)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at)
+    
+    customer = store.get_customer_model(customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="해당 고객 정보를 찾을 수 없습니다.")
-    return customer
+    return _model_response(customer, cache_headers(etag, updated_at))
 
 @router.post("/analyze/")
-def analyze_customer(customer_id: Optional[str] = None, customer_name: Optional[str] = None, request_text: str = None):
+def analyze_customer(customer_id: Optional[str] = None, customer_name: Optional[str] = None, request_text: str = None,
+                     explain: bool = False):
     """
     고객 데이터를 AI로 분석합니다.
     
     Args:
         customer_id: 고객 ID
         customer_name: 고객 이름
-        request_text: 분석 요청 텍스트
+        request_text: 분석 요청 텍스트 (없으면 로컬 모델의 대출 심사 결과)
+        explain: 질문이 없을 때 심사 결과를 LLM으로 설명한 문장을 함께 반환
     """
     if not customer_id and not customer_name:
         raise HTTPException(status_code=400, detail="고객 ID 또는 이름을 제공해야 합니다.")
     
-    result = analyze_customer_data(customer_id, customer_name, request_text)
+    result = analyze_customer_data(customer_id, customer_name, request_text, explain=explain)
     
     if isinstance(result, dict) and "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
     
     return {"response": result}
 
+@router.post("/credit_model/train/")
+def train_credit_model():
+    """현재 포트폴리오 데이터로 신용 위험 모델을 학습하여 새 버전으로 저장합니다."""
+    try:
+        return train_model()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/credit_scores/")
+def get_credit_scores(customer_ids: Optional[List[str]] = None):
+    """
+    여러 고객의 대출 승인 확률과 금리 등급을 로컬 모델로 한 번에 계산합니다.
+    
+    Args:
+        customer_ids: 고객 ID 목록 (요청 본문, 생략하면 전체 고객)
+    """
+    try:
+        return score_customers(customer_ids)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/customer/{customer_id}/credit_score")
+def get_credit_score(customer_id: str, explain: bool = False):
+    """
+    고객의 대출 승인 확률과 금리 등급을 반환합니다.
+    
+    Args:
+        explain: true이면 주요 요인을 LLM으로 설명한 문장을 함께 반환
+    """
+    try:
+        if explain:
+            return explain_credit_score(customer_id)
+        result, factors = score_factors(customer_id)
+        return {"score": result, "factors": [{"feature": n, "value": v, "contribution": c} for n, v, c in factors]}
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/credit_forecasts/")
+def get_credit_forecasts(customer_ids: Optional[List[str]] = None,
+                         months_ahead: int = Query(DEFAULT_MONTHS_AHEAD, ge=1, le=36),
+                         paths: int = Query(DEFAULT_PATHS, ge=100, le=20000)):
+    """
+    여러 고객(생략하면 전체 포트폴리오)의 신용 점수 예측 구간을 몬테카를로 시뮬레이션으로 계산합니다.
+    
+    Args:
+        customer_ids: 고객 ID 목록 (요청 본문, 생략하면 전체 고객)
+        months_ahead: 예측 개월 수
+        paths: 고객당 시뮬레이션 경로 수
+    """
+    try:
+        return forecast_portfolio(customer_ids, months_ahead, paths)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@router.get("/customer/{customer_id}/credit_forecast")
+def get_credit_forecast(customer_id: str,
+                        months_ahead: int = Query(DEFAULT_MONTHS_AHEAD, ge=1, le=36),
+                        paths: int = Query(DEFAULT_PATHS, ge=100, le=20000)):
+    """
+    고객의 향후 신용 점수 백분위수 구간(p5/p25/p50/p75/p95)을 반환합니다.
+    
+    같은 데이터와 인자에 대해서는 항상 같은 결과를 반환합니다.
+    """
+    try:
+        return forecast_customer(customer_id, months_ahead, paths)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/analyze_trend/")
 def analyze_trend(customer_id: Optional[str] = None, customer_name: Optional[str] = None, 
                  start_date: Optional[str] = None, end_date: Optional[str] = None):
@@ -102,35 +552,55 @@ def analyze_trend(customer_id: Optional[str] = None, customer_name: Optional[str
     
     return {"response": result}
 
-@router.get("/generate_report/")
-def create_report(customer_id: Optional[str] = None, customer_name: Optional[str] = None, 
-                 analysis_question: Optional[str] = None):
+def _report_response(request, kind, generate, customer_id, customer_name, *params):
     """
-    고객 신용 보고서를 생성합니다.
+    보고서를 생성하거나 저장된 보고서를 반환합니다.
     
-    Args:
-        customer_id: 고객 ID
-        customer_name: 고객 이름
-        analysis_question: 분석에 사용할 질문
+    보고서 키(데이터 버전 + 인자)가 If-None-Match와 같으면 저장소나 LLM을 거치지 않고 304를 반환합니다.
     """
-    if not customer_id and not customer_name:
-        raise HTTPException(status_code=400, detail="고객 ID 또는 이름을 제공해야 합니다.")
-    
     try:
-        report_filename = generate_credit_report(customer_id, customer_name, analysis_question)
+        resolved_id, key = get_report_key(kind, customer_id, customer_name, *params)
+        etag = f'"{key}"'
+        _, updated_at = get_store().data_version(resolved_id)
+        if is_not_modified(request, etag, updated_at):
+            record_not_modified()
+            return not_modified(etag, updated_at)
+        
+        report_filename = generate(resolved_id, None, *params)
+        
+        # 키로 저장된 보고서만 캐시 검증 헤더를 붙임 (LLM 대체 보고서는 제외)
+        cacheable = os.path.basename(report_filename).endswith(f"_{key}.pdf")
         
         return FileResponse(
             path=report_filename,
             filename=os.path.basename(report_filename),
-            media_type="application/pdf"
+            media_type="application/pdf",
+            headers=cache_headers(etag, updated_at) if cacheable else {"Cache-Control": "no-store"}
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"보고서 생성 중 오류가 발생했습니다: {str(e)}")
 
+@router.get("/generate_report/")
+def create_report(request: Request, customer_id: Optional[str] = None, customer_name: Optional[str] = None, 
+                 analysis_question: Optional[str] = None):
+    """
+    고객 신용 보고서를 생성합니다.
+    
+    Args:
+        customer_id: 고객 ID
+        customer_name: 고객 이름
+        analysis_question: 분석에 사용할 질문
+    """
+    if not customer_id and not customer_name:
+        raise HTTPException(status_code=400, detail="고객 ID 또는 이름을 제공해야 합니다.")
+    
+    return _report_response(request, "credit", generate_credit_report, 
+                           customer_id, customer_name, analysis_question)
+
 @router.get("/generate_timeseries_report/")
-def create_timeseries_report(customer_id: Optional[str] = None, customer_name: Optional[str] = None,
+def create_timeseries_report(request: Request, customer_id: Optional[str] = None, customer_name: Optional[str] = None,
                             start_date: Optional[str] = None, end_date: Optional[str] = None):
     """
     고객의 시계열 데이터 보고서를 생성합니다.
@@ -144,15 +614,38 @@ def create_timeseries_report(customer_id: Optional[str] = None, customer_name: O
     if not customer_id and not customer_name:
         raise HTTPException(status_code=400, detail="고객 ID 또는 이름을 제공해야 합니다.")
     
+    return _report_response(request, "timeseries", generate_timeseries_report, 
+                           customer_id, customer_name, start_date, end_date)
+
+@router.get("/generate_portfolio_report/")
+def create_portfolio_report(request: Request, top: int = Query(20, ge=1, le=200)):
+    """
+    전체 고객 포트폴리오 요약 보고서를 생성합니다.
+    
+    신용 점수 분포, 프로필 유형별 현황, 부채/연소득 분포, 고위험 고객 목록과 경영진 요약을 포함합니다.
+    
+    Args:
+        top: 고위험 고객 목록에 넣을 고객 수
+    """
     try:
-        report_filename = generate_timeseries_report(customer_id, customer_name, start_date, end_date)
+        key = get_portfolio_report_key(top)
+        etag = f'"{key}"'
+        version = get_store().data_version()
+        updated_at = version[1] if version else None
+        if is_not_modified(request, etag, updated_at):
+            record_not_modified()
+            return not_modified(etag, updated_at)
+        
+        report_filename = generate_portfolio_report(top)
+        cacheable = os.path.basename(report_filename).endswith(f"_{key}.pdf")
         
         return FileResponse(
             path=report_filename,
             filename=os.path.basename(report_filename),
-            media_type="application/pdf"
+            media_type="application/pdf",
+            headers=cache_headers(etag, updated_at) if cacheable else {"Cache-Control": "no-store"}
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"보고서 생성 중 오류가 발생했습니다: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"보고서 생성 중 오류가 발생했습니다: {str(e)}")
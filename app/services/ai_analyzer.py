@@ -1,19 +1,132 @@
-import openai
-from config.settings import OPENAI_API_KEY
 import json
 from datetime import datetime
 from app.utils.data_generator import load_customer_data
+from app.services.llm_gateway import chat_completion, LLMUnavailableError
+from app.services.semantic_cache import semantic_cache
+from app.services.credit_scorer import ensure_model, score_factors, FEATURE_LABELS
+from app.services.credit_simulation import forecast_customer, DEFAULT_MONTHS_AHEAD
+from app.services.analysis_schemas import (TOKEN_BUDGETS, LENGTH_GUIDE, response_format, analysis_key, parse_analysis,
+                                           render_analysis)
+from app.utils.customer_store import get_store
+from app.utils.analysis_store import get_analysis, get_analyses, save_analysis
 
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+# 기본 지표 기반 분석문의 첫 줄 (LLM 대체 응답 식별용)
+FALLBACK_NOTICE = "※ AI 분석 서비스 응답 지연으로 기본 지표 기반 요약을 제공합니다."
+
+def format_forecast(forecast):
+    """
+    신용 점수 예측 구간을 월별 Markdown 목록으로 만듭니다.
+    
+    Args:
+        forecast: forecast_customer 결과
+    
+    Returns:
+        Markdown 형식의 텍스트
+    """
+    bands = forecast["bands"]
+    lines = []
+    for i, month in enumerate(forecast["months"]):
+        lines.append(f"- {month}: 중앙값 {bands['p50'][i]:.0f}점 "
+                     f"(50% 구간 {bands['p25'][i]:.0f}~{bands['p75'][i]:.0f}점, "
+                     f"90% 구간 {bands['p5'][i]:.0f}~{bands['p95'][i]:.0f}점)")
+    return "\n".join(lines)
+
+def is_fallback_narrative(text):
+    """LLM 대신 기본 지표로 만든 분석문인지 확인합니다."""
+    return isinstance(text, str) and text.startswith(FALLBACK_NOTICE)
+
+def fallback_narrative(name, latest_data, period_data=None):
+    """
+    LLM을 사용할 수 없을 때 로컬에서 계산한 지표로 기본 분석문을 만듭니다.
+    
+    Args:
+        name: 고객 이름
+        latest_data: 최신 월별 데이터
+        period_data: 기간 월별 데이터 (시간순, 선택적)
+    
+    Returns:
+        Markdown 형식의 분석 텍스트
+    """
+    income = latest_data["income"]
+    debt_to_income = latest_data["debt"] / income if income > 0 else 0
+    savings_to_income = latest_data["savings"] / income if income > 0 else 0
+    expense_ratio = latest_data["expenses"] / income * 100 if income > 0 else 0
+    score = latest_data["credit_score"]
+    
+    if score >= 750:
+        grade = "우수"
+    elif score >= 650:
+        grade = "보통"
+    else:
+        grade = "주의"
+    
+    lines = [
+        FALLBACK_NOTICE,
+        "",
+        f"## {name} 고객 재정 요약",
+        f"- 신용 점수: {score}점 ({grade})",
+        f"- 수입 대비 지출 비율: {expense_ratio:.1f}%",
+        f"- 부채 대 소득 비율: {debt_to_income:.2f}",
+        f"- 저축 대 소득 비율: {savings_to_income:.2f}",
+        f"- 월 가처분 소득: {income - latest_data['expenses']:,.0f}원",
+        f"- 연체 횟수(최근 월): {latest_data['overdue_payments']}회",
+    ]
+    
+    if period_data and len(period_data) > 1:
+        first, last = period_data[0], period_data[-1]
+        credit_change = last["credit_score"] - first["credit_score"]
+        debt_change_pct = (last["debt"] - first["debt"]) / first["debt"] * 100 if first["debt"] > 0 else 0
+        total_overdue = sum(d["overdue_payments"] or 0 for d in period_data)
+        lines += [
+            "",
+            f"## 추세 ({len(period_data)}개월)",
+            f"- 신용점수 변화: {credit_change:+d}점 ({first['credit_score']}점 → {last['credit_score']}점)",
+            f"- 부채 변화: {debt_change_pct:+.1f}%",
+            f"- 기간 내 총 연체 횟수: {total_overdue}회",
+        ]
+    
+    return "\n".join(lines)
+
+def assemble_analysis(customer_id, analysis_type, fields, months_ahead=None):
+    """
+    저장된 구조화 분석 필드로 Markdown을 조립합니다. (LLM 호출 없음)
+    
+    신용 점수 전망에는 시뮬레이션 예측 구간을 덧붙입니다. (수치는 LLM이 만들지 않음)
+    """
+    text = render_analysis(analysis_type, fields)
+    if analysis_type == "future_credit":
+        months_ahead = months_ahead or DEFAULT_MONTHS_AHEAD
+        forecast = forecast_customer(customer_id, months_ahead)
+        text += f"\n\n### 예측 구간 ({months_ahead}개월)\n" + format_forecast(forecast)
+    return text
+
+def stored_analyses(customer_id, analysis_types):
+    """
+    현재 데이터 버전으로 저장된(온라인/배치) 기본 인자 구조화 분석 필드를 반환합니다.
+    
+    Returns:
+        {분석 유형: 필드} (저장된 유형만)
+    """
+    version = get_store().data_version(customer_id)
+    if version is None:
+        return {}
+    analyses = get_analyses(customer_id, version[0])
+    return {t: analyses[t]["result"] for t in analysis_types
+            if t in analyses and isinstance(analyses[t]["result"], dict)}
+
+def decision_key(model_version):
+    """대출 심사 의견 저장 키 (신용 위험 모델 버전별로 저장하여 모델이 바뀌면 이전 의견을 쓰지 않음)"""
+    return analysis_key("credit_decision", f"model_v{model_version}")
 
 class CustomerAnalyzer:
-    def __init__(self, customer_id=None, customer_name=None):
+    def __init__(self, customer_id=None, customer_name=None, priority="interactive"):
         """
         고객 데이터 분석기 초기화
         
         Args:
             customer_id: 고객 ID
             customer_name: 고객 이름
+            priority: LLM 호출 우선순위 (interactive, batch)
         """
         if not customer_id and not customer_name:
             raise ValueError("고객 ID 또는 이름을 제공해야 합니다.")
@@ -24,6 +137,7 @@ class CustomerAnalyzer:
         
         self.customer_id = self.customer_data["customer_id"]
         self.name = self.customer_data["name"]
+        self.priority = priority
     
     def get_latest_data(self):
         """최신 월별 데이터 반환"""
@@ -75,106 +189,204 @@ class CustomerAnalyzer:
         """
         
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
+            return chat_completion(
                 messages=[
                     {"role": "system", "content": "당신은 금융 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.5,
-                max_tokens=1000
+                max_tokens=1000,
+                priority=self.priority
             )
             
-            return response.choices[0].message.content
-            
+        except LLMUnavailableError:
+            return fallback_narrative(self.name, latest_data)
         except Exception as e:
             return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
     
-    def analyze_credit_trend(self, start_date=None, end_date=None):
+    def build_credit_trend_request(self, start_date=None, end_date=None):
         """
-        고객의 신용도 추세 분석
+        신용도 추세 분석 요청을 구성합니다.
         
         Args:
             start_date: 시작 날짜 (YYYY-MM 형식)
             end_date: 종료 날짜 (YYYY-MM 형식)
+        
+        Returns:
+            (LLM 요청 인자, 분석에 사용한 월별 데이터)
+        
+        Raises:
+            ValueError: 분석할 데이터가 없거나 부족한 경우
         """
+        # 날짜 파싱
         try:
-            # 날짜 파싱
             start_month = datetime.strptime(start_date, "%Y-%m") if start_date else None
             end_month = datetime.strptime(end_date, "%Y-%m") if end_date else None
-            
-            # 기간 데이터 필터링
-            period_data = self.get_data_for_period(start_month, end_month)
-            
-            if not period_data:
-                return {"error": "해당 기간에 데이터가 없습니다."}
-            
-            # 첫 달과 마지막 달 데이터
-            first_month = period_data[0]
-            last_month = period_data[-1]
-            
-            # 신용점수 변화
-            credit_change = last_month["credit_score"] - first_month["credit_score"]
-            
-            # 수입 변화
-            income_change_pct = ((last_month["income"] - first_month["income"]) / first_month["income"] * 100) if first_month["income"] > 0 else 0
-            
-            # 부채 변화
-            debt_change_pct = ((last_month["debt"] - first_month["debt"]) / first_month["debt"] * 100) if first_month["debt"] > 0 else 0
-            
-            # 데이터 포맷팅
-            formatted_data = []
-            for data in period_data:
-                data_date = datetime.strptime(data["month"], "%Y-%m-%d")
-                formatted_data.append({
-                    "월": data_date.strftime("%Y년 %m월"),
-                    "신용점수": data["credit_score"],
-                    "수입": f"{data['income']:,.0f}원",
-                    "지출": f"{data['expenses']:,.0f}원",
-                    "저축": f"{data['savings']:,.0f}원",
-                    "부채": f"{data['debt']:,.0f}원",
-                    "대출상환액": f"{data['loan_payments']:,.0f}원",
-                    "연체횟수": data["overdue_payments"]
-                })
-            
-            prompt = f"""
-            다음은 {self.name} 고객의 {start_month.strftime('%Y년 %m월') if start_month else '시작'}부터 {end_month.strftime('%Y년 %m월') if end_month else '현재'}까지의 재정 데이터입니다.
-            
-            ## 고객 정보
-            - 이름: {self.name}
-            - 고객 ID: {self.customer_id}
-            
-            ## 월별 데이터
-            {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
-            
-            ## 주요 변화
-            - 분석 기간: {len(period_data)}개월
-            - 신용점수 변화: {credit_change}점 ({first_month["credit_score"]}점 → {last_month["credit_score"]}점)
-            - 월 수입 변화: {income_change_pct:.1f}% ({first_month["income"]:,.0f}원 → {last_month["income"]:,.0f}원)
-            - 부채 변화: {debt_change_pct:.1f}% ({first_month["debt"]:,.0f}원 → {last_month["debt"]:,.0f}원)
-            
-            ## 분석 요청
-            1. 고객의 신용도 추세를 분석해주세요.
-            2. 재정 상태의 강점과 약점을 파악해주세요.
-            3. 신용 점수 개선을 위한 구체적인 조언을 제공해주세요.
-            4. 현재 재정 상황에 적합한 대출 상품을 추천해주세요.
-            5. 향후 6개월간의 신용 점수 및 재정 상태 예측을 해주세요.
-            """
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 시계열 금융 데이터 분석 전문가입니다. 고객의 재정 데이터를 분석하여 신용도 추세, 재정 상태 평가, 맞춤형 조언을 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
+        except ValueError:
+            raise ValueError("날짜 형식은 YYYY-MM이어야 합니다.")
+        
+        # 기간 데이터 필터링
+        period_data = self.get_data_for_period(start_month, end_month)
+        
+        if not period_data:
+            raise ValueError("해당 기간에 데이터가 없습니다.")
+        
+        # 첫 달과 마지막 달 데이터
+        first_month = period_data[0]
+        last_month = period_data[-1]
+        
+        # 신용점수 변화
+        credit_change = last_month["credit_score"] - first_month["credit_score"]
+        
+        # 수입 변화
+        income_change_pct = ((last_month["income"] - first_month["income"]) / first_month["income"] * 100) if first_month["income"] > 0 else 0
+        
+        # 부채 변화
+        debt_change_pct = ((last_month["debt"] - first_month["debt"]) / first_month["debt"] * 100) if first_month["debt"] > 0 else 0
+        
+        # 데이터 포맷팅
+        formatted_data = []
+        for data in period_data:
+            data_date = datetime.strptime(data["month"], "%Y-%m-%d")
+            formatted_data.append({
+                "월": data_date.strftime("%Y년 %m월"),
+                "신용점수": data["credit_score"],
+                "수입": f"{data['income']:,.0f}원",
+                "지출": f"{data['expenses']:,.0f}원",
+                "저축": f"{data['savings']:,.0f}원",
+                "부채": f"{data['debt']:,.0f}원",
+                "대출상환액": f"{data['loan_payments']:,.0f}원",
+                "연체횟수": data["overdue_payments"]
+            })
+        
+        prompt = f"""
+        다음은 {self.name} 고객의 {start_month.strftime('%Y년 %m월') if start_month else '시작'}부터 {end_month.strftime('%Y년 %m월') if end_month else '현재'}까지의 재정 데이터입니다.
+        
+        ## 고객 정보
+        - 이름: {self.name}
+        - 고객 ID: {self.customer_id}
+        
+        ## 월별 데이터
+        {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
+        
+        ## 주요 변화
+        - 분석 기간: {len(period_data)}개월
+        - 신용점수 변화: {credit_change}점 ({first_month["credit_score"]}점 → {last_month["credit_score"]}점)
+        - 월 수입 변화: {income_change_pct:.1f}% ({first_month["income"]:,.0f}원 → {last_month["income"]:,.0f}원)
+        - 부채 변화: {debt_change_pct:.1f}% ({first_month["debt"]:,.0f}원 → {last_month["debt"]:,.0f}원)
+        
+        ## 분석 요청 (JSON 필드)
+        - summary: 고객의 신용도 추세 요약 (2문장 이내)
+        - trend: 신용도 추세 (개선, 유지, 악화 중 하나)
+        - strengths, weaknesses: 재정 상태의 강점과 약점
+        - advice: 신용 점수 개선을 위한 구체적인 조언
+        - loan_products: 현재 재정 상황에 적합한 대출 상품
+        {LENGTH_GUIDE}
+        """
+        
+        request = {
+            "messages": [
+                {"role": "system", "content": "당신은 시계열 금융 데이터 분석 전문가입니다. 고객의 재정 데이터를 분석하여 신용도 추세, 재정 상태 평가, 맞춤형 조언을 제공합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": TOKEN_BUDGETS["credit_trend"],
+            "response_format": response_format("credit_trend")
+        }
+        return request, period_data
+    
+    def analyze_credit_trend(self, start_date=None, end_date=None):
+        """
+        고객의 신용도 추세 분석
+        
+        Args:
+            start_date: 시작 날짜 (YYYY-MM 형식)
+            end_date: 종료 날짜 (YYYY-MM 형식)
+        """
+        return self._analysis_text("credit_trend", start_date, end_date)
+    
+    def build_future_credit_request(self, months_ahead=None):
+        """
+        미래 신용 점수 예측 요청을 구성합니다.
+        
+        Args:
+            months_ahead: 예측할 개월 수 (기본값: DEFAULT_MONTHS_AHEAD)
+        
+        Returns:
+            (LLM 요청 인자, 분석에 사용한 월별 데이터)
+        
+        Raises:
+            ValueError: 분석할 데이터가 없거나 부족한 경우
+        """
+        months_ahead = months_ahead or DEFAULT_MONTHS_AHEAD
+        
+        # 모든 데이터 가져오기
+        all_data = self.get_data_for_period()
+        
+        # 데이터가 부족한 경우
+        if len(all_data) < 3:
+            raise ValueError("예측을 위한 충분한 데이터가 없습니다. 최소 3개월 이상의 데이터가 필요합니다.")
+        
+        # 최근 3개월 데이터
+        recent_data = all_data[-3:]
+        
+        # 예측 수치는 시뮬레이션으로 계산하고, LLM은 근거 설명과 행동 계획만 작성
+        forecast = forecast_customer(self.customer_id, months_ahead)
+        
+        # 데이터 포맷팅
+        formatted_data = []
+        for data in all_data:
+            data_date = datetime.strptime(data["month"], "%Y-%m-%d")
+            formatted_data.append({
+                "월": data_date.strftime("%Y년 %m월"),
+                "신용점수": data["credit_score"],
+                "수입": data["income"],
+                "지출": data["expenses"],
+                "저축": data["savings"],
+                "부채": data["debt"],
+                "대출상환액": data["loan_payments"],
+                "연체횟수": data["overdue_payments"]
+            })
+        
+        prompt = f"""
+        다음은 {self.name} 고객의 재정 데이터입니다.
+        
+        ## 고객 정보
+        - 이름: {self.name}
+        - 고객 ID: {self.customer_id}
+        
+        ## 전체 월별 데이터
+        {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
+        
+        ## 최근 3개월 요약
+        - 최근 3개월 평균 신용점수: {sum(d["credit_score"] for d in recent_data) / 3:.1f}점
+        - 최근 3개월 평균 수입: {sum(d["income"] for d in recent_data) / 3:,.0f}원
+        - 최근 3개월 평균 지출: {sum(d["expenses"] for d in recent_data) / 3:,.0f}원
+        - 최근 3개월 평균 저축: {sum(d["savings"] for d in recent_data) / 3:,.0f}원
+        - 최근 3개월 평균 부채: {sum(d["debt"] for d in recent_data) / 3:,.0f}원
+        
+        ## 신용 점수 시뮬레이션 예측 ({forecast["model"]["paths"]:,}개 경로 몬테카를로)
+        - 월평균 점수 변화: {forecast["model"]["drift"]:+.1f}점, 변동성: {forecast["model"]["volatility"]:.1f}점, 월 연체 확률: {forecast["model"]["overdue_rate"]:.0%}
+{format_forecast(forecast)}
+        
+        ## 분석 요청 (JSON 필드)
+        - outlook: 위 시뮬레이션 예측 구간을 그대로 사용한 향후 {months_ahead}개월 신용 점수 전망 (수치를 새로 만들지 마세요)
+        - drivers: 예측의 근거와 주요 영향 요인
+        - action_plan: 신용 점수 향상을 위한 구체적인 행동 계획
+        - scenario_current, scenario_improved: 현재 추세가 지속될 경우와 개선 조치를 취할 경우의 전망
+        {LENGTH_GUIDE}
+        """
+        
+        request = {
+            "messages": [
+                {"role": "system", "content": "당신은 금융 예측 전문가입니다. 고객의 과거 재정 데이터를 분석하여 미래 신용 점수와 재정 상태를 예측합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": TOKEN_BUDGETS["future_credit"],
+            "response_format": response_format("future_credit")
+        }
+        return request, all_data
     
     def predict_future_credit(self, months_ahead=6):
         """
@@ -183,176 +395,278 @@ class CustomerAnalyzer:
         Args:
             months_ahead: 예측할 개월 수
         """
-        try:
-            # 모든 데이터 가져오기
-            all_data = self.get_data_for_period()
-            
-            # 데이터가 부족한 경우
-            if len(all_data) < 3:
-                return {"error": "예측을 위한 충분한 데이터가 없습니다. 최소 3개월 이상의 데이터가 필요합니다."}
-            
-            # 최근 3개월 데이터
-            recent_data = all_data[-3:]
-            
-            # 데이터 포맷팅
-            formatted_data = []
-            for data in all_data:
-                data_date = datetime.strptime(data["month"], "%Y-%m-%d")
-                formatted_data.append({
-                    "월": data_date.strftime("%Y년 %m월"),
-                    "신용점수": data["credit_score"],
-                    "수입": data["income"],
-                    "지출": data["expenses"],
-                    "저축": data["savings"],
-                    "부채": data["debt"],
-                    "대출상환액": data["loan_payments"],
-                    "연체횟수": data["overdue_payments"]
-                })
-            
-            prompt = f"""
-            다음은 {self.name} 고객의 재정 데이터입니다.
-            
-            ## 고객 정보
-            - 이름: {self.name}
-            - 고객 ID: {self.customer_id}
-            
-            ## 전체 월별 데이터
-            {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
-            
-            ## 최근 3개월 요약
-            - 최근 3개월 평균 신용점수: {sum(d["credit_score"] for d in recent_data) / 3:.1f}점
-            - 최근 3개월 평균 수입: {sum(d["income"] for d in recent_data) / 3:,.0f}원
-            - 최근 3개월 평균 지출: {sum(d["expenses"] for d in recent_data) / 3:,.0f}원
-            - 최근 3개월 평균 저축: {sum(d["savings"] for d in recent_data) / 3:,.0f}원
-            - 최근 3개월 평균 부채: {sum(d["debt"] for d in recent_data) / 3:,.0f}원
-            
-            ## 분석 요청
-            1. 향후 {months_ahead}개월 동안의 신용 점수 예측을 월별로 제공해주세요.
-            2. 예측의 근거와 주요 영향 요인을 설명해주세요.
-            3. 신용 점수 향상을 위한 구체적인 행동 계획을 제안해주세요.
-            4. 현재 추세가 지속될 경우와 개선 조치를 취할 경우의 시나리오를 비교해주세요.
-            """
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 금융 예측 전문가입니다. 고객의 과거 재정 데이터를 분석하여 미래 신용 점수와 재정 상태를 예측합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
+        return self._analysis_text("future_credit", None if months_ahead == DEFAULT_MONTHS_AHEAD else months_ahead)
+    
+    def build_product_recommendation_request(self):
+        """
+        금융 상품 추천 요청을 구성합니다.
+        
+        Returns:
+            (LLM 요청 인자, 분석에 사용한 월별 데이터)
+        
+        Raises:
+            ValueError: 분석할 데이터가 없거나 부족한 경우
+        """
+        # 최신 데이터 가져오기
+        latest_data = self.get_latest_data()
+        if not latest_data:
+            raise ValueError("고객의 월별 데이터가 없습니다.")
+        
+        # 최근 6개월 데이터
+        recent_data = self.get_data_for_period()[-6:] if len(self.get_data_for_period()) >= 6 else self.get_data_for_period()
+        
+        # 데이터 포맷팅
+        formatted_data = []
+        for data in recent_data:
+            data_date = datetime.strptime(data["month"], "%Y-%m-%d")
+            formatted_data.append({
+                "월": data_date.strftime("%Y년 %m월"),
+                "신용점수": data["credit_score"],
+                "수입": f"{data['income']:,.0f}원",
+                "지출": f"{data['expenses']:,.0f}원",
+                "저축": f"{data['savings']:,.0f}원",
+                "부채": f"{data['debt']:,.0f}원",
+                "대출상환액": f"{data['loan_payments']:,.0f}원",
+                "연체횟수": data["overdue_payments"]
+            })
+        
+        # 부채 대 소득 비율
+        debt_to_income = latest_data["debt"] / latest_data["income"] if latest_data["income"] > 0 else 0
+        
+        # 저축 대 소득 비율
+        savings_to_income = latest_data["savings"] / latest_data["income"] if latest_data["income"] > 0 else 0
+        
+        prompt = f"""
+        다음은 {self.name} 고객의 최근 재정 데이터입니다.
+        
+        ## 고객 정보
+        - 이름: {self.name}
+        - 고객 ID: {self.customer_id}
+        
+        ## 최신 재정 상태 (기준: {datetime.strptime(latest_data["month"], "%Y-%m-%d").strftime('%Y년 %m월')})
+        - 신용점수: {latest_data["credit_score"]}점
+        - 월 수입: {latest_data["income"]:,.0f}원
+        - 월 지출: {latest_data["expenses"]:,.0f}원
+        - 저축액: {latest_data["savings"]:,.0f}원
+        - 부채 총액: {latest_data["debt"]:,.0f}원
+        - 월 대출상환액: {latest_data["loan_payments"]:,.0f}원
+        - 연체횟수: {latest_data["overdue_payments"]}회
+        
+        ## 주요 재정 지표
+        - 부채 대 소득 비율: {debt_to_income:.2f}
+        - 저축 대 소득 비율: {savings_to_income:.2f}
+        - 월 가처분 소득: {latest_data["income"] - latest_data["expenses"]:,.0f}원
+        
+        ## 최근 데이터 추이
+        {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
+        
+        ## 분석 요청 (JSON 필드)
+        - loans: 이 고객에게 가장 적합한 대출 상품 3가지 (name, reason, rate: 예상 이자율, limit: 대출 한도)
+        - savings: 재정 상황 개선을 위한 저축 및 투자 상품 (name, reason)
+        - avoid: 현재 재정 상황에서 피해야 할 금융 상품이나 행동
+        {LENGTH_GUIDE}
+        """
+        
+        request = {
+            "messages": [
+                {"role": "system", "content": "당신은 금융 상품 추천 전문가입니다. 고객의 재정 상황을 분석하여 최적의 대출, 저축, 투자 상품을 추천합니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.4,
+            "max_tokens": TOKEN_BUDGETS["financial_products"],
+            "response_format": response_format("financial_products")
+        }
+        return request, recent_data
     
     def recommend_financial_products(self):
         """고객에게 적합한 금융 상품 추천"""
+        return self._analysis_text("financial_products")
+    
+    def build_credit_decision_request(self):
+        """
+        대출 심사 의견 요청을 구성합니다.
+        
+        승인 확률, 금리 등급, 심사 의견은 신용 위험 모델이 계산하고, LLM은 그 결과의 판단 근거와 승인 조건만 작성합니다.
+        
+        Returns:
+            (LLM 요청 인자, 모델 심사 결과 필드 {"model_version", "approval_probability", "rate_band", "rate_range", "decision"})
+        
+        Raises:
+            ValueError: 분석할 데이터가 없거나 모델을 학습할 수 없는 경우
+        """
+        latest_data = self.get_latest_data()
+        if not latest_data:
+            raise ValueError("고객의 월별 데이터가 없습니다.")
+        
+        ensure_model()
         try:
-            # 최신 데이터 가져오기
-            latest_data = self.get_latest_data()
-            
-            # 최근 6개월 데이터
-            recent_data = self.get_data_for_period()[-6:] if len(self.get_data_for_period()) >= 6 else self.get_data_for_period()
-            
-            # 데이터 포맷팅
-            formatted_data = []
-            for data in recent_data:
-                data_date = datetime.strptime(data["month"], "%Y-%m-%d")
-                formatted_data.append({
-                    "월": data_date.strftime("%Y년 %m월"),
-                    "신용점수": data["credit_score"],
-                    "수입": f"{data['income']:,.0f}원",
-                    "지출": f"{data['expenses']:,.0f}원",
-                    "저축": f"{data['savings']:,.0f}원",
-                    "부채": f"{data['debt']:,.0f}원",
-                    "대출상환액": f"{data['loan_payments']:,.0f}원",
-                    "연체횟수": data["overdue_payments"]
-                })
-            
-            # 부채 대 소득 비율
-            debt_to_income = latest_data["debt"] / latest_data["income"] if latest_data["income"] > 0 else 0
-            
-            # 저축 대 소득 비율
-            savings_to_income = latest_data["savings"] / latest_data["income"] if latest_data["income"] > 0 else 0
-            
-            prompt = f"""
-            다음은 {self.name} 고객의 최근 재정 데이터입니다.
-            
-            ## 고객 정보
-            - 이름: {self.name}
-            - 고객 ID: {self.customer_id}
-            
-            ## 최신 재정 상태 (기준: {datetime.strptime(latest_data["month"], "%Y-%m-%d").strftime('%Y년 %m월')})
-            - 신용점수: {latest_data["credit_score"]}점
-            - 월 수입: {latest_data["income"]:,.0f}원
-            - 월 지출: {latest_data["expenses"]:,.0f}원
-            - 저축액: {latest_data["savings"]:,.0f}원
-            - 부채 총액: {latest_data["debt"]:,.0f}원
-            - 월 대출상환액: {latest_data["loan_payments"]:,.0f}원
-            - 연체횟수: {latest_data["overdue_payments"]}회
-            
-            ## 주요 재정 지표
-            - 부채 대 소득 비율: {debt_to_income:.2f}
-            - 저축 대 소득 비율: {savings_to_income:.2f}
-            - 월 가처분 소득: {latest_data["income"] - latest_data["expenses"]:,.0f}원
-            
-            ## 최근 데이터 추이
-            {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
-            
-            ## 분석 요청
-            1. 이 고객에게 가장 적합한 대출 상품 3가지를 추천하고 이유를 설명해주세요.
-            2. 각 상품의 예상 이자율과 대출 한도를 제시해주세요.
-            3. 고객의 재정 상황 개선을 위한 저축 및 투자 상품도 추천해주세요.
-            4. 현재 재정 상황에서 피해야 할 금융 상품이나 행동을 조언해주세요.
-            """
-            
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "당신은 금융 상품 추천 전문가입니다. 고객의 재정 상황을 분석하여 최적의 대출, 저축, 투자 상품을 추천합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                max_tokens=1000
-            )
-            
-            return response.choices[0].message.content
-            
+            result, factors = score_factors(self.customer_id)
+        except KeyError as e:
+            raise ValueError(e.args[0]) from e
+        score = {name: result[name] for name in ("model_version", "approval_probability", "rate_band", "rate_range", "decision")}
+        
+        prompt = f"""
+        신용 위험 모델의 대출 심사 결과에 대한 판단 근거와 승인 조건을 작성해주세요.
+        심사 의견, 승인 확률, 금리 등급은 모델 결과이므로 바꾸거나 다시 평가하지 마세요.
+        고객 정보:
+        - 이름: {self.name}
+        - 고객 ID: {self.customer_id}
+        - 신용 점수: {latest_data["credit_score"]}
+        - 월 소득: {latest_data["income"]:,}원
+        - 월 지출: {latest_data["expenses"]:,}원
+        - 저축액: {latest_data["savings"]:,}원
+        - 부채 총액: {latest_data["debt"]:,}원
+        - 월 대출상환액: {latest_data["loan_payments"]:,}원
+        - 연체 횟수: {latest_data["overdue_payments"]}
+        
+        ## 심사 결과 (신용 위험 모델 v{score["model_version"]})
+        - 심사 의견: {score["decision"]}
+        - 승인 확률: {score["approval_probability"] * 100:.1f}%
+        - 금리 등급: {score["rate_band"]} ({_rate_text(score)})
+        
+        ## 주요 요인 (영향도 순)
+        {chr(10).join(_factor_lines(factors))}
+        
+        ## 분석 요청 (JSON 필드)
+        - reasons: 위 주요 요인에 근거한 판단 근거
+        - conditions: 승인 또는 금리 개선을 위한 조건 (없으면 빈 목록)
+        {LENGTH_GUIDE}
+        """
+        
+        request = {
+            "messages": [
+                {"role": "system", "content": "당신은 대출 심사 결과를 설명하는 금융 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": TOKEN_BUDGETS["credit_decision"],
+            "response_format": response_format("credit_decision")
+        }
+        return request, score
+    
+    def decide_credit(self):
+        """고객의 신용 상태 평가와 대출 심사 의견"""
+        return self._analysis_text("credit_decision")
+    
+    def _fallback(self, analysis_type, data, *params):
+        """LLM을 사용할 수 없을 때의 기본 지표 기반 분석문"""
+        if analysis_type == "credit_decision":
+            return FALLBACK_NOTICE + "\n\n" + credit_score_summary(self.customer_id)
+        text = fallback_narrative(self.name, data[-1], data)
+        if analysis_type == "future_credit":
+            months_ahead = params[0] if params and params[0] else DEFAULT_MONTHS_AHEAD
+            text += f"\n\n## 신용 점수 예측 ({months_ahead}개월)\n" + format_forecast(forecast_customer(self.customer_id, months_ahead))
+        return text
+    
+    def structured_analysis(self, analysis_type, *params):
+        """
+        구조화 출력(JSON 스키마)으로 분석하고 필드를 분석 저장소에 기록합니다.
+        
+        현재 데이터 버전으로 저장된 필드(온라인/배치)가 있으면 LLM을 호출하지 않고 재사용합니다.
+        대출 심사 의견은 모델 심사 결과를 필드에 함께 저장하고, 모델 버전별 키(decision_key)를 사용합니다.
+        
+        Args:
+            analysis_type: 분석 유형 (credit_trend, future_credit, financial_products, credit_decision)
+            params: 요청 구성 메서드 인자 (기본값은 None)
+        
+        Returns:
+            {"analysis_type", "fields", "text", "source"}
+            source: stored(저장된 필드), llm, fallback(기본 지표 분석문, fields는 None)
+        
+        Raises:
+            ValueError: 분석할 데이터가 없거나 부족한 경우
+        """
+        version = get_store().data_version(self.customer_id)
+        data_version = version[0] if version else None
+        builders = {
+            "credit_trend": self.build_credit_trend_request,
+            "future_credit": self.build_future_credit_request,
+            "financial_products": self.build_product_recommendation_request,
+            "credit_decision": self.build_credit_decision_request
+        }
+        request = data = None
+        if analysis_type == "credit_decision":
+            # 모델 심사 결과를 먼저 계산하여 현재 모델 버전의 키로 조회 (모델이 바뀌면 다시 작성)
+            request, data = builders[analysis_type]()
+            key = decision_key(data["model_version"])
+        else:
+            key = analysis_key(analysis_type, *params)
+        stored = get_analysis(self.customer_id, key, data_version)
+        if stored and isinstance(stored["result"], dict):
+            fields, source = stored["result"], "stored"
+        else:
+            if request is None:
+                request, data = builders[analysis_type](*params)
+            try:
+                fields = parse_analysis(analysis_type, chat_completion(**request, priority=self.priority))
+                if analysis_type == "credit_decision":
+                    fields = {**data, **fields}
+                source = "llm"
+            except (LLMUnavailableError, ValueError):
+                # 응답 지연이나 스키마에 맞지 않는 응답은 저장하지 않음 (다음 요청에서 다시 시도)
+                return {"analysis_type": analysis_type, "fields": None, "source": "fallback",
+                        "text": self._fallback(analysis_type, data, *params)}
+            save_analysis(self.customer_id, key, fields, data_version)
+        
+        months_ahead = params[0] if analysis_type == "future_credit" and params else None
+        return {"analysis_type": analysis_type, "fields": fields, "source": source,
+                "text": assemble_analysis(self.customer_id, analysis_type, fields, months_ahead)}
+    
+    def _analysis_text(self, analysis_type, *params):
+        try:
+            return self.structured_analysis(analysis_type, *params)["text"]
+        except ValueError as e:
+            return {"error": str(e)}
         except Exception as e:
             return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
 
-def analyze_customer_data(customer_id=None, customer_name=None, request_text=None):
+def analyze_customer_data(customer_id=None, customer_name=None, request_text=None, priority="interactive", explain=False):
     """
     고객 데이터를 분석하는 통합 함수
     
+    질문이 없으면 로컬 신용 위험 모델의 대출 심사 결과(승인 확률, 금리 등급, 주요 요인)를 LLM 호출 없이 반환하고,
+    explain이 참일 때만 LLM으로 점수를 설명한 문장을 덧붙입니다.
+    
     Args:
         customer_id: 고객 ID
         customer_name: 고객 이름
         request_text: 분석 요청 텍스트
+        priority: LLM 호출 우선순위 (interactive, batch)
+        explain: 질문이 없을 때 점수 설명(LLM)을 함께 작성할지 여부
     
     Returns:
-        AI 분석 결과
+        AI 분석 결과 (질문이 없으면 대출 심사 결과)
     """
     # 고객 데이터 로드
     customer_data = load_customer_data(customer_id, customer_name)
     if not customer_data:
         return {"error": "해당 고객 정보를 찾을 수 없습니다."}
     
-    # 기본 분석 질문 설정
-    if not request_text:
-        request_text = "이 고객의 신용 상태를 평가하고, 대출 승인 가능성과 권장 이자율을 제안해주세요."
-    
     # 최신 월별 데이터 가져오기
     if not customer_data.get("monthly_data"):
         return {"error": "고객의 월별 데이터가 없습니다."}
     
+    # 질문이 없으면 로컬 모델로 심사 (LLM은 설명을 요청한 경우에만 사용)
+    if not request_text:
+        try:
+            text = credit_score_summary(customer_data["customer_id"])
+            if explain:
+                text += "\n\n### 심사 결과 설명\n" + explain_credit_score(customer_data["customer_id"], priority)["explanation"]
+            return text
+        except (KeyError, ValueError) as e:
+            return {"error": e.args[0] if isinstance(e, KeyError) else str(e)}
+    
     sorted_data = sorted(customer_data["monthly_data"], 
                         key=lambda x: datetime.strptime(x["month"], "%Y-%m-%d"))
     latest_data = sorted_data[-1]
     
+    # 같은 데이터 버전에서 비슷한 질문에 답한 적이 있으면 재사용
+    version = get_store().data_version(customer_data["customer_id"])
+    data_version = version[0] if version else None
+    cached = semantic_cache.lookup(customer_data["customer_id"], data_version, request_text)
+    if cached:
+        return cached[0]
+    
     # 프롬프트 구성
     prompt = f"""
     고객의 신용 정보를 바탕으로 질문에 답해주세요.
@@ -372,22 +686,24 @@ def analyze_customer_data(customer_id=None, customer_name=None, request_text=Non
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        answer = chat_completion(
             messages=[
                 {"role": "system", "content": "당신은 금융 전문가입니다."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
-            max_tokens=1000
+            max_tokens=1000,
+            priority=priority
         )
+        semantic_cache.store(customer_data["customer_id"], data_version, request_text, answer)
+        return answer
         
-        return response.choices[0].message.content
-        
+    except LLMUnavailableError:
+        return fallback_narrative(customer_data["name"], latest_data)
     except Exception as e:
         return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
 
-def analyze_credit_trend(customer_id=None, customer_name=None, start_date=None, end_date=None):
+def analyze_credit_trend(customer_id=None, customer_name=None, start_date=None, end_date=None, priority="interactive"):
     """
     고객의 신용도 추세를 분석하는 함수
     
@@ -396,96 +712,174 @@ def analyze_credit_trend(customer_id=None, customer_name=None, start_date=None,
         customer_name: 고객 이름
         start_date: 시작 날짜 (YYYY-MM 형식)
         end_date: 종료 날짜 (YYYY-MM 형식)
+        priority: LLM 호출 우선순위 (interactive, batch)
     """
-    # 고객 데이터 로드
-    customer_data = load_customer_data(customer_id, customer_name)
-    if not customer_data:
-        return {"error": "해당 고객 정보를 찾을 수 없습니다."}
+    try:
+        analyzer = CustomerAnalyzer(customer_id, customer_name, priority)
+    except ValueError as e:
+        return {"error": str(e)}
+    return analyzer.analyze_credit_trend(start_date, end_date)
+
+def _factor_lines(factors):
+    return [
+        f"- {FEATURE_LABELS[name]}: {value:,.2f} (영향도 {contribution:+.2f}, {'승인에 유리' if contribution > 0 else '승인에 불리'})"
+        for name, value, contribution in factors
+    ]
+
+def _rate_text(result):
+    return f"{result['rate_range'][0]}~{result['rate_range'][1]}%" if result["rate_range"] else "승인 보류 (추가 심사 필요)"
+
+def credit_score_summary(customer_id):
+    """
+    로컬 신용 위험 모델의 대출 심사 결과를 Markdown으로 만듭니다. (LLM 호출 없음)
+    
+    학습된 모델이 없으면 심사 기준 규칙으로 첫 버전을 학습한 뒤 계산합니다.
+    
+    Returns:
+        Markdown 형식의 텍스트
+    
+    Raises:
+        KeyError: 포트폴리오에 없는 고객인 경우
+        ValueError: 모델을 학습할 수 없는 경우
+    """
+    ensure_model()
+    result, factors = score_factors(customer_id)
+    lines = [
+        f"## 대출 심사 결과 (신용 위험 모델 v{result['model_version']})",
+        f"- 승인 확률: {result['approval_probability'] * 100:.1f}%",
+        f"- 금리 등급: {result['rate_band']} ({_rate_text(result)})",
+        "",
+        "### 주요 요인 (영향도 순)",
+        *_factor_lines(factors)
+    ]
+    return "\n".join(lines)
+
+def explain_credit_score(customer_id, priority="interactive"):
+    """
+    로컬 신용 위험 모델의 점수를 LLM으로 설명합니다.
+    
+    점수 자체는 모델이 계산하고, LLM은 주요 영향 요인을 고객이 이해하기 쉽게 풀어쓰는 데만 사용합니다.
     
-    # 날짜 파싱
+    Args:
+        customer_id: 고객 ID
+        priority: LLM 호출 우선순위 (interactive, batch)
+    
+    Returns:
+        {"score": 점수 결과, "factors": 주요 요인 목록, "explanation": 설명 텍스트}
+    """
+    result, factors = score_factors(customer_id)
+    factor_lines = _factor_lines(factors)
+    rate_text = _rate_text(result)
+    
+    prompt = f"""
+    신용 위험 모델이 계산한 대출 심사 결과를 고객에게 설명하는 문장을 작성해주세요.
+    점수와 등급은 바꾸지 말고, 아래 주요 요인만 근거로 설명하세요.
+    
+    ## 심사 결과
+    - 승인 확률: {result['approval_probability'] * 100:.1f}%
+    - 금리 등급: {result['rate_band']} ({rate_text})
+    
+    ## 주요 요인 (영향도 순)
+    {chr(10).join(factor_lines)}
+    
+    ## 작성 요청
+    1. 결과 요약 (2문장 이내)
+    2. 점수에 영향을 준 요인 설명
+    3. 점수를 개선할 수 있는 구체적인 방법
+    """
+    
+    factor_list = [{"feature": name, "label": FEATURE_LABELS[name], "value": value, "contribution": contribution}
+                   for name, value, contribution in factors]
     try:
-        start_month = datetime.strptime(start_date, "%Y-%m") if start_date else datetime(1900, 1, 1)
-        end_month = datetime.strptime(end_date, "%Y-%m") if end_date else datetime(2100, 12, 31)
-    except ValueError:
-        return {"error": "날짜 형식은 YYYY-MM이어야 합니다."}
-    
-    # 기간 데이터 필터링
-    period_data = []
-    for data in customer_data["monthly_data"]:
-        data_date = datetime.strptime(data["month"], "%Y-%m-%d")
-        if start_month <= data_date <= end_month:
-            period_data.append(data)
-    
-    # 데이터가 없는 경우
-    if not period_data:
-        return {"error": "해당 기간에 데이터가 없습니다."}
-    
-    # 데이터 정렬
-    period_data.sort(key=lambda x: datetime.strptime(x["month"], "%Y-%m-%d"))
-    
-    # 데이터 포맷팅
-    formatted_data = []
-    for data in period_data:
-        data_date = datetime.strptime(data["month"], "%Y-%m-%d")
-        formatted_data.append({
-            "월": data_date.strftime("%Y년 %m월"),
-            "신용점수": data["credit_score"],
-            "수입": f"{data['income']:,.0f}원",
-            "지출": f"{data['expenses']:,.0f}원",
-            "저축": f"{data['savings']:,.0f}원",
-            "부채": f"{data['debt']:,.0f}원",
-            "대출상환액": f"{data['loan_payments']:,.0f}원",
-            "연체횟수": data["overdue_payments"]
-        })
-    
-    # 첫 달과 마지막 달 데이터
-    first_month = period_data[0]
-    last_month = period_data[-1]
-    
-    # 신용점수 변화
-    credit_change = last_month["credit_score"] - first_month["credit_score"]
-    
-    # 수입 변화
-    income_change_pct = ((last_month["income"] - first_month["income"]) / first_month["income"] * 100) if first_month["income"] > 0 else 0
-    
-    # 부채 변화
-    debt_change_pct = ((last_month["debt"] - first_month["debt"]) / first_month["debt"] * 100) if first_month["debt"] > 0 else 0
+        explanation = chat_completion(
+            messages=[
+                {"role": "system", "content": "당신은 대출 심사 결과를 설명하는 금융 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=600,
+            priority=priority
+        )
+    except LLMUnavailableError:
+        explanation = "\n".join([FALLBACK_NOTICE, "", f"승인 확률 {result['approval_probability'] * 100:.1f}%, 금리 등급 {result['rate_band']} ({rate_text})", ""] + factor_lines)
+    
+    return {"score": result, "factors": factor_list, "explanation": explanation}
+
+def portfolio_fallback_summary(aggregates):
+    """LLM을 사용할 수 없을 때 집계값으로 만든 포트폴리오 요약문"""
+    score, totals, grades = aggregates["score"], aggregates["totals"], aggregates["grades"]
+    lines = [
+        FALLBACK_NOTICE,
+        "",
+        "## 포트폴리오 요약",
+        f"- 고객 수: {aggregates['customers']:,}명 (기준 월 {aggregates['latest_month']})",
+        f"- 평균 신용 점수: {score['mean']:.1f}점 (중앙값 {score['median']:.0f}점, 하위 10% {score['p10']:.0f}점)",
+        "- 신용 등급: " + ", ".join(f"{label} {count:,}명" for label, count in grades.items()),
+        f"- 부채 합계: {totals['debt'] / 1e8:,.1f}억원, 부채/연소득 중앙값 {aggregates['dti']['median']:.2f}",
+        f"- 최근 12개월 연체 고객 비율: {totals['overdue_share'] * 100:.1f}%",
+    ]
+    return "\n".join(lines)
+
+def summarize_portfolio(aggregates, priority="interactive"):
+    """
+    포트폴리오 집계로 경영진 요약문을 작성합니다. (LLM 호출 한 번)
+    
+    수치는 모두 로컬에서 집계한 값이며, LLM은 해석과 권고 문장 작성에만 사용합니다.
+    
+    Args:
+        aggregates: portfolio_aggregates 결과
+        priority: LLM 호출 우선순위 (interactive, batch)
+    
+    Returns:
+        Markdown 형식의 요약 텍스트
+    """
+    score, totals = aggregates["score"], aggregates["totals"]
+    profile_lines = [
+        f"- {row['profile_type']}: {row['customers']:,}명 ({row['share'] * 100:.1f}%), 평균 점수 {row['mean_score']:.0f}점, "
+        f"부채/연소득 중앙값 {row['median_dti']:.2f}, 연체 고객 {row['overdue_share'] * 100:.1f}%"
+        for row in aggregates["profiles"]
+    ]
+    monthly = [(m, v) for m, v in zip(aggregates["monthly_score"]["months"], aggregates["monthly_score"]["values"])
+               if v is not None]
+    trend = (f"{monthly[0][0]} {monthly[0][1]:.1f}점 → {monthly[-1][0]} {monthly[-1][1]:.1f}점"
+             if len(monthly) > 1 else "데이터 부족")
+    top_risk = aggregates["top_risk"][:5]
+    risk_lines = [f"- {row['profile_type']}, 신용 점수 {row['credit_score']}점, 연체 {row['overdue_12m']}회"
+                  for row in top_risk]
     
     prompt = f"""
-    다음은 {customer_data["name"]} 고객의 {start_month.strftime('%Y년 %m월')}부터 {end_month.strftime('%Y년 %m월')}까지의 재정 데이터입니다.
+    다음은 전체 고객 포트폴리오의 집계 결과입니다. 경영진 보고용 요약을 작성해주세요.
+    수치는 아래 값만 인용하고 새로운 수치를 만들지 마세요.
     
-    ## 고객 정보
-    - 이름: {customer_data["name"]}
-    - 고객 ID: {customer_data["customer_id"]}
+    ## 개요 (기준 월 {aggregates['latest_month']})
+    - 고객 수: {aggregates['customers']:,}명
+    - 신용 점수: 평균 {score['mean']:.1f}점, 중앙값 {score['median']:.0f}점, 하위 10% {score['p10']:.0f}점, 상위 10% {score['p90']:.0f}점
+    - 신용 등급 분포: {", ".join(f"{label} {count:,}명" for label, count in aggregates['grades'].items())}
+    - 월별 평균 신용 점수 추이: {trend}
+    - 부채 합계: {totals['debt'] / 1e8:,.1f}억원, 부채/연소득 중앙값 {aggregates['dti']['median']:.2f}
+    - 최근 12개월 연체 고객 비율: {totals['overdue_share'] * 100:.1f}%
     
-    ## 월별 데이터
-    {json.dumps(formatted_data, ensure_ascii=False, indent=2)}
+    ## 프로필 유형별
+    {chr(10).join(profile_lines)}
     
-    ## 주요 변화
-    - 분석 기간: {len(period_data)}개월
-    - 신용점수 변화: {credit_change}점 ({first_month["credit_score"]}점 → {last_month["credit_score"]}점)
-    - 월 수입 변화: {income_change_pct:.1f}% ({first_month["income"]:,.0f}원 → {last_month["income"]:,.0f}원)
-    - 부채 변화: {debt_change_pct:.1f}% ({first_month["debt"]:,.0f}원 → {last_month["debt"]:,.0f}원)
+    ## 고위험 고객 예시 (순위 기준: {aggregates['risk_source']})
+    {chr(10).join(risk_lines)}
     
-    ## 분석 요청
-    1. 고객의 신용도 추세를 분석해주세요.
-    2. 재정 상태의 강점과 약점을 파악해주세요.
-    3. 신용 점수 개선을 위한 구체적인 조언을 제공해주세요.
-    4. 현재 재정 상황에 적합한 대출 상품을 추천해주세요.
+    ## 작성 요청
+    1. 포트폴리오 건전성 요약 (3문장 이내)
+    2. 주목할 위험 요인
+    3. 관리 권고 사항
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        return chat_completion(
             messages=[
-                {"role": "system", "content": "당신은 시계열 금융 데이터 분석 전문가입니다. 고객의 재정 데이터를 분석하여 신용도 추세, 재정 상태 평가, 맞춤형 조언을 제공합니다."},
+                {"role": "system", "content": "당신은 여신 포트폴리오를 분석해 경영진에게 보고하는 리스크 관리 전문가입니다."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=800,
+            priority=priority
         )
-        
-        return response.choices[0].message.content
-    
-    except Exception as e:
-        return {"error": "AI 분석 중 오류가 발생했습니다.", "details": str(e)}
\ No newline at end of file
+    except LLMUnavailableError:
+        return portfolio_fallback_summary(aggregates)
@@ -0,0 +1,165 @@
+import orjson
+
+# 분석 유형별 구조화 출력(JSON 스키마) - 필드는 저장 후 보고서와 API가 LLM 호출 없이 재사용
+# (OpenAI strict 모드: 모든 속성 필수, 추가 속성 불가)
+_TEXT = {"type": "string"}
+_TEXT_LIST = {"type": "array", "items": _TEXT}
+
+
+def _object(properties):
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+ANALYSIS_SCHEMAS = {
+    # 신용도 추세 분석
+    "credit_trend": _object({
+        "summary": _TEXT,
+        "trend": {"type": "string", "enum": ["개선", "유지", "악화"]},
+        "strengths": _TEXT_LIST,
+        "weaknesses": _TEXT_LIST,
+        "advice": _TEXT_LIST,
+        "loan_products": _TEXT_LIST
+    }),
+    # 신용 점수 전망 (예측 수치는 시뮬레이션 결과를 쓰고 LLM은 근거와 계획만 작성)
+    "future_credit": _object({
+        "outlook": _TEXT,
+        "drivers": _TEXT_LIST,
+        "action_plan": _TEXT_LIST,
+        "scenario_current": _TEXT,
+        "scenario_improved": _TEXT
+    }),
+    # 금융 상품 추천
+    "financial_products": _object({
+        "loans": {"type": "array", "items": _object({"name": _TEXT, "reason": _TEXT, "rate": _TEXT, "limit": _TEXT})},
+        "savings": {"type": "array", "items": _object({"name": _TEXT, "reason": _TEXT})},
+        "avoid": _TEXT_LIST
+    }),
+    # 대출 심사 의견 (승인 확률, 금리 등급, 심사 의견은 신용 위험 모델 결과를 쓰고 LLM은 근거와 조건만 작성)
+    "credit_decision": _object({
+        "reasons": _TEXT_LIST,
+        "conditions": _TEXT_LIST
+    })
+}
+
+# 분석 유형별 최대 생성 토큰 수 (필드 길이 제한과 함께 조정, 자유 형식 응답은 1000)
+TOKEN_BUDGETS = {
+    "credit_trend": 450,
+    "future_credit": 400,
+    "financial_products": 500,
+    "credit_decision": 250
+}
+
+# 프롬프트에 덧붙이는 필드 길이 지침
+LENGTH_GUIDE = "각 문장은 한 문장으로 짧게 쓰고, 목록 항목은 3개 이내로 작성해주세요."
+
+# 보고서/응답 Markdown의 제목 (분석 유형별)
+ANALYSIS_TITLES = {
+    "credit_trend": "신용도 추세 분석",
+    "future_credit": "신용 점수 전망",
+    "financial_products": "추천 금융 상품",
+    "credit_decision": "대출 심사 의견"
+}
+
+
+def response_format(analysis_type):
+    """chat completions 요청의 response_format (JSON 스키마 구조화 출력)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": analysis_type, "schema": ANALYSIS_SCHEMAS[analysis_type], "strict": True}
+    }
+
+
+def analysis_key(analysis_type, *params):
+    """
+    분석 결과 저장 키를 만듭니다.
+
+    기본 인자(None)로 만든 분석은 분석 유형 그대로 저장하므로 배치 분석 결과와 같은 키를 씁니다.
+    (예: credit_trend, credit_trend:2024-01:2024-06)
+    """
+    if all(param is None for param in params):
+        return analysis_type
+    return ":".join([analysis_type, *("" if param is None else str(param) for param in params)])
+
+
+def _check(value, schema, path):
+    if schema["type"] == "object":
+        if not isinstance(value, dict) or set(value) != set(schema["properties"]):
+            raise ValueError(f"{path}: 필드가 스키마와 다릅니다.")
+        for name, child in schema["properties"].items():
+            _check(value[name], child, f"{path}.{name}")
+    elif schema["type"] == "array":
+        if not isinstance(value, list):
+            raise ValueError(f"{path}: 목록이 아닙니다.")
+        for i, item in enumerate(value):
+            _check(item, schema["items"], f"{path}[{i}]")
+    elif not isinstance(value, str) or ("enum" in schema and value not in schema["enum"]):
+        raise ValueError(f"{path}: 허용되지 않는 값입니다.")
+
+
+def parse_analysis(analysis_type, content):
+    """
+    구조화 출력 응답을 스키마로 검증하여 필드로 변환합니다.
+
+    Returns:
+        필드 dict
+
+    Raises:
+        ValueError: JSON이 아니거나 스키마와 맞지 않는 경우
+    """
+    try:
+        fields = orjson.loads(content or "")
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"{analysis_type} 분석 응답이 JSON이 아닙니다.") from e
+    _check(fields, ANALYSIS_SCHEMAS[analysis_type], analysis_type)
+    return fields
+
+
+def _bullets(items):
+    return [f"- {item}" for item in items]
+
+
+def render_analysis(analysis_type, fields):
+    """
+    저장된 필드로 분석 결과 Markdown을 조립합니다. (LLM 호출 없음)
+
+    Returns:
+        Markdown 형식의 텍스트
+    """
+    lines = [f"## {ANALYSIS_TITLES[analysis_type]}"]
+    if analysis_type == "credit_trend":
+        lines += [f"{fields['summary']} (추세: {fields['trend']})", "", "### 강점", *_bullets(fields["strengths"]),
+                  "", "### 약점", *_bullets(fields["weaknesses"]), "", "### 개선 조언", *_bullets(fields["advice"]),
+                  "", "### 적합한 대출 상품", *_bullets(fields["loan_products"])]
+    elif analysis_type == "future_credit":
+        lines += [fields["outlook"], "", "### 주요 영향 요인", *_bullets(fields["drivers"]),
+                  "", "### 행동 계획", *_bullets(fields["action_plan"]),
+                  "", "### 시나리오", f"- 현재 추세 지속: {fields['scenario_current']}",
+                  f"- 개선 조치 시: {fields['scenario_improved']}"]
+    elif analysis_type == "financial_products":
+        lines += ["### 대출 상품"]
+        lines += [f"- {p['name']} (예상 금리 {p['rate']}, 한도 {p['limit']}): {p['reason']}" for p in fields["loans"]]
+        lines += ["", "### 저축/투자 상품"]
+        lines += [f"- {p['name']}: {p['reason']}" for p in fields["savings"]]
+        lines += ["", "### 피해야 할 상품/행동", *_bullets(fields["avoid"])]
+    elif analysis_type == "credit_decision":
+        rates = fields["rate_range"]
+        rate_text = f"연 {rates[0]}~{rates[1]}%" if rates else "추가 심사 필요"
+        lines += [f"- 심사 의견: {fields['decision']} (신용 위험 모델 v{fields['model_version']})",
+                  f"- 승인 확률: {fields['approval_probability'] * 100:.1f}%",
+                  f"- 금리 등급: {fields['rate_band']} ({rate_text})", "", "### 판단 근거", *_bullets(fields["reasons"])]
+        if fields["conditions"]:
+            lines += ["", "### 승인 조건", *_bullets(fields["conditions"])]
+    return "\n".join(lines)
+
+
+def select_fields(fields, names):
+    """
+    저장된 필드 중 요청한 필드만 반환합니다. (예: financial_products의 loans만)
+
+    Raises:
+        KeyError: 없는 필드를 요청한 경우
+    """
+    missing = [name for name in names if name not in fields]
+    if missing:
+        raise KeyError(f"없는 필드입니다: {', '.join(missing)}")
+    return {name: fields[name] for name in names}
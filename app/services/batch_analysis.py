@@ -0,0 +1,258 @@
+import json
+import os
+import time
+from app.services.ai_analyzer import CustomerAnalyzer, decision_key
+from app.services.analysis_schemas import parse_analysis
+from app.services.llm_gateway import client as openai_client, DEFAULT_MODEL
+from app.utils.customer_store import DATA_DIR, get_store, write_json_atomic
+from app.utils.analysis_store import save_analyses
+
+# 배치 요청/작업 파일 저장 디렉토리
+BATCH_DIR = os.path.join(DATA_DIR, "batches")
+
+# 배치로 실행할 수 있는 분석 유형과 요청 구성 메서드
+ANALYSIS_BUILDERS = {
+    "credit_trend": lambda analyzer: analyzer.build_credit_trend_request(),
+    "future_credit": lambda analyzer: analyzer.build_future_credit_request(),
+    "financial_products": lambda analyzer: analyzer.build_product_recommendation_request(),
+    "credit_decision": lambda analyzer: analyzer.build_credit_decision_request(),
+}
+
+# 배치 상태
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class OpenAIBatchClient:
+    """OpenAI Batch API 클라이언트"""
+
+    def __init__(self, client=openai_client):
+        self.client = client
+
+    def submit(self, filepath):
+        with open(filepath, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    def status(self, batch_id):
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id):
+        batch = self.client.batches.retrieve(batch_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(self.client.files.content(file_id).text.splitlines())
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+class LocalBatchClient:
+    """
+    배치 파일을 로컬에서 즉시 처리하는 대체 클라이언트 (테스트/개발용)
+
+    Args:
+        responder: 요청 본문(body)을 받아 응답 텍스트를 반환하는 함수
+    """
+
+    def __init__(self, responder):
+        self.responder = responder
+        self._batches = {}
+
+    def submit(self, filepath):
+        batch_id = f"local_batch_{len(self._batches) + 1}"
+        results = []
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    content = self.responder(request["body"])
+                    results.append({
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+                        "error": None
+                    })
+                except Exception as e:
+                    results.append({"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}})
+        self._batches[batch_id] = results
+        return batch_id
+
+    def status(self, batch_id):
+        return "completed"
+
+    def results(self, batch_id):
+        return self._batches[batch_id]
+
+
+def build_batch_requests(customer_ids=None, analysis_types=None, model=DEFAULT_MODEL):
+    """
+    기존 프롬프트 구성 메서드로 배치 요청 목록을 만듭니다.
+
+    Args:
+        customer_ids: 대상 고객 ID 목록 (None이면 전체 고객)
+        analysis_types: 분석 유형 목록 (None이면 전체 유형)
+        model: 사용할 모델
+
+    Returns:
+        (배치 요청 목록, {custom_id: 데이터 버전}, 건너뛴 요청 목록, {custom_id: 모델 심사 결과(대출 심사 의견)})
+    """
+    store = get_store()
+    customer_ids = customer_ids or store.customer_ids()
+    analysis_types = analysis_types or list(ANALYSIS_BUILDERS)
+
+    invalid = [t for t in analysis_types if t not in ANALYSIS_BUILDERS]
+    if invalid:
+        raise ValueError(f"지원하지 않는 분석 유형입니다: {', '.join(invalid)}")
+
+    requests, versions, skipped, scores = [], {}, [], {}
+    for customer_id in customer_ids:
+        version = store.data_version(customer_id)
+        try:
+            analyzer = CustomerAnalyzer(customer_id, priority="batch")
+        except ValueError as e:
+            skipped.append({"customer_id": customer_id, "reason": str(e)})
+            continue
+
+        for analysis_type in analysis_types:
+            try:
+                request, data = ANALYSIS_BUILDERS[analysis_type](analyzer)
+            except ValueError as e:
+                skipped.append({"customer_id": customer_id, "analysis_type": analysis_type, "reason": str(e)})
+                continue
+
+            custom_id = f"{customer_id}:{analysis_type}"
+            requests.append({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model, **request}
+            })
+            versions[custom_id] = version[0] if version else None
+            if analysis_type == "credit_decision":
+                # 심사 의견은 요청에 넣은 모델 결과와 함께 저장
+                scores[custom_id] = data
+
+    return requests, versions, skipped, scores
+
+
+def _job_path(batch_id):
+    return os.path.join(BATCH_DIR, f"job_{batch_id}.json")
+
+
+def submit_batch(customer_ids=None, analysis_types=None, batch_client=None):
+    """
+    배치 요청 파일(JSONL)을 만들어 한 번에 제출합니다.
+
+    Returns:
+        배치 작업 정보
+    """
+    batch_client = batch_client or OpenAIBatchClient()
+    requests, versions, skipped, scores = build_batch_requests(customer_ids, analysis_types)
+    if not requests:
+        raise ValueError("배치로 처리할 요청이 없습니다.")
+
+    os.makedirs(BATCH_DIR, exist_ok=True)
+    input_path = os.path.join(BATCH_DIR, f"batch_input_{time.strftime('%Y%m%d_%H%M%S')}.jsonl")
+    with open(input_path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    batch_id = batch_client.submit(input_path)
+    job = {
+        "batch_id": batch_id,
+        "input_file": input_path,
+        "requests": len(requests),
+        "skipped": skipped,
+        "versions": versions,
+        "scores": scores,
+        "submitted_at": time.time(),
+        "status": "submitted"
+    }
+    write_json_atomic(_job_path(batch_id), job)
+    return job
+
+
+def collect_batch(batch_id, batch_client=None):
+    """
+    완료된 배치 결과를 구조화 필드로 검증하여 분석 저장소에 기록합니다.
+
+    Returns:
+        {"saved": 저장 수, "failed": 실패 목록}
+    """
+    batch_client = batch_client or OpenAIBatchClient()
+    with open(_job_path(batch_id), 'r', encoding='utf-8') as f:
+        job = json.load(f)
+
+    records, failed = [], []
+    for result in batch_client.results(batch_id):
+        custom_id = result["custom_id"]
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            failed.append({"custom_id": custom_id, "error": result.get("error") or response.get("body")})
+            continue
+
+        customer_id, analysis_type = custom_id.split(":", 1)
+        try:
+            fields = parse_analysis(analysis_type, response["body"]["choices"][0]["message"]["content"])
+        except ValueError as e:
+            failed.append({"custom_id": custom_id, "error": str(e)})
+            continue
+        key, score = analysis_type, job.get("scores", {}).get(custom_id)
+        if score is not None:
+            key, fields = decision_key(score["model_version"]), {**score, **fields}
+        records.append({
+            "customer_id": customer_id,
+            "analysis_type": key,
+            "result": fields,
+            "data_version": job["versions"].get(custom_id),
+            "source": "batch"
+        })
+
+    saved = save_analyses(records)
+    job.update({"status": "collected", "saved": saved, "failed": failed, "collected_at": time.time()})
+    write_json_atomic(_job_path(batch_id), job)
+    return {"saved": saved, "failed": failed}
+
+
+def run_batch(customer_ids=None, analysis_types=None, batch_client=None, poll_interval=60, timeout=24 * 3600):
+    """
+    배치 분석을 제출하고 완료될 때까지 기다린 뒤 결과를 저장합니다.
+
+    Args:
+        customer_ids: 대상 고객 ID 목록 (None이면 전체 고객)
+        analysis_types: 분석 유형 목록 (credit_trend, future_credit, financial_products, credit_decision)
+        batch_client: 배치 클라이언트 (기본값: OpenAI Batch API)
+        poll_interval: 상태 확인 간격(초)
+        timeout: 최대 대기 시간(초)
+
+    Returns:
+        배치 작업 결과 요약
+    """
+    batch_client = batch_client or OpenAIBatchClient()
+    job = submit_batch(customer_ids, analysis_types, batch_client)
+    batch_id = job["batch_id"]
+
+    expires_at = time.monotonic() + timeout
+    status = batch_client.status(batch_id)
+    while status not in TERMINAL_STATUSES:
+        if time.monotonic() >= expires_at:
+            return {"batch_id": batch_id, "status": status, "message": "배치가 아직 완료되지 않았습니다. collect_batch로 나중에 수집하세요."}
+        time.sleep(poll_interval)
+        status = batch_client.status(batch_id)
+
+    if status != "completed":
+        return {"batch_id": batch_id, "status": status}
+
+    return {"batch_id": batch_id, "status": status, "requests": job["requests"],
+            "skipped": len(job["skipped"]), **collect_batch(batch_id, batch_client)}
+
+
+if __name__ == "__main__":
+    # 야간 배치: 전체 고객의 모든 분석 유형을 Batch API로 실행
+    summary = run_batch()
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
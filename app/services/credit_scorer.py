@@ -0,0 +1,320 @@
+import json
+import os
+import threading
+import time
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from app.utils.customer_store import DATA_DIR, write_json_atomic
+from app.utils.monthly_records import METRIC_FIELDS
+from app.utils.portfolio_arrays import get_portfolio
+
+# 모델 저장 디렉토리 (credit_risk_v{버전}.joblib + 메타데이터, current.json이 현재 버전을 가리킴)
+MODELS_DIR = os.path.join(DATA_DIR, "models")
+CURRENT_FILENAME = "current.json"
+
+# 모델 입력 특성
+FEATURES = (
+    "credit_score", "income", "expenses", "savings", "debt", "loan_payments",
+    "dti", "debt_to_income", "expense_ratio", "savings_months",
+    "overdue_12m", "score_trend_6m", "income_volatility"
+)
+
+# 특성 설명 (점수 설명문 작성용)
+FEATURE_LABELS = {
+    "credit_score": "신용 점수",
+    "income": "월 소득",
+    "expenses": "월 지출",
+    "savings": "저축액",
+    "debt": "부채 총액",
+    "loan_payments": "월 대출상환액",
+    "dti": "총부채상환비율(월 상환액/소득)",
+    "debt_to_income": "부채/연소득 비율",
+    "expense_ratio": "소득 대비 지출 비율",
+    "savings_months": "저축액으로 버틸 수 있는 개월 수",
+    "overdue_12m": "최근 12개월 연체 횟수",
+    "score_trend_6m": "최근 6개월 신용 점수 변화",
+    "income_volatility": "소득 변동성(변동계수)",
+}
+
+# 승인 확률 구간별 금리 등급 (최소 확률, 등급, 금리 범위(%))
+RATE_BANDS = (
+    (0.8, "A", (4.5, 6.0)),
+    (0.6, "B", (6.0, 8.5)),
+    (0.4, "C", (8.5, 12.0)),
+    (0.0, "D", None),  # 승인 보류 (심사 필요)
+)
+
+# 금리 등급별 심사 의견
+BAND_DECISIONS = {"A": "승인", "B": "승인", "C": "조건부 승인", "D": "승인 보류"}
+
+_FIELD = {field: i for i, field in enumerate(METRIC_FIELDS)}
+
+
+def _trailing(values, last, months):
+    """고객별 마지막 데이터 월부터 거슬러 올라간 months개월 구간 (고객 수, months, 항목 수)을 반환합니다."""
+    offsets = np.arange(months - 1, -1, -1)
+    index = last[:, None] - offsets[None, :]
+    window = values[np.arange(len(values))[:, None], np.clip(index, 0, None)]
+    window[index < 0] = np.nan
+    return window
+
+
+def build_features(values):
+    """
+    포트폴리오 배열에서 모델 입력 특성을 한 번에 계산합니다.
+
+    Args:
+        values: (고객 수, 월 수, 항목 수) 배열, 데이터가 없는 월은 NaN
+
+    Returns:
+        (고객 수, 특성 수) float64 배열
+    """
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    if count == 0 or values.shape[1] == 0:
+        return np.zeros((count, len(FEATURES)))
+
+    present = ~np.isnan(values[:, :, _FIELD["credit_score"]])
+    last = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+    window = _trailing(values, last, 12)
+    latest = window[:, -1]
+
+    def col(name, source=latest):
+        return source[..., _FIELD[name]]
+
+    income = col("income")
+    safe_income = np.where(income > 0, income, np.nan)
+    safe_expenses = np.where(col("expenses") > 0, col("expenses"), np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        income_window = col("income", window)
+        features = np.column_stack([
+            col("credit_score"),
+            income,
+            col("expenses"),
+            col("savings"),
+            col("debt"),
+            col("loan_payments"),
+            col("loan_payments") / safe_income,
+            col("debt") / (safe_income * 12),
+            col("expenses") / safe_income,
+            col("savings") / safe_expenses,
+            np.nansum(col("overdue_payments", window), axis=1),
+            col("credit_score") - col("credit_score", window[:, -7]),
+            np.nanstd(income_window, axis=1) / np.nanmean(income_window, axis=1),
+        ])
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def bootstrap_labels(features):
+    """
+    실제 상환 결과가 없을 때 사용하는 초기 학습 라벨 (심사 기준 규칙)
+
+    신용 점수 650 이상, 총부채상환비율 40% 미만, 최근 12개월 연체 1회 이하이면 승인(1)으로 봅니다.
+    실제 승인/부도 결과가 쌓이면 train_model의 labels로 대체합니다.
+    """
+    f = {name: features[:, i] for i, name in enumerate(FEATURES)}
+    return ((f["credit_score"] >= 650) & (f["dti"] < 0.4) & (f["overdue_12m"] <= 1)).astype(int)
+
+
+def rate_band(probability):
+    """승인 확률을 (등급, 금리 범위)로 변환합니다."""
+    for minimum, band, rates in RATE_BANDS:
+        if probability >= minimum:
+            return band, rates
+    return RATE_BANDS[-1][1], RATE_BANDS[-1][2]
+
+
+def _model_path(version):
+    return os.path.join(MODELS_DIR, f"credit_risk_v{version}.joblib")
+
+
+def _current_path():
+    return os.path.join(MODELS_DIR, CURRENT_FILENAME)
+
+
+def _read_current():
+    try:
+        with open(_current_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def train_model(customer_ids=None, labels=None, random_state=42):
+    """
+    포트폴리오 데이터로 신용 위험 모델을 학습하고 새 버전으로 저장합니다.
+
+    Args:
+        customer_ids: 학습 대상 고객 ID 목록 (None이면 전체 고객)
+        labels: {고객 ID: 0/1} 실제 승인/상환 결과 (None이면 bootstrap_labels 사용)
+        random_state: 검증 데이터 분할 시드
+
+    Returns:
+        저장된 모델 메타데이터
+    """
+    segment = get_portfolio()
+    ids, values = segment.select(customer_ids)
+    features = build_features(values)
+
+    if labels is not None:
+        known = [i for i, customer_id in enumerate(ids) if customer_id in labels]
+        features = features[known]
+        y = np.array([int(labels[ids[i]]) for i in known])
+        label_source = "outcomes"
+    else:
+        y = bootstrap_labels(features)
+        label_source = "bootstrap_rules"
+
+    if len(np.unique(y)) < 2:
+        raise ValueError("학습 데이터에 승인/거절 사례가 모두 있어야 합니다.")
+
+    model = make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, class_weight="balanced"))
+    auc = None
+    stratify = y if min(np.bincount(y)) >= 2 else None
+    if len(y) >= 20 and stratify is not None:
+        x_train, x_test, y_train, y_test = train_test_split(
+            features, y, test_size=0.2, random_state=random_state, stratify=stratify
+        )
+        model.fit(x_train, y_train)
+        if len(np.unique(y_test)) == 2:
+            auc = round(float(roc_auc_score(y_test, model.predict_proba(x_test)[:, 1])), 4)
+    model.fit(features, y)
+
+    current = _read_current()
+    version = (current["version"] if current else 0) + 1
+    metadata = {
+        "version": version,
+        "trained_at": time.time(),
+        "features": list(FEATURES),
+        "samples": int(len(y)),
+        "positive_rate": round(float(y.mean()), 4),
+        "label_source": label_source,
+        "validation_auc": auc,
+        "portfolio_generation": segment.generation,
+        "data_version": segment.data_version
+    }
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    tmp_path = f"{_model_path(version)}.{os.getpid()}.tmp"
+    joblib.dump({"model": model, "metadata": metadata}, tmp_path)
+    os.replace(tmp_path, _model_path(version))
+    write_json_atomic(_current_path(), metadata)
+    return metadata
+
+
+def model_version():
+    """현재 모델 버전을 반환합니다. (모델 파일을 불러오지 않음, 학습된 모델이 없으면 None)"""
+    current = _read_current()
+    return current["version"] if current else None
+
+
+_train_lock = threading.Lock()
+
+
+def ensure_model():
+    """
+    학습된 모델이 없으면 현재 포트폴리오와 심사 기준 규칙(bootstrap_labels)으로 첫 버전을 학습합니다.
+
+    대출 심사 기본 응답이 모델 학습 API를 먼저 호출하지 않아도 동작하도록 합니다.
+
+    Returns:
+        현재 모델 버전
+
+    Raises:
+        ValueError: 학습 데이터가 부족한 경우
+    """
+    with _train_lock:
+        if _read_current() is None:
+            train_model()
+    return model_version()
+
+
+_loaded = None
+_loaded_lock = threading.Lock()
+
+
+def load_model():
+    """
+    현재 버전의 모델을 불러옵니다. (다른 워커가 새 버전을 저장하면 다시 불러옴)
+
+    Returns:
+        (모델, 메타데이터)
+
+    Raises:
+        ValueError: 학습된 모델이 없는 경우
+    """
+    global _loaded
+    current = _read_current()
+    if current is None:
+        raise ValueError("학습된 신용 위험 모델이 없습니다. 먼저 모델을 학습하세요.")
+
+    loaded = _loaded
+    if loaded is not None and loaded[1]["version"] == current["version"]:
+        return loaded
+
+    with _loaded_lock:
+        if _loaded is None or _loaded[1]["version"] != current["version"]:
+            artifact = joblib.load(_model_path(current["version"]))
+            _loaded = (artifact["model"], artifact["metadata"])
+        return _loaded
+
+
+def score_customers(customer_ids=None):
+    """
+    고객들의 대출 승인 확률과 금리 등급을 한 번에 계산합니다.
+
+    Args:
+        customer_ids: 고객 ID 목록 (None이면 전체 고객)
+
+    Returns:
+        {"model_version", "scores": [{"customer_id", "approval_probability", "rate_band", "rate_range"}]}
+    """
+    model, metadata = load_model()
+    ids, values = get_portfolio().select(customer_ids)
+    features = build_features(values)
+    probabilities = model.predict_proba(features)[:, 1] if len(ids) else np.array([])
+
+    scores = []
+    for customer_id, probability in zip(ids, probabilities):
+        band, rates = rate_band(probability)
+        scores.append({
+            "customer_id": customer_id,
+            "approval_probability": round(float(probability), 4),
+            "rate_band": band,
+            "rate_range": list(rates) if rates else None
+        })
+    return {"model_version": metadata["version"], "scores": scores}
+
+
+def score_factors(customer_id, top=5):
+    """
+    점수에 가장 크게 영향을 준 특성을 반환합니다. (표준화 값 × 회귀 계수)
+
+    Returns:
+        (점수 결과, [(특성, 값, 기여도)])
+    """
+    model, metadata = load_model()
+    _, values = get_portfolio().select([customer_id])
+    features = build_features(values)
+    scaler, classifier = model.named_steps["standardscaler"], model.named_steps["logisticregression"]
+    contributions = scaler.transform(features)[0] * classifier.coef_[0]
+    order = np.argsort(-np.abs(contributions))[:top]
+    factors = [(FEATURES[i], float(features[0, i]), round(float(contributions[i]), 3)) for i in order]
+
+    probability = float(model.predict_proba(features)[0, 1])
+    band, rates = rate_band(probability)
+    result = {
+        "customer_id": customer_id,
+        "model_version": metadata["version"],
+        "approval_probability": round(probability, 4),
+        "rate_band": band,
+        "rate_range": list(rates) if rates else None,
+        "decision": BAND_DECISIONS[band]
+    }
+    return result, factors
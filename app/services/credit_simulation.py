@@ -0,0 +1,245 @@
+import numpy as np
+from app.utils.monthly_records import METRIC_FIELDS
+from app.utils.data_generator import CREDIT_SCORE_MIN, CREDIT_SCORE_MAX, CREDIT_SCORE_STEP, OVERDUE_PENALTY
+from app.utils.portfolio_arrays import get_portfolio
+
+# 기본 예측 개월 수, 고객당 시뮬레이션 경로 수, 난수 시드
+DEFAULT_MONTHS_AHEAD = 6
+DEFAULT_PATHS = 2000
+DEFAULT_SEED = 42
+
+# 반환할 백분위수 (신뢰 구간: 5~95 = 90%, 25~75 = 50%)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# 예측에 필요한 최소 데이터 개월 수
+MIN_HISTORY = 3
+
+# 한 번에 시뮬레이션할 최대 원소 수 (고객 × 경로 × 개월, float32 기준 약 64MB)
+CHUNK_ELEMENTS = 16_000_000
+
+# 데이터 생성기의 월별 변동(균등 분포 정수)을 사전 분포로 사용
+# 이력이 짧은 고객은 이 값 쪽으로 추정치를 당겨 과적합을 막음
+PRIOR_DRIFT = (CREDIT_SCORE_STEP[0] + CREDIT_SCORE_STEP[1]) / 2
+PRIOR_VOLATILITY = np.sqrt(((CREDIT_SCORE_STEP[1] - CREDIT_SCORE_STEP[0] + 1) ** 2 - 1) / 12)
+PRIOR_WEIGHT = 3
+
+_SCORE = METRIC_FIELDS.index("credit_score")
+_OVERDUE = METRIC_FIELDS.index("overdue_payments")
+
+
+def fit_credit_walk(values):
+    """
+    고객별 신용 점수 랜덤 워크 파라미터를 한 번에 추정합니다.
+
+    데이터 생성기와 같은 모형(월별 변동 + 연체 시 추가 감점, 점수 범위로 제한)을 가정하고,
+    연체가 없던 달의 점수 변화로 추세(drift)와 변동성을, 연체 발생 비율로 연체 확률을 구합니다.
+
+    Args:
+        values: (고객 수, 월 수, 항목 수) 배열, 데이터가 없는 월은 NaN
+
+    Returns:
+        {"start", "drift", "volatility", "overdue_rate", "history", "last"} 고객별 배열
+    """
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    if count == 0 or values.shape[1] == 0:
+        empty = np.zeros(count)
+        return {"start": empty, "drift": empty, "volatility": empty, "overdue_rate": empty,
+                "history": empty.astype(int), "last": empty.astype(int)}
+
+    scores = values[:, :, _SCORE]
+    overdue = values[:, :, _OVERDUE]
+    present = ~np.isnan(scores)
+    history = present.sum(axis=1)
+    last = values.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+
+    # 연체 감점이 섞인 달은 제외하고 일반 변동만 추정
+    steps = np.diff(scores, axis=1)
+    steps[overdue[:, 1:] > 0] = np.nan
+    observed = ~np.isnan(steps)
+    n = observed.sum(axis=1)
+    total = np.where(observed, steps, 0.0).sum(axis=1)
+    squares = np.where(observed, steps ** 2, 0.0).sum(axis=1)
+
+    # 사전 분포와 가중 평균 (관측 n개월 + 사전 PRIOR_WEIGHT개월)
+    weight = n + PRIOR_WEIGHT
+    drift = (total + PRIOR_WEIGHT * PRIOR_DRIFT) / weight
+    second_moment = (squares + PRIOR_WEIGHT * (PRIOR_VOLATILITY ** 2 + PRIOR_DRIFT ** 2)) / weight
+    volatility = np.sqrt(np.maximum(second_moment - drift ** 2, 0.0))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overdue_rate = np.where(present, overdue > 0, False).sum(axis=1) / history
+    return {
+        "start": scores[np.arange(count), last],
+        "drift": drift,
+        "volatility": volatility,
+        "overdue_rate": np.nan_to_num(overdue_rate),
+        "history": history,
+        "last": last
+    }
+
+
+def simulate_credit_paths(params, months_ahead=DEFAULT_MONTHS_AHEAD, paths=DEFAULT_PATHS, seed=DEFAULT_SEED):
+    """
+    고객별 미래 신용 점수 경로를 벡터 연산으로 시뮬레이션합니다.
+
+    모든 고객이 같은 표준 난수(공통 난수)를 쓰므로 고객의 결과는 함께 계산한 고객 구성과 무관하게
+    (이력, 시드, 경로 수, 개월 수)만으로 재현됩니다.
+
+    Args:
+        params: fit_credit_walk 결과
+        months_ahead: 예측 개월 수
+        paths: 고객당 경로 수
+        seed: 난수 시드
+
+    Returns:
+        (고객 수, 개월 수, 경로 수) float32 배열
+    """
+    rng = np.random.default_rng(seed)
+    # 생성기와 같은 균등 분포 변동 (평균 0, 분산 1로 표준화)
+    shocks = rng.uniform(-np.sqrt(3), np.sqrt(3), size=(months_ahead, paths)).astype(np.float32)
+    overdue_draws = rng.random((months_ahead, paths), dtype=np.float32)
+    penalties = rng.uniform(OVERDUE_PENALTY[0], OVERDUE_PENALTY[1], size=(months_ahead, paths)).astype(np.float32)
+
+    drift = params["drift"].astype(np.float32)[:, None]
+    volatility = params["volatility"].astype(np.float32)[:, None]
+    overdue_rate = params["overdue_rate"].astype(np.float32)[:, None]
+
+    count = len(params["start"])
+    result = np.empty((count, months_ahead, paths), dtype=np.float32)
+    score = np.repeat(params["start"].astype(np.float32)[:, None], paths, axis=1)
+    step = np.empty_like(score)
+    for month in range(months_ahead):
+        np.multiply(volatility, shocks[month], out=step)
+        step += drift
+        score += step
+        # 연체가 발생한 경로만 추가 감점
+        score -= np.where(overdue_draws[month] < overdue_rate, penalties[month], np.float32(0))
+        np.clip(score, CREDIT_SCORE_MIN, CREDIT_SCORE_MAX, out=score)
+        result[:, month] = score
+    return result
+
+
+def _percentiles(simulated):
+    """경로 축(마지막 축)을 정렬해 PERCENTILES 값을 선형 보간으로 구합니다. (np.percentile과 같은 결과)"""
+    ordered = np.sort(simulated, axis=-1)
+    position = np.asarray(PERCENTILES, dtype=np.float64) / 100 * (ordered.shape[-1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, ordered.shape[-1] - 1)
+    fraction = (position - lower).astype(np.float32)
+    return ordered[..., lower] * (1 - fraction) + ordered[..., upper] * fraction
+
+
+def forecast_bands(values, months_ahead=DEFAULT_MONTHS_AHEAD, paths=DEFAULT_PATHS, seed=DEFAULT_SEED):
+    """
+    포트폴리오 배열로 고객별 예측 백분위수 구간을 계산합니다.
+
+    메모리를 일정하게 유지하도록 고객을 나누어 시뮬레이션하고 백분위수만 남깁니다.
+
+    Args:
+        values: (고객 수, 월 수, 항목 수) 배열
+        months_ahead: 예측 개월 수
+        paths: 고객당 경로 수
+        seed: 난수 시드
+
+    Returns:
+        (fit_credit_walk 결과, (고객 수, 백분위수 수, 개월 수) 배열)
+        데이터가 MIN_HISTORY개월 미만인 고객의 구간은 NaN
+    """
+    params = fit_credit_walk(values)
+    count = len(params["start"])
+    bands = np.full((count, len(PERCENTILES), months_ahead), np.nan, dtype=np.float32)
+    eligible = np.flatnonzero(params["history"] >= MIN_HISTORY)
+
+    chunk = max(1, CHUNK_ELEMENTS // (paths * months_ahead))
+    for begin in range(0, len(eligible), chunk):
+        rows = eligible[begin:begin + chunk]
+        simulated = simulate_credit_paths({k: v[rows] for k, v in params.items()}, months_ahead, paths, seed)
+        bands[rows] = _percentiles(simulated).transpose(0, 2, 1)
+    return params, bands
+
+
+def _forecast_months(last_month, months_ahead):
+    return [str(m) for m in last_month + np.arange(1, months_ahead + 1)]
+
+
+def _band_dict(bands):
+    return {f"p{p}": [round(float(v), 1) for v in band] for p, band in zip(PERCENTILES, bands)}
+
+
+def forecast_customer(customer_id, months_ahead=DEFAULT_MONTHS_AHEAD, paths=DEFAULT_PATHS, seed=DEFAULT_SEED):
+    """
+    고객 한 명의 신용 점수 예측 구간을 계산합니다.
+
+    Returns:
+        {"customer_id", "last_month", "current_score", "months", "bands": {"p5": [...], ...}, "model": {...}}
+
+    Raises:
+        KeyError: 포트폴리오에 없는 고객인 경우
+        ValueError: 예측에 필요한 데이터가 부족한 경우
+    """
+    segment = get_portfolio()
+    _, values = segment.select([customer_id])
+    params, bands = forecast_bands(values, months_ahead, paths, seed)
+    if params["history"][0] < MIN_HISTORY:
+        raise ValueError(f"예측을 위한 충분한 데이터가 없습니다. 최소 {MIN_HISTORY}개월 이상의 데이터가 필요합니다.")
+
+    last_month = segment.months[params["last"][0]]
+    return {
+        "customer_id": customer_id,
+        "last_month": str(last_month),
+        "current_score": float(params["start"][0]),
+        "months": _forecast_months(last_month, months_ahead),
+        "bands": _band_dict(bands[0]),
+        "model": {
+            "drift": round(float(params["drift"][0]), 3),
+            "volatility": round(float(params["volatility"][0]), 3),
+            "overdue_rate": round(float(params["overdue_rate"][0]), 3),
+            "history_months": int(params["history"][0]),
+            "paths": paths,
+            "seed": seed
+        }
+    }
+
+
+def forecast_portfolio(customer_ids=None, months_ahead=DEFAULT_MONTHS_AHEAD, paths=DEFAULT_PATHS,
+                       seed=DEFAULT_SEED):
+    """
+    여러 고객(기본값: 전체 포트폴리오)의 신용 점수 예측 구간을 한 번에 계산합니다.
+
+    Args:
+        customer_ids: 고객 ID 목록 (None이면 전체 고객)
+        months_ahead: 예측 개월 수
+        paths: 고객당 경로 수
+        seed: 난수 시드
+
+    Returns:
+        {"generation", "months_ahead", "paths", "percentiles", "forecasts": [{"customer_id", "months", "bands"}],
+         "skipped": [데이터 부족 고객 ID]}
+
+    Raises:
+        KeyError: 포트폴리오에 없는 고객 ID가 있는 경우
+    """
+    segment = get_portfolio()
+    ids, values = segment.select(customer_ids)
+    params, bands = forecast_bands(values, months_ahead, paths, seed)
+
+    forecasts, skipped = [], []
+    for i, customer_id in enumerate(ids):
+        if params["history"][i] < MIN_HISTORY:
+            skipped.append(customer_id)
+            continue
+        forecasts.append({
+            "customer_id": customer_id,
+            "current_score": float(params["start"][i]),
+            "months": _forecast_months(segment.months[params["last"][i]], months_ahead),
+            "bands": _band_dict(bands[i])
+        })
+    return {
+        "generation": segment.generation,
+        "months_ahead": months_ahead,
+        "paths": paths,
+        "percentiles": list(PERCENTILES),
+        "forecasts": forecasts,
+        "skipped": skipped
+    }
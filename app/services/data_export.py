@@ -0,0 +1,241 @@
+import zlib
+from datetime import datetime
+import orjson
+import pandas as pd
+from app.utils.customer_store import get_store
+from app.utils.monthly_records import METRIC_FIELDS
+from app.services.data_import import IMPORT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 내보내기는 pyarrow가 있을 때만 지원
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축은 zstandard가 있을 때만 지원
+    zstandard = None
+
+# 내보내기 형식별 미디어 타입과 파일 확장자
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+# 스트림 압축 방식별 파일 확장자 (Parquet은 압축 대신 파일 내부 코덱으로 적용)
+COMPRESSIONS = {"gzip": "gz", "zstd": "zst"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# 가져오기와 같은 컬럼 순서 (내보낸 파일을 그대로 다시 가져올 수 있음)
+EXPORT_COLUMNS = IMPORT_COLUMNS
+
+# 한 번에 읽어 변환할 고객 수 (서버 메모리 사용량 상한)
+BATCH_CUSTOMERS = 1000
+
+_INT_FIELDS = ("credit_score", "overdue_payments")
+
+
+def _check_month(value):
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise ValueError("날짜 형식은 YYYY-MM이어야 합니다.")
+
+
+def check_export_options(fmt, compression=None, start_date=None, end_date=None):
+    """
+    내보내기 옵션을 검증합니다. (스트리밍을 시작하기 전에 호출)
+
+    Returns:
+        (형식, 압축 방식, 시작 월, 종료 월)
+
+    Raises:
+        ValueError: 지원하지 않는 형식/압축이거나 필요한 모듈이 없거나 날짜 형식이 잘못된 경우
+    """
+    fmt = (fmt or "").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt or '없음'} ({', '.join(EXPORT_FORMATS)} 지원)")
+    compression = (compression or "").lower() or None
+    if compression and compression not in COMPRESSIONS:
+        raise ValueError(f"지원하지 않는 압축 방식입니다: {compression} ({', '.join(COMPRESSIONS)} 지원)")
+    if fmt == "parquet" and pq is None:
+        raise ValueError("Parquet 파일로 내보내려면 pyarrow 패키지가 필요합니다.")
+    if compression == "zstd" and fmt != "parquet" and zstandard is None:
+        raise ValueError("zstd 압축을 사용하려면 zstandard 패키지가 필요합니다.")
+
+    start_date, end_date = _check_month(start_date), _check_month(end_date)
+    if start_date and end_date and start_date > end_date:
+        raise ValueError("시작 월은 종료 월보다 이후일 수 없습니다.")
+    return fmt, compression, start_date, end_date
+
+
+def export_filename(fmt, compression=None):
+    """내보내기 파일 이름 (예: portfolio_export.csv.gz)"""
+    name = f"portfolio_export.{EXPORT_FORMATS[fmt][1]}"
+    if compression and fmt != "parquet":
+        name += f".{COMPRESSIONS[compression]}"
+    return name
+
+
+def export_media_type(fmt, compression=None):
+    if compression == "gzip" and fmt != "parquet":
+        return "application/gzip"
+    if compression == "zstd" and fmt != "parquet":
+        return "application/zstd"
+    return EXPORT_FORMATS[fmt][0]
+
+
+def _in_range(summary, start_date, end_date):
+    """매니페스트 파생 지표만으로 기간과 겹치는 고객인지 판단합니다. (고객 파일을 읽지 않음)"""
+    if not summary["months"]:
+        return False
+    if start_date and summary["last_month"][:7] < start_date:
+        return False
+    if end_date and summary["first_month"][:7] > end_date:
+        return False
+    return True
+
+
+def iter_batches(store=None, start_date=None, end_date=None, profile_type=None):
+    """
+    고객 ID 순서로 BATCH_CUSTOMERS명씩 월별 데이터를 컬럼 목록으로 묶어 반환합니다.
+
+    Yields:
+        {컬럼 이름: 값 목록} (EXPORT_COLUMNS 순서, 기간 밖의 월은 제외)
+    """
+    store = store or get_store()
+    after = None
+    while True:
+        page, after, _ = store.list_customers(profile_type, after, BATCH_CUSTOMERS)
+        customer_ids = [cid for cid, entry in page if _in_range(entry["summary"], start_date, end_date)]
+
+        columns = {column: [] for column in EXPORT_COLUMNS}
+        for customer in store.read_customers(customer_ids):
+            rows = customer["monthly_data"]
+            if start_date or end_date:
+                rows = [row for row in rows
+                        if (not start_date or row["month"][:7] >= start_date)
+                        and (not end_date or row["month"][:7] <= end_date)]
+            if not rows:
+                continue
+            count = len(rows)
+            columns["customer_id"] += [customer["customer_id"]] * count
+            columns["name"] += [customer["name"]] * count
+            columns["profile_type"] += [customer.get("profile_type")] * count
+            columns["month"] += [row["month"] for row in rows]
+            for field in METRIC_FIELDS:
+                columns[field] += [row.get(field) or 0 for row in rows]
+
+        if columns["customer_id"]:
+            yield columns
+        if after is None:
+            return
+
+
+def _csv_chunks(batches):
+    header = True
+    for columns in batches:
+        yield pd.DataFrame(columns).to_csv(index=False, header=header, lineterminator="\n").encode("utf-8")
+        header = False
+    if header:
+        # 데이터가 없어도 헤더는 내보냄
+        yield (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+
+
+def _ndjson_chunks(batches):
+    for columns in batches:
+        yield b"".join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n"
+                       for row in zip(*(columns[column] for column in EXPORT_COLUMNS)))
+
+
+class _ChunkSink:
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 꺼내 가는 출력 스트림"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    fields = [pa.field(column, pa.string()) for column in ("customer_id", "name", "profile_type", "month")]
+    fields += [pa.field(field, pa.int64() if field in _INT_FIELDS else pa.float64()) for field in METRIC_FIELDS]
+    return pa.schema(fields)
+
+
+def _parquet_chunks(batches, compression=None):
+    # 배치마다 행 그룹 하나를 쓰고, 기록된 바이트를 바로 내보냄
+    sink = _ChunkSink()
+    schema = _parquet_schema()
+    with pq.ParquetWriter(sink, schema, compression=compression or "snappy") as writer:
+        for columns in batches:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _compress(chunks, compression):
+    if compression == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip 헤더 포함
+    else:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_portfolio(fmt, compression=None, start_date=None, end_date=None, profile_type=None, store=None):
+    """
+    전체 고객의 월별 데이터를 저장소에서 바로 읽어 형식에 맞게 인코딩한 바이트 조각으로 내보냅니다.
+
+    고객을 BATCH_CUSTOMERS명씩 읽고 변환하므로 고객 수와 관계없이 서버 메모리 사용량이 일정합니다.
+    옵션은 check_export_options로 먼저 검증해야 합니다.
+
+    Args:
+        fmt: 내보내기 형식 (csv, ndjson, parquet)
+        compression: 압축 방식 (gzip, zstd / Parquet은 파일 내부 코덱으로 적용)
+        start_date: 시작 월 (YYYY-MM 형식)
+        end_date: 종료 월 (YYYY-MM 형식, 해당 월 포함)
+        profile_type: 프로필 유형 필터
+        store: 고객 저장소 (기본값: 전역 저장소)
+
+    Yields:
+        파일 바이트 조각
+    """
+    batches = iter_batches(store, start_date, end_date, profile_type)
+    if fmt == "parquet":
+        yield from _parquet_chunks(batches, compression)
+        return
+
+    chunks = _csv_chunks(batches) if fmt == "csv" else _ndjson_chunks(batches)
+    yield from (_compress(chunks, compression) if compression else chunks)
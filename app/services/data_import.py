@@ -0,0 +1,203 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from app.utils.customer_store import get_store
+from app.utils.monthly_records import METRIC_FIELDS
+from app.services.anomaly_detector import detect_imported
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 가져오기는 pyarrow가 있을 때만 지원
+    pq = None
+
+# 가져오기 파일 컬럼 (name은 새 고객에만 필요, profile_type/overdue_payments는 선택)
+ID_COLUMNS = ("customer_id", "name", "profile_type")
+REQUIRED_COLUMNS = ("customer_id", "month", "credit_score", "income", "expenses", "savings", "debt", "loan_payments")
+IMPORT_COLUMNS = ID_COLUMNS + ("month",) + METRIC_FIELDS
+
+# 한 번에 읽고 검증할 행 수 (메모리 사용량 상한)
+CHUNK_ROWS = 50_000
+
+# 응답에 포함할 거부 행 예시 수
+MAX_REJECT_SAMPLES = 100
+
+# MonthlyCustomerData의 정수 항목과 실수 항목
+_INT_FIELDS = ("credit_score", "overdue_payments")
+_FLOAT_FIELDS = ("income", "expenses", "savings", "debt", "loan_payments")
+
+SUPPORTED_FORMATS = ("csv", "parquet")
+
+
+def detect_format(filename, fmt=None):
+    """
+    업로드 파일 형식을 결정합니다.
+
+    Raises:
+        ValueError: 지원하지 않는 형식이거나 Parquet 지원 모듈(pyarrow)이 없는 경우
+    """
+    fmt = (fmt or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {fmt or '알 수 없음'} (csv, parquet 지원)")
+    if fmt == "parquet" and pq is None:
+        raise ValueError("Parquet 파일을 가져오려면 pyarrow 패키지가 필요합니다.")
+    return fmt
+
+
+def read_chunks(fileobj, fmt):
+    """파일을 CHUNK_ROWS행씩 DataFrame으로 읽습니다. (파일 전체를 메모리에 올리지 않음)"""
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(fileobj)
+        columns = [c for c in IMPORT_COLUMNS if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=CHUNK_ROWS, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    dtypes = {column: str for column in ID_COLUMNS + ("month",)}
+    yield from pd.read_csv(fileobj, chunksize=CHUNK_ROWS, dtype=dtypes, encoding="utf-8-sig",
+                           usecols=lambda column: column in IMPORT_COLUMNS)
+
+
+def validate_chunk(df):
+    """
+    MonthlyCustomerData 규칙으로 한 청크의 모든 행을 컬럼 단위로 검증합니다.
+
+    Args:
+        df: 가져오기 컬럼을 가진 DataFrame
+
+    Returns:
+        (정규화된 유효 행 DataFrame, 행별 거부 사유 Series(유효하면 None))
+
+    Raises:
+        ValueError: 필수 컬럼이 없는 경우
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    reason = pd.Series(None, index=df.index, dtype=object)
+
+    def reject(mask, message):
+        reason[mask & reason.isna()] = message
+
+    customer_id = df["customer_id"].astype("string").str.strip()
+    reject(customer_id.isna() | (customer_id == ""), "customer_id 누락")
+
+    month = pd.to_datetime(df["month"], errors="coerce", format="mixed")
+    reject(month.isna(), "month 형식 오류")
+
+    out = pd.DataFrame({"customer_id": customer_id, "month": month.dt.strftime("%Y-%m-%d")}, index=df.index)
+    for column in ("name", "profile_type"):
+        out[column] = df[column].astype("string").str.strip() if column in df.columns else pd.NA
+
+    for field in _INT_FIELDS + _FLOAT_FIELDS:
+        if field not in df.columns:
+            # overdue_payments는 선택 항목 (기본값 0)
+            out[field] = 0
+            continue
+        values = pd.to_numeric(df[field], errors="coerce").astype(np.float64)
+        if field == "overdue_payments":
+            values = values.fillna(0)
+        reject(~np.isfinite(values), f"{field} 숫자 아님")
+        if field in _INT_FIELDS:
+            reject(np.isfinite(values) & (values != np.round(values)), f"{field} 정수 아님")
+        out[field] = values
+
+    # 같은 파일 안의 같은 고객/달 중복은 처음 행만 사용 (저장소는 고객별로 한 달에 한 건)
+    reject(out[["customer_id"]].assign(month=month.dt.strftime("%Y-%m")).duplicated() & reason.isna(), "중복 월")
+
+    valid = out[reason.isna()]
+    for field in _INT_FIELDS:
+        valid = valid.assign(**{field: valid[field].astype(np.int64)})
+    return valid, reason
+
+
+def group_customers(valid):
+    """유효 행을 고객별 시간순 월별 데이터 목록으로 묶습니다."""
+    valid = valid.sort_values(["customer_id", "month"], kind="stable")
+    ids = valid["customer_id"].to_numpy()
+    if not len(ids):
+        return []
+    starts = np.r_[0, np.flatnonzero(ids[1:] != ids[:-1]) + 1, len(ids)]
+
+    months = valid["month"].tolist()
+    metrics = [valid[field].tolist() for field in METRIC_FIELDS]
+    names = valid["name"].tolist()
+    profiles = valid["profile_type"].tolist()
+
+    customers = []
+    for begin, end in zip(starts[:-1], starts[1:]):
+        rows = [
+            {"month": months[i], **{field: metrics[k][i] for k, field in enumerate(METRIC_FIELDS)}}
+            for i in range(begin, end)
+        ]
+        name = next((n for n in names[begin:end] if isinstance(n, str) and n), None)
+        profile = next((p for p in profiles[begin:end] if isinstance(p, str) and p), None)
+        customers.append({"customer_id": ids[begin], "name": name, "profile_type": profile, "monthly_data": rows})
+    return customers
+
+
+def import_customer_file(fileobj, fmt, store=None):
+    """
+    CSV/Parquet 파일의 고객 월별 데이터를 청크 단위로 검증하여 저장소에 기록합니다.
+
+    파일은 고객별 시간순으로 정렬되어 있을 때 가장 효율적입니다.
+    기존 고객은 마지막 월 이후 데이터만 추가되고, 새 고객은 name이 있어야 생성됩니다.
+    청크마다 기존 고객에 추가된 데이터의 이상 여부를 판단하여 경보를 게시합니다. (새 고객은 이력으로만 반영)
+
+    Args:
+        fileobj: 읽기용 바이너리 파일 객체
+        fmt: 파일 형식 (csv, parquet)
+        store: 고객 저장소 (기본값: 전역 저장소)
+
+    Returns:
+        가져오기 결과 (처리량, 거부 행 통계 및 예시, 압축이 필요한 샤드, 게시한 경보 수)
+    """
+    store = store or get_store()
+    started = time.perf_counter()
+    total = imported = created = updated = alerts = 0
+    reasons, samples, compact = {}, [], set()
+
+    def record_reject(customer_id, month, message):
+        reasons[message] = reasons.get(message, 0) + 1
+        if len(samples) < MAX_REJECT_SAMPLES:
+            samples.append({"row": None, "reason": message, "customer_id": customer_id, "month": month})
+
+    for chunk in read_chunks(fileobj, fmt):
+        chunk.index = pd.RangeIndex(total + 1, total + 1 + len(chunk))  # 1부터 시작하는 데이터 행 번호
+        total += len(chunk)
+        valid, reason = validate_chunk(chunk)
+
+        invalid = reason.dropna()
+        for message, count in invalid.value_counts().items():
+            reasons[message] = reasons.get(message, 0) + int(count)
+        for row_number, message in invalid.head(max(0, MAX_REJECT_SAMPLES - len(samples))).items():
+            customer_id, month = (chunk.at[row_number, column] for column in ("customer_id", "month"))
+            samples.append({"row": int(row_number), "reason": message,
+                            "customer_id": None if pd.isna(customer_id) else str(customer_id),
+                            "month": None if pd.isna(month) else str(month)})
+
+        result = store.import_batch(group_customers(valid))
+        imported += result["rows"]
+        created += result["created"]
+        updated += result["updated"]
+        compact.update(result["compact"])
+        alerts += detect_imported(result["appended"])
+        for customer_id, month, message in result["rejected"]:
+            record_reject(customer_id, month, message)
+
+    elapsed = time.perf_counter() - started
+    rejected = sum(reasons.values())
+    return {
+        "rows": total,
+        "imported_rows": imported,
+        "rejected_rows": rejected,
+        "created_customers": created,
+        "updated_customers": updated,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(total / elapsed) if elapsed > 0 else None,
+        "rejected_by_reason": reasons,
+        "rejected_samples": samples,
+        "compact_shards": sorted(compact),
+        "alerts": alerts
+    }
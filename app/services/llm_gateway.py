@@ -0,0 +1,262 @@
+import hashlib
+import random
+import threading
+import time
+import openai
+import orjson
+from config.settings import OPENAI_API_KEY
+from app.services.llm_scheduler import scheduler, estimate_tokens, LatencyStat
+from app.utils.shared_cache import get_shared_cache
+
+# 기본 모델
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# 호출 전체 마감 시간(초)과 시도당 타임아웃(초)
+DEFAULT_DEADLINE = 30.0
+ATTEMPT_TIMEOUT = 20.0
+
+# 재시도 설정 (지수 백오프 + full jitter)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# 서킷 브레이커 설정
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+# 동일 요청 응답 캐시 유지 시간(초) (워커 간 공유)
+RESPONSE_CACHE_TTL = 24 * 3600
+
+# 재시도는 게이트웨이에서 직접 처리하므로 SDK 자체 재시도는 끔
+client = openai.OpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+
+
+class LLMUnavailableError(Exception):
+    """LLM 업스트림을 사용할 수 없는 경우 (서킷 차단 또는 재시도 소진)"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커
+
+    closed: 정상 호출 / open: 즉시 실패 / half_open: 복구 확인용 단일 호출 허용
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+    def allow(self):
+        """호출 허용 여부를 반환합니다."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """복구 확인 호출이 업스트림에 도달하지 못한 경우 다음 호출에 기회를 넘깁니다."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "open_for_seconds": round(time.monotonic() - self._opened_at, 1) if self._state != self.CLOSED and self._opened_at else 0
+            }
+
+
+breaker = CircuitBreaker()
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "calls": 0,
+    "successes": 0,
+    "failures": 0,
+    "retries": 0,
+    "short_circuited": 0,
+    "deadline_exceeded": 0,
+    "queue_timeouts": 0,
+    "cache_hits": 0
+}
+
+# 업스트림 응답 지연 (스케줄러 대기 시간과 분리하여 측정)
+_upstream_latency = LatencyStat()
+
+
+def _count(name, value=1):
+    with _metrics_lock:
+        _metrics[name] += value
+
+
+def get_metrics():
+    """게이트웨이 호출 지표와 서킷 브레이커 상태를 반환합니다."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics["breaker"] = breaker.snapshot()
+    metrics["upstream_latency"] = _upstream_latency.snapshot()
+    metrics["scheduler"] = scheduler.snapshot()
+    return metrics
+
+
+def _is_retryable(exc):
+    """429, 5xx, 네트워크/타임아웃 오류만 재시도합니다."""
+    if isinstance(exc, (openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _retry_after(exc):
+    """429 응답의 Retry-After 헤더(초)를 읽습니다."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt, exc):
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+    retry_after = _retry_after(exc)
+    return max(delay, retry_after) if retry_after else delay
+
+
+def _cache_key(model, messages, temperature, max_tokens, response_format=None):
+    # 자유 형식 요청은 기존과 같은 키를 유지
+    payload = orjson.dumps([model, messages, temperature, max_tokens] + ([response_format] if response_format else []))
+    return "llm:" + hashlib.sha256(payload).hexdigest()
+
+
+def chat_completion(messages, temperature=0.5, max_tokens=1000, model=DEFAULT_MODEL, deadline=DEFAULT_DEADLINE,
+                    priority="interactive", use_cache=True, response_format=None):
+    """
+    LLM 채팅 완성 요청을 보냅니다.
+
+    같은 요청의 응답은 워커 간 공유 캐시에서 바로 반환합니다.
+    호출 전 스케줄러에서 RPM/TPM 한도 내 슬롯을 우선순위대로 확보하고,
+    마감 시간 안에서 429/5xx/타임아웃 오류를 지수 백오프로 재시도하며,
+    업스트림 장애가 계속되면 서킷 브레이커가 열려 즉시 실패합니다.
+
+    Args:
+        messages: 채팅 메시지 목록
+        temperature: 샘플링 온도
+        max_tokens: 최대 생성 토큰 수
+        model: 모델 이름
+        deadline: 전체 호출 마감 시간(초)
+        priority: 우선순위 클래스 (interactive: 사용자 요청, batch: 배치/사전 계산)
+        use_cache: 공유 응답 캐시 사용 여부
+        response_format: 구조화 출력 형식 (예: JSON 스키마, None이면 자유 형식 텍스트)
+
+    Returns:
+        응답 텍스트
+
+    Raises:
+        LLMUnavailableError: 서킷이 열려 있거나, 대기/재시도로 마감 시간을 모두 소진한 경우
+        openai.APIError: 재시도 대상이 아닌 오류 (인증, 잘못된 요청 등)
+    """
+    _count("calls")
+    cache_key = _cache_key(model, messages, temperature, max_tokens, response_format) if use_cache else None
+    if cache_key:
+        cached = get_shared_cache().get_bytes(cache_key)
+        if cached is not None:
+            _count("cache_hits")
+            return cached.decode("utf-8")
+
+    if not breaker.allow():
+        _count("short_circuited")
+        raise LLMUnavailableError("LLM 서비스가 일시적으로 차단되었습니다. (circuit open)")
+
+    expires_at = time.monotonic() + deadline
+    estimated_tokens = estimate_tokens(messages, max_tokens)
+    attempt = 0
+    while True:
+        try:
+            scheduler.acquire(estimated_tokens, priority, timeout=max(0.0, expires_at - time.monotonic()))
+        except TimeoutError as e:
+            _count("queue_timeouts")
+            breaker.release_trial()
+            raise LLMUnavailableError(str(e)) from e
+
+        remaining = expires_at - time.monotonic()
+        try:
+            started = time.monotonic()
+            options = {"response_format": response_format} if response_format else {}
+            try:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=max(1.0, min(ATTEMPT_TIMEOUT, remaining)),
+                    **options
+                )
+            finally:
+                _upstream_latency.observe(time.monotonic() - started)
+
+            usage = getattr(response, "usage", None)
+            scheduler.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+            breaker.record_success()
+            _count("successes")
+            content = response.choices[0].message.content
+            if cache_key and content:
+                get_shared_cache().set_bytes(cache_key, content.encode("utf-8"), RESPONSE_CACHE_TTL)
+            return content
+
+        except Exception as e:
+            if not _is_retryable(e):
+                _count("failures")
+                breaker.record_success()  # 업스트림은 정상 응답함
+                raise
+
+            delay = _backoff(attempt, e)
+            if attempt >= MAX_RETRIES or time.monotonic() + delay >= expires_at:
+                _count("failures")
+                if attempt < MAX_RETRIES:
+                    _count("deadline_exceeded")
+                breaker.record_failure()
+                raise LLMUnavailableError(f"LLM 호출에 실패했습니다: {e}") from e
+
+            _count("retries")
+            attempt += 1
+            time.sleep(delay)
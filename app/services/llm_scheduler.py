@@ -0,0 +1,250 @@
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from config.settings import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_SCHEDULER_DB
+
+# 우선순위 클래스 (값이 작을수록 먼저 처리)
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class LatencyStat:
+    """호출 수, 평균, 최대 지연 시간을 누적합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0,
+                "max_ms": round(self.max * 1000, 1)
+            }
+
+
+class LocalBuckets:
+    """
+    프로세스 내 토큰 버킷 묶음
+
+    Args:
+        limits: {버킷 이름: 분당 한도}
+    """
+
+    def __init__(self, limits):
+        self._rates = {name: limit / 60.0 for name, limit in limits.items()}
+        self._capacity = dict(limits)
+        self._state = {name: [float(limit), time.monotonic()] for name, limit in limits.items()}
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        for name, state in self._state.items():
+            state[0] = min(self._capacity[name], state[0] + (now - state[1]) * self._rates[name])
+            state[1] = now
+
+    def try_acquire(self, amounts):
+        """
+        모든 버킷에서 한 번에 차감합니다.
+
+        Returns:
+            0이면 차감 성공, 양수면 다시 시도할 때까지 기다려야 할 시간(초)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0
+            for name, amount in amounts.items():
+                amount = min(amount, self._capacity[name])
+                deficit = amount - self._state[name][0]
+                if deficit > 0:
+                    wait = max(wait, deficit / self._rates[name])
+            if wait > 0:
+                return wait
+            for name, amount in amounts.items():
+                self._state[name][0] -= min(amount, self._capacity[name])
+            return 0.0
+
+    def adjust(self, name, delta):
+        """버킷 잔량을 보정합니다. (예상 토큰과 실제 사용량의 차이 환급)"""
+        with self._lock:
+            state = self._state[name]
+            state[0] = min(self._capacity[name], state[0] + delta)
+
+    def snapshot(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {name: {"available": round(state[0]), "per_minute": self._capacity[name]}
+                    for name, state in self._state.items()}
+
+
+class SQLiteBuckets(LocalBuckets):
+    """
+    SQLite 파일로 여러 워커 프로세스가 공유하는 토큰 버킷 묶음
+
+    `BEGIN IMMEDIATE` 트랜잭션으로 버킷 갱신을 직렬화합니다.
+    연결은 프로세스별로 처음 사용할 때 열어 preload 후 fork된 워커에서도 안전합니다.
+    """
+
+    def __init__(self, limits, path):
+        super().__init__(limits)
+        self.path = path
+        self._limits = dict(limits)
+        self._conn_obj = None
+        self._conn_pid = None
+
+    @property
+    def _conn(self):
+        if self._conn_obj is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS llm_buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+            for name, limit in self._limits.items():
+                conn.execute("INSERT OR IGNORE INTO llm_buckets VALUES (?, ?, ?)", (name, float(limit), time.time()))
+            self._conn_obj, self._conn_pid = conn, os.getpid()
+        return self._conn_obj
+
+    def _transaction(self, fn):
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                state = {}
+                for name, tokens, updated in conn.execute("SELECT name, tokens, updated FROM llm_buckets"):
+                    if name in self._rates:
+                        state[name] = [min(self._capacity[name], tokens + (now - updated) * self._rates[name]), now]
+                result = fn(state)
+                conn.executemany(
+                    "UPDATE llm_buckets SET tokens = ?, updated = ? WHERE name = ?",
+                    [(tokens, updated, name) for name, (tokens, updated) in state.items()]
+                )
+                conn.execute("COMMIT")
+                return result
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def try_acquire(self, amounts):
+        def acquire(state):
+            wait = 0.0
+            for name, amount in amounts.items():
+                deficit = min(amount, self._capacity[name]) - state[name][0]
+                if deficit > 0:
+                    wait = max(wait, deficit / self._rates[name])
+            if wait == 0:
+                for name, amount in amounts.items():
+                    state[name][0] -= min(amount, self._capacity[name])
+            return wait
+        return self._transaction(acquire)
+
+    def adjust(self, name, delta):
+        def apply(state):
+            state[name][0] = min(self._capacity[name], state[name][0] + delta)
+        self._transaction(apply)
+
+    def snapshot(self):
+        state = self._transaction(lambda s: {k: list(v) for k, v in s.items()})
+        return {name: {"available": round(s[0]), "per_minute": self._capacity[name]} for name, s in state.items()}
+
+
+class LLMScheduler:
+    """
+    외부 LLM 호출용 스케줄러
+
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 버킷을 함께 확인하며,
+    대기 중인 요청은 우선순위(interactive > batch)와 도착 순서대로 처리합니다.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._waits = {name: LatencyStat() for name in PRIORITIES}
+
+    def acquire(self, tokens, priority="interactive", timeout=None):
+        """
+        호출 슬롯을 확보할 때까지 대기합니다.
+
+        Args:
+            tokens: 예상 사용 토큰 수
+            priority: 우선순위 클래스 (interactive, batch)
+            timeout: 최대 대기 시간(초)
+
+        Returns:
+            대기한 시간(초)
+
+        Raises:
+            TimeoutError: 대기 시간 내에 슬롯을 얻지 못한 경우
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"지원하지 않는 우선순위입니다: {priority}")
+
+        ticket = (PRIORITIES[priority], next(self._seq))
+        started = time.monotonic()
+        expires_at = started + timeout if timeout is not None else None
+
+        with self._cond:
+            heapq.heappush(self._heap, ticket)
+            self._cond.notify_all()
+            try:
+                while True:
+                    wait = None
+                    if self._heap[0] == ticket:
+                        wait = self.buckets.try_acquire({"requests": 1, "tokens": tokens})
+                        if wait == 0:
+                            heapq.heappop(self._heap)
+                            self._cond.notify_all()
+                            waited = time.monotonic() - started
+                            self._waits[priority].observe(waited)
+                            return waited
+
+                    if expires_at is not None:
+                        remaining = expires_at - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("LLM 호출 대기 시간이 초과되었습니다.")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in self._heap:
+                    self._heap.remove(ticket)
+                    heapq.heapify(self._heap)
+                    self._cond.notify_all()
+                raise
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """실제 사용 토큰이 예상보다 적으면 차액을 TPM 버킷에 돌려줍니다."""
+        if actual_tokens is not None and actual_tokens != estimated_tokens:
+            self.buckets.adjust("tokens", estimated_tokens - actual_tokens)
+
+    def snapshot(self):
+        with self._cond:
+            queued = {name: sum(1 for p, _ in self._heap if p == level) for name, level in PRIORITIES.items()}
+        return {
+            "queued": queued,
+            "queue_wait": {name: stat.snapshot() for name, stat in self._waits.items()},
+            "buckets": self.buckets.snapshot()
+        }
+
+
+def estimate_tokens(messages, max_tokens):
+    """
+    요청의 토큰 사용량을 보수적으로 추정합니다.
+
+    한글은 대략 1~2자당 1토큰이므로 프롬프트 글자 수의 절반에 최대 생성 토큰 수를 더합니다.
+    """
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // 2 + max_tokens
+
+
+_limits = {"requests": LLM_REQUESTS_PER_MINUTE, "tokens": LLM_TOKENS_PER_MINUTE}
+scheduler = LLMScheduler(SQLiteBuckets(_limits, LLM_SCHEDULER_DB) if LLM_SCHEDULER_DB else LocalBuckets(_limits))
@@ -0,0 +1,191 @@
+import numpy as np
+from app.utils.customer_store import get_store
+from app.utils.portfolio_arrays import get_portfolio
+from app.services.credit_scorer import FEATURES, build_features, load_model
+
+# 신용 점수 분포 구간 (300~850점, 50점 단위)
+SCORE_EDGES = np.arange(300, 851, 50)
+
+# 신용 점수 등급 (최소 점수, 등급) - 기본 분석문과 같은 기준
+SCORE_GRADES = ((750, "우수"), (650, "보통"), (0, "주의"))
+
+# 부채/연소득 비율 분포 구간
+DTI_EDGES = (0, 0.1, 0.2, 0.3, 0.4, 0.6, 1.0, 2.0, np.inf)
+
+# 보고서에 싣는 고위험 고객 수
+TOP_RISK = 20
+
+_F = {name: i for i, name in enumerate(FEATURES)}
+
+
+def _bin_labels(edges, fmt):
+    labels = []
+    for low, high in zip(edges[:-1], edges[1:]):
+        labels.append(f"{fmt(low)}~" if np.isinf(high) else f"{fmt(low)}~{fmt(high)}")
+    return labels
+
+
+def risk_model_version():
+    """고위험 순위에 쓰이는 신용 위험 모델 버전 (학습된 모델이 없으면 None)"""
+    try:
+        return load_model()[1]["version"]
+    except ValueError:
+        return None
+
+
+def _risk_order(features, probabilities, top):
+    """
+    위험도가 높은 순서의 고객 행 번호 top개를 반환합니다.
+
+    학습된 모델이 있으면 승인 확률이 낮은 순, 없으면 신용 점수가 낮고 연체가 많은 순입니다.
+    """
+    top = min(top, len(features))
+    if not top:
+        return np.array([], dtype=np.int64)
+    if probabilities is not None:
+        key = probabilities
+    else:
+        # 점수가 같으면 연체가 많은 고객이 먼저 오도록 연체 횟수를 작은 가중치로 뺌
+        key = features[:, _F["credit_score"]] - features[:, _F["overdue_12m"]] * 1e-3
+    candidates = np.argpartition(key, top - 1)[:top]
+    return candidates[np.argsort(key[candidates], kind="stable")]
+
+
+def portfolio_aggregates(top=TOP_RISK, store=None):
+    """
+    포트폴리오 보고서에 필요한 집계를 포트폴리오 배열에서 한 번에 계산합니다.
+
+    특성 계산(build_features) 한 번으로 최신 월 지표, 부채 비율, 연체, 점수 추세를 얻고
+    분포와 프로필 유형별 집계는 모두 numpy 배열 연산으로 구합니다.
+
+    Args:
+        top: 고위험 고객 수
+        store: 고객 저장소 (기본값: 전역 저장소)
+
+    Returns:
+        {"customers", "period", "latest_month", "score", "grades", "dti", "profiles",
+         "monthly_score", "totals", "top_risk", "risk_source", "data_version"}
+    """
+    store = store or get_store()
+    segment = get_portfolio(store)
+    values = segment.values
+    present = ~np.isnan(values[:, :, 0])
+    rows = np.flatnonzero(present.any(axis=1))
+    ids = [segment.customer_ids[i] for i in rows]
+    features = build_features(values[rows]) if len(rows) else np.zeros((0, len(FEATURES)))
+
+    scores = features[:, _F["credit_score"]]
+    dti = features[:, _F["debt_to_income"]]
+    overdue = features[:, _F["overdue_12m"]]
+
+    try:
+        model, metadata = load_model()
+        probabilities = model.predict_proba(features)[:, 1] if len(ids) else np.array([])
+        risk_source = f"신용 위험 모델 v{metadata['version']} (승인 확률 낮은 순)"
+    except ValueError:
+        probabilities = None
+        risk_source = "신용 점수 낮은 순 (학습된 모델 없음)"
+
+    # 프로필 유형별 집계 (np.unique + bincount)
+    entries = [store.get_entry(customer_id) or {} for customer_id in ids]
+    profiles = np.array([entry.get("profile_type") or "unknown" for entry in entries])
+    profile_names, inverse = np.unique(profiles, return_inverse=True)
+    k = len(profile_names)
+    counts = np.bincount(inverse, minlength=k)
+    safe_counts = np.maximum(counts, 1)
+    score_sums = np.bincount(inverse, scores, k)
+    debt_sums = np.bincount(inverse, features[:, _F["debt"]], k)
+    overdue_counts = np.bincount(inverse, overdue > 0, k)
+    profile_rows = []
+    for i, name in enumerate(profile_names):
+        profile_rows.append({
+            "profile_type": str(name),
+            "customers": int(counts[i]),
+            "share": round(float(counts[i] / max(len(ids), 1)), 4),
+            "mean_score": round(float(score_sums[i] / safe_counts[i]), 1),
+            "median_dti": round(float(np.median(dti[inverse == i])), 3),
+            "total_debt": float(debt_sums[i]),
+            "overdue_share": round(float(overdue_counts[i] / safe_counts[i]), 4)
+        })
+
+    # 월별 평균 신용 점수 (데이터가 있는 고객만)
+    month_counts = present.sum(axis=0)
+    month_sums = np.nansum(values[:, :, 0], axis=0)
+    monthly_mean = np.where(month_counts > 0, month_sums / np.maximum(month_counts, 1), np.nan)
+
+    grades = {label: 0 for _, label in SCORE_GRADES}
+    lower = 10 ** 9
+    for minimum, label in SCORE_GRADES:
+        grades[label] = int(((scores >= minimum) & (scores < lower)).sum())
+        lower = minimum
+
+    top_rows = _risk_order(features, probabilities, top)
+    top_risk = []
+    for i in top_rows.tolist():
+        top_risk.append({
+            "customer_id": ids[i],
+            "name": entries[i].get("name"),
+            "profile_type": entries[i].get("profile_type"),
+            "credit_score": int(scores[i]),
+            "debt_to_income": round(float(dti[i]), 2),
+            "overdue_12m": int(overdue[i]),
+            "approval_probability": round(float(probabilities[i]), 4) if probabilities is not None else None
+        })
+
+    has_data = bool(len(ids))
+    return {
+        "customers": len(ids),
+        "data_version": segment.data_version,
+        "period": [str(segment.months[0]), str(segment.months[-1])] if len(segment.months) else None,
+        "latest_month": str(segment.months[-1]) if len(segment.months) else None,
+        "score": {
+            "mean": round(float(scores.mean()), 1) if has_data else None,
+            "median": float(np.median(scores)) if has_data else None,
+            "p10": float(np.percentile(scores, 10)) if has_data else None,
+            "p90": float(np.percentile(scores, 90)) if has_data else None,
+            "labels": _bin_labels(SCORE_EDGES, lambda v: f"{v:.0f}"),
+            "counts": np.histogram(scores, bins=SCORE_EDGES)[0].tolist()
+        },
+        "grades": grades,
+        "dti": {
+            "median": round(float(np.median(dti)), 3) if has_data else None,
+            "labels": _bin_labels(DTI_EDGES, lambda v: f"{v:g}"),
+            "counts": np.histogram(dti, bins=DTI_EDGES)[0].tolist()
+        },
+        "profiles": profile_rows,
+        "monthly_score": {
+            "months": [str(m) for m in segment.months],
+            "values": [None if np.isnan(v) else round(float(v), 1) for v in monthly_mean]
+        },
+        "totals": {
+            "debt": float(features[:, _F["debt"]].sum()),
+            "savings": float(features[:, _F["savings"]].sum()),
+            "mean_income": round(float(features[:, _F["income"]].mean()), 0) if has_data else None,
+            "overdue_share": round(float((overdue > 0).mean()), 4) if has_data else None
+        },
+        "top_risk": top_risk,
+        "risk_source": risk_source
+    }
+
+
+def format_portfolio_details(aggregates):
+    """
+    프로필 유형별 현황과 고위험 고객 목록을 Markdown으로 만듭니다. (보고서 본문용)
+
+    Returns:
+        Markdown 형식의 텍스트
+    """
+    lines = ["## 프로필 유형별 현황"]
+    for row in aggregates["profiles"]:
+        lines.append(f"- {row['profile_type']}: {row['customers']:,}명 ({row['share'] * 100:.1f}%), "
+                     f"평균 점수 {row['mean_score']:.0f}점, 부채/연소득 중앙값 {row['median_dti']:.2f}, "
+                     f"부채 합계 {row['total_debt'] / 1e8:,.1f}억원, 연체 고객 {row['overdue_share'] * 100:.1f}%")
+
+    lines += ["", f"## 고위험 고객 상위 {len(aggregates['top_risk'])}명", f"순위 기준: {aggregates['risk_source']}"]
+    for rank, row in enumerate(aggregates["top_risk"], 1):
+        probability = (f", 승인 확률 {row['approval_probability'] * 100:.1f}%"
+                       if row["approval_probability"] is not None else "")
+        lines.append(f"{rank}. {row['name']} ({row['customer_id']}, {row['profile_type']}) - "
+                     f"신용 점수 {row['credit_score']}점, 부채/연소득 {row['debt_to_income']:.2f}, "
+                     f"최근 12개월 연체 {row['overdue_12m']}회{probability}")
+    return "\n".join(lines)
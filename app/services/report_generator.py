@@ -1,25 +1,35 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.units import cm
 from datetime import datetime
 import os
-import textwrap
+import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 from io import BytesIO
-from reportlab.lib.utils import ImageReader
-from app.services.ai_analyzer import analyze_customer_data, analyze_credit_trend
+from app.services.ai_analyzer import (analyze_customer_data, analyze_credit_trend, is_fallback_narrative, summarize_portfolio,
+                                      stored_analyses, assemble_analysis)
 from app.utils.data_generator import load_customer_data
+from app.utils.customer_store import get_store
+from app.utils.shared_cache import get_shared_cache
+from app.services.report_templates import render_report, REPORT_TEMPLATE_VERSION
+from app.utils.report_store import REPORTS_DIR, find_report, publish_report
+from app.services.vector_charts import credit_score_drawing, financial_drawing, bar_drawing, line_drawing, GREEN, ORANGE
+from app.services.portfolio_summary import portfolio_aggregates, format_portfolio_details, risk_model_version, TOP_RISK
+from app.services.credit_simulation import forecast_customer, DEFAULT_MONTHS_AHEAD, DEFAULT_PATHS
+from app.services.credit_scorer import ensure_model, model_version
+from config.settings import REPORT_CHART_FORMAT
 
 # 한글 폰트 설정 (matplotlib)
 matplotlib.rcParams['font.family'] = 'NanumGothic'
 matplotlib.rcParams['axes.unicode_minus'] = False
 
-# 보고서 저장 디렉토리 설정
-REPORTS_DIR = "reports"
+# 포트폴리오 보고서 차트를 동시에 그릴 스레드 수 (LLM 요약 호출과 함께 실행)
+PORTFOLIO_CHART_WORKERS = 4
 
 # 디렉토리가 없으면 생성
 if not os.path.exists(REPORTS_DIR):
@@ -37,23 +47,92 @@ except:
     print("경고: 나눔고딕 폰트를 찾을 수 없습니다. 기본 폰트를 사용합니다.")
     KOREAN_FONT = 'Helvetica'
 
-def draw_wrapped_text(c, text, x, y, width, font_name, font_size, leading=14):
+# 보고서에 덧붙이는 저장된 구조화 분석 (LLM을 새로 호출하지 않고 있을 때만 포함)
+REPORT_SECTIONS = {
+    "credit": ("financial_products",),
+    "timeseries": ("future_credit",)
+}
+
+def get_report_key(kind, customer_id=None, customer_name=None, *params):
     """
-    텍스트를 자동으로 줄바꿈하여 그립니다.
+    보고서 캐시 키를 계산합니다.
+    
+    고객 데이터 버전, 템플릿 버전, 보고서 인자, 덧붙일 저장된 분석 유형(신용 보고서는 신용 위험 모델 버전,
+    시계열 보고서는 차트 형식과 예측 설정)이 같으면 같은 키가 나오므로,
+    이미 생성된 PDF를 LLM 호출 없이 다시 제공할 수 있습니다.
+    보고서 생성 함수와 라우트의 조건부 요청(304) 확인이 모두 이 함수로 같은 키를 계산합니다.
+    
+    Args:
+        kind: 보고서 종류 (credit, timeseries)
+        customer_id: 고객 ID
+        customer_name: 고객 이름
+        params: 보고서 인자 (질문, 기간 등)
+    
+    Returns:
+        (고객 ID, 보고서 키)
     """
-    c.setFont(font_name, font_size)
+    store = get_store()
+    if not customer_id:
+        customer_id = store.find_id_by_name(customer_name)
+    version = store.data_version(customer_id) if customer_id else None
+    if version is None:
+        raise ValueError("해당 고객 정보를 찾을 수 없습니다.")
     
-    # 텍스트 줄바꿈
-    wrapped_text = textwrap.fill(text, width=width)
-    lines = wrapped_text.split('\n')
+    sections = sorted(stored_analyses(customer_id, REPORT_SECTIONS.get(kind, ())))
+    # 신용 보고서의 기본 심사 결과는 신용 위험 모델이 계산하므로 모델이 바뀌면 다시 생성
+    # (첫 보고서가 모델 없는 키로 저장되지 않도록 키 계산 전에 첫 모델을 학습)
+    if kind == "credit":
+        try:
+            version_tag = ensure_model()
+        except ValueError:
+            # 학습할 수 없는 데이터면 모델 없이 계산 (질문이 있는 보고서만 생성 가능)
+            version_tag = model_version()
+        sections.append(f"model_v{version_tag}")
+    # 시계열 보고서는 차트 형식과 예측 구간 설정이 바뀌면 다시 생성
+    if kind == "timeseries":
+        params += (REPORT_CHART_FORMAT, f"forecast{DEFAULT_MONTHS_AHEAD}x{DEFAULT_PATHS}")
+    raw = "|".join([kind, customer_id, version[0], str(REPORT_TEMPLATE_VERSION)] +
+                   ["" if p is None else str(p) for p in params] + sections)
+    return customer_id, hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def report_filename(kind, customer_id, key):
+    """보고서 키에 해당하는 PDF 경로를 반환합니다."""
+    return os.path.join(REPORTS_DIR, f"{kind}_report_{customer_id}_{key}.pdf")
+
+def cached_chart(render, customer_data, start_date=None, end_date=None, forecast=None):
+    """
+    렌더링된 차트를 워커 간 공유 캐시에서 가져오거나 새로 그려 저장합니다.
     
-    # 각 줄 그리기
-    for i, line in enumerate(lines):
-        c.drawString(x, y - i * leading, line)
+    캐시 키에 고객 데이터 버전이 포함되므로 데이터가 바뀌면 자동으로 다시 그립니다.
     
-    return len(lines)
+    Args:
+        render: 차트 생성 함수 (create_credit_score_chart 등)
+        customer_data: 고객 데이터
+        start_date: 시작 날짜 (YYYY-MM 형식)
+        end_date: 종료 날짜 (YYYY-MM 형식)
+        forecast: 예측 구간 (있으면 render에 전달하고 캐시 키에 포함)
+    
+    Returns:
+        BytesIO 객체에 저장된 이미지
+    """
+    options = {"forecast": forecast} if forecast else {}
+    version = get_store().data_version(customer_data["customer_id"])
+    if version is None:
+        return render(customer_data, start_date, end_date, **options)
+    
+    key = f"chart:{render.__name__}:{customer_data['customer_id']}:{version[0]}:{start_date}:{end_date}"
+    if forecast:
+        key += ":" + hashlib.sha1(repr(sorted(forecast["bands"].items())).encode("utf-8")).hexdigest()[:12]
+    cache = get_shared_cache()
+    cached = cache.get_bytes(key)
+    if cached is not None:
+        return BytesIO(cached)
+    
+    img_data = render(customer_data, start_date, end_date, **options)
+    cache.set_bytes(key, img_data.getvalue())
+    return img_data
 
-def create_credit_score_chart(customer_data, start_date=None, end_date=None):
+def create_credit_score_chart(customer_data, start_date=None, end_date=None, forecast=None):
     """
     신용 점수 추이 차트를 생성합니다.
     
@@ -61,6 +140,7 @@ def create_credit_score_chart(customer_data, start_date=None, end_date=None):
         customer_data: 고객 데이터
         start_date: 시작 날짜 (YYYY-MM 형식)
         end_date: 종료 날짜 (YYYY-MM 형식)
+        forecast: 예측 구간 (forecast_customer 결과, 선택적)
     
     Returns:
         BytesIO 객체에 저장된 이미지
@@ -84,12 +164,27 @@ def create_credit_score_chart(customer_data, start_date=None, end_date=None):
     
     # 그래프 생성
     plt.figure(figsize=(10, 5))
-    plt.plot(months, credit_scores, marker='o', linestyle='-', color='#3366cc', linewidth=2)
-    plt.title('신용 점수 추이', fontsize=14)
+    labels = list(months)
+    plt.plot(range(len(months)), credit_scores, marker='o', linestyle='-', color='#3366cc', linewidth=2, label='실적')
+    title = '신용 점수 추이'
+    
+    # 예측 구간 (마지막 실적 월에서 이어서 그림)
+    if forecast and credit_scores:
+        start = len(credit_scores) - 1
+        x = range(start, start + len(forecast["months"]) + 1)
+        band = {name: [credit_scores[-1]] + values for name, values in forecast["bands"].items()}
+        plt.fill_between(x, band["p5"], band["p95"], color='#c6d5f0', label='90% 구간')
+        plt.fill_between(x, band["p25"], band["p75"], color='#8faee0', label='50% 구간')
+        plt.plot(x, band["p50"], linestyle='--', color='#3366cc', linewidth=1.5, label='예측 중앙값')
+        plt.legend(loc='upper left', fontsize=9)
+        labels += forecast["months"]
+        title = f'신용 점수 추이 및 {len(forecast["months"])}개월 예측'
+    
+    plt.title(title, fontsize=14)
     plt.xlabel('날짜', fontsize=12)
     plt.ylabel('신용 점수', fontsize=12)
     plt.grid(True, linestyle='--', alpha=0.7)
-    plt.xticks(rotation=45)
+    plt.xticks(range(len(labels)), labels, rotation=45)
     plt.tight_layout()
     
     # 이미지를 BytesIO 객체에 저장
@@ -192,97 +287,70 @@ def generate_credit_report(customer_id=None, customer_name=None, analysis_questi
     Returns:
         생성된 PDF 파일 이름
     """
+    # 동일한 데이터와 질문으로 생성된 보고서가 있으면 재사용
+    customer_id, key = get_report_key("credit", customer_id, customer_name, analysis_question)
+    filename = report_filename("credit", customer_id, key)
+    if find_report(filename):
+        return filename
+    
     # 고객 데이터 로드
-    customer_data = load_customer_data(customer_id, customer_name)
+    customer_data = load_customer_data(customer_id)
     if not customer_data:
         raise ValueError("해당 고객 정보를 찾을 수 없습니다.")
     
-    # AI 분석 수행
-    if analysis_question:
-        analysis_result = analyze_customer_data(
-            customer_id=customer_data["customer_id"], 
-            request_text=analysis_question
-        )
-    else:
-        analysis_result = analyze_customer_data(
-            customer_id=customer_data["customer_id"], 
-            request_text="이 고객의 신용 상태를 평가하고, 대출 승인 가능성과 권장 이자율을 제안해주세요."
-        )
+    # AI 분석 수행 (질문이 없으면 로컬 신용 위험 모델의 대출 심사 결과)
+    analysis_result = analyze_customer_data(
+        customer_id=customer_data["customer_id"], 
+        request_text=analysis_question
+    )
+    if isinstance(analysis_result, dict):
+        raise ValueError(analysis_result["error"])
+    
+    # 저장된 금융 상품 추천이 있으면 LLM 호출 없이 덧붙임
+    for analysis_type, fields in stored_analyses(customer_id, REPORT_SECTIONS["credit"]).items():
+        analysis_result += "\n\n" + assemble_analysis(customer_id, analysis_type, fields)
+    
+    # LLM 대체 분석문으로 만든 보고서는 재사용하지 않음 (다음 요청에서 다시 생성)
+    if is_fallback_narrative(analysis_result):
+        filename = report_filename("credit", customer_id, f"{key}_fallback_{uuid.uuid4().hex[:8]}")
     
     # 최신 월별 데이터 가져오기
     sorted_data = sorted(customer_data["monthly_data"], 
                         key=lambda x: datetime.strptime(x["month"], "%Y-%m-%d"))
     latest_data = sorted_data[-1]
     
-    # PDF 파일 이름 설정
-    filename = os.path.join(REPORTS_DIR, f"credit_report_{customer_data['customer_id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    
-    # PDF 생성
-    c = canvas.Canvas(filename, pagesize=A4)
-    width, height = A4
-    
-    # 제목
-    c.setFont(KOREAN_FONT, 18)
-    c.drawString(2*cm, height - 2*cm, "신용 분석 보고서")
-    
-    # 날짜
-    c.setFont(KOREAN_FONT, 10)
-    current_date = datetime.now().strftime("%Y년 %m월 %d일")
-    c.drawString(width - 5*cm, height - 2*cm, f"생성일: {current_date}")
-    
-    # 구분선
-    c.line(2*cm, height - 2.5*cm, width - 2*cm, height - 2.5*cm)
-    
-    # 고객 정보 섹션
-    y_position = height - 3.5*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "고객 정보")
-    
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
-    
-    # 고객 정보 표시
-    y_position -= 1*cm
-    c.setFont(KOREAN_FONT, 12)
-    c.drawString(2*cm, y_position, f"이름: {customer_data['name']}")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"고객 ID: {customer_data['customer_id']}")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"신용 점수: {latest_data['credit_score']}")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"월 소득: {latest_data['income']:,.0f}원")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"월 지출: {latest_data['expenses']:,.0f}원")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"저축액: {latest_data['savings']:,.0f}원")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"부채 총액: {latest_data['debt']:,.0f}원")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"월 대출상환액: {latest_data['loan_payments']:,.0f}원")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"연체 횟수: {latest_data['overdue_payments']}")
-    
-    # AI 분석 결과 섹션
-    y_position -= 1.5*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "AI 분석 결과")
-    
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
-    
-    # 분석 결과 표시
-    y_position -= 1*cm
-    
-    # 분석 결과 줄바꿈 처리
-    lines = draw_wrapped_text(c, analysis_result, 2*cm, y_position, 70, KOREAN_FONT, 10)
-    
-    # 페이지 저장
-    c.save()
+    # PDF 생성 (완성된 뒤 최종 경로로 이동)
+    tmp_filename = f"{filename}.{uuid.uuid4().hex}.tmp"
+    render_report(
+        "credit", tmp_filename,
+        values={
+            "created_at": datetime.now().strftime("%Y년 %m월 %d일"),
+            "name": customer_data["name"],
+            "customer_id": customer_data["customer_id"],
+            **latest_data
+        },
+        texts={"analysis": analysis_result},
+        font_name=KOREAN_FONT
+    )
+    publish_report(tmp_filename, filename)
     
     return filename
 
+def report_forecast(customer_data, end_date=None):
+    """
+    시계열 보고서 차트에 넣을 신용 점수 예측 구간을 계산합니다.
+    
+    Returns:
+        forecast_customer 결과 (기간이 최신 월 이전에 끝나거나 데이터가 부족하면 None)
+    """
+    last_month = max((d["month"][:7] for d in customer_data["monthly_data"]), default=None)
+    if last_month is None or (end_date and end_date < last_month):
+        return None
+    try:
+        return forecast_customer(customer_data["customer_id"])
+    except (KeyError, ValueError):
+        return None
+
 def generate_timeseries_report(customer_id=None, customer_name=None, start_date=None, end_date=None):
     """
     고객의 시계열 데이터 보고서를 생성합니다.
@@ -296,8 +364,14 @@ def generate_timeseries_report(customer_id=None, customer_name=None, start_date=
     Returns:
         생성된 PDF 파일 이름
     """
+    # 동일한 데이터와 기간으로 생성된 보고서가 있으면 재사용
+    customer_id, key = get_report_key("timeseries", customer_id, customer_name, start_date, end_date)
+    filename = report_filename("timeseries", customer_id, key)
+    if find_report(filename):
+        return filename
+    
     # 고객 데이터 로드
-    customer_data = load_customer_data(customer_id, customer_name)
+    customer_data = load_customer_data(customer_id)
     if not customer_data:
         raise ValueError("해당 고객 정보를 찾을 수 없습니다.")
     
@@ -308,111 +382,195 @@ def generate_timeseries_report(customer_id=None, customer_name=None, start_date=
         end_date=end_date
     )
     
-    # 차트 생성
-    credit_score_chart = create_credit_score_chart(customer_data, start_date, end_date)
-    financial_chart = create_financial_chart(customer_data, start_date, end_date)
-    
-    # PDF 파일 이름 설정
-    filename = os.path.join(REPORTS_DIR, f"timeseries_report_{customer_data['customer_id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    
-    # PDF 생성
-    c = canvas.Canvas(filename, pagesize=A4)
-    width, height = A4
-    
-    # 제목
-    c.setFont(KOREAN_FONT, 18)
-    c.drawString(2*cm, height - 2*cm, "시계열 데이터 분석 보고서")
-    
-    # 날짜
-    c.setFont(KOREAN_FONT, 10)
-    current_date = datetime.now().strftime("%Y년 %m월 %d일")
-    c.drawString(width - 5*cm, height - 2*cm, f"생성일: {current_date}")
-    
-    # 구분선
-    c.line(2*cm, height - 2.5*cm, width - 2*cm, height - 2.5*cm)
-    
-    # 고객 정보 섹션
-    y_position = height - 3.5*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "고객 정보")
-    
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
-    
-    # 고객 정보 표시
-    y_position -= 1*cm
-    c.setFont(KOREAN_FONT, 12)
-    c.drawString(2*cm, y_position, f"이름: {customer_data['name']}")
-    y_position -= 0.7*cm
-    c.drawString(2*cm, y_position, f"고객 ID: {customer_data['customer_id']}")
-    
-    # 분석 기간 섹션
-    y_position -= 1.5*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "분석 기간")
-    
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
-    
-    # 분석 기간 표시
-    y_position -= 1*cm
-    c.setFont(KOREAN_FONT, 12)
+    # LLM 대체 분석문으로 만든 보고서는 재사용하지 않음 (다음 요청에서 다시 생성)
+    if is_fallback_narrative(trend_analysis):
+        filename = report_filename("timeseries", customer_id, f"{key}_fallback_{uuid.uuid4().hex[:8]}")
+    
+    if isinstance(trend_analysis, dict):
+        raise ValueError(trend_analysis["error"])
+    
+    # 신용 점수 예측 구간 (기간이 최신 데이터까지 포함할 때만 차트에 이어서 그림)
+    forecast = report_forecast(customer_data, end_date)
+    
+    # 저장된 신용 점수 전망이 있으면 예측 구간과 함께 LLM 호출 없이 덧붙임
+    if forecast is not None:
+        for analysis_type, fields in stored_analyses(customer_id, REPORT_SECTIONS["timeseries"]).items():
+            trend_analysis += "\n\n" + assemble_analysis(customer_id, analysis_type, fields)
+    
+    # 차트 생성 (벡터 차트는 PDF에 직접 그리고, PNG 차트는 공유 캐시 사용)
+    if REPORT_CHART_FORMAT == "vector":
+        credit_score_chart = credit_score_drawing(customer_data, start_date, end_date, KOREAN_FONT, forecast=forecast)
+        financial_chart = financial_drawing(customer_data, start_date, end_date, KOREAN_FONT)
+    else:
+        credit_score_chart = cached_chart(create_credit_score_chart, customer_data, start_date, end_date, forecast)
+        financial_chart = cached_chart(create_financial_chart, customer_data, start_date, end_date)
+    
+    # PDF 생성 (완성된 뒤 최종 경로로 이동)
     start_text = f"{start_date}부터" if start_date else "전체 기간"
     end_text = f"{end_date}까지" if end_date else ""
-    c.drawString(2*cm, y_position, f"{start_text} {end_text}")
-    
-    # 신용 점수 차트 추가
-    y_position -= 1.5*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "신용 점수 추이")
+    tmp_filename = f"{filename}.{uuid.uuid4().hex}.tmp"
+    render_report(
+        "timeseries", tmp_filename,
+        values={
+            "created_at": datetime.now().strftime("%Y년 %m월 %d일"),
+            "name": customer_data["name"],
+            "customer_id": customer_data["customer_id"],
+            "period": f"{start_text} {end_text}"
+        },
+        images={"credit_score_chart": credit_score_chart, "financial_chart": financial_chart},
+        texts={"analysis": trend_analysis},
+        font_name=KOREAN_FONT
+    )
+    publish_report(tmp_filename, filename)
     
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
+    return filename
+
+def create_bar_chart(title, labels, values, xlabel, ylabel, color='#3366cc'):
+    """
+    막대 그래프 PNG를 생성합니다.
     
-    # 차트 이미지 추가
-    y_position -= 10*cm  # 차트 높이에 맞게 조정
-    credit_score_img = ImageReader(credit_score_chart)
-    c.drawImage(credit_score_img, 2*cm, y_position, width=width-4*cm, height=9*cm)
+    pyplot 전역 상태를 쓰지 않는 Figure 객체로 그리므로 여러 스레드에서 동시에 호출할 수 있습니다.
     
-    # 새 페이지 추가
-    c.showPage()
+    Returns:
+        BytesIO 객체에 저장된 이미지
+    """
+    fig = Figure(figsize=(10, 4.4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.bar(range(len(labels)), values, color=color)
+    ax.set_xticks(range(len(labels)), labels, rotation=30)
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel(xlabel, fontsize=11)
+    ax.set_ylabel(ylabel, fontsize=11)
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
     
-    # 재정 상태 차트 추가
-    y_position = height - 2*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "재정 상태 분석")
+    img_data = BytesIO()
+    fig.savefig(img_data, format='png', dpi=100)
+    img_data.seek(0)
+    return img_data
+
+def create_line_chart(title, labels, values, ylabel, color='#3366cc'):
+    """
+    선 그래프 PNG를 생성합니다. (값 목록의 None은 그리지 않음, 스레드에서 동시 호출 가능)
     
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
+    Returns:
+        BytesIO 객체에 저장된 이미지
+    """
+    fig = Figure(figsize=(10, 4.4))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(range(len(labels)), [np.nan if v is None else v for v in values],
+            marker='o', linestyle='-', color=color, linewidth=2)
+    step = max(1, len(labels) // 12)
+    ax.set_xticks(range(0, len(labels), step), labels[::step], rotation=45)
+    ax.set_title(title, fontsize=14)
+    ax.set_ylabel(ylabel, fontsize=11)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
     
-    # 차트 이미지 추가
-    y_position -= 15*cm  # 차트 높이에 맞게 조정
-    financial_img = ImageReader(financial_chart)
-    c.drawImage(financial_img, 1*cm, y_position, width=width-2*cm, height=14*cm)
+    img_data = BytesIO()
+    fig.savefig(img_data, format='png', dpi=100)
+    img_data.seek(0)
+    return img_data
+
+def portfolio_charts(aggregates):
+    """
+    포트폴리오 보고서 차트 목록을 만듭니다. (아직 그리지 않은 상태)
     
-    # 새 페이지 추가
-    c.showPage()
+    Returns:
+        {이미지 이름: (차트 생성 함수, 인자)}
+    """
+    score, dti, monthly = aggregates["score"], aggregates["dti"], aggregates["monthly_score"]
+    profiles = aggregates["profiles"]
+    profile_labels = [f"{row['profile_type']} ({row['mean_score']:.0f}점)" for row in profiles]
+    profile_counts = [row["customers"] for row in profiles]
+    
+    if REPORT_CHART_FORMAT == "vector":
+        return {
+            "score_chart": (bar_drawing, ("신용 점수 분포 (최신 월)", score["labels"], score["counts"], KOREAN_FONT)),
+            "trend_chart": (line_drawing, ("월별 평균 신용 점수", monthly["months"], monthly["values"], KOREAN_FONT)),
+            "profile_chart": (bar_drawing, ("프로필 유형별 고객 수 (평균 신용 점수)", profile_labels, profile_counts,
+                                            KOREAN_FONT), {"color": GREEN}),
+            "dti_chart": (bar_drawing, ("부채/연소득 비율 분포", dti["labels"], dti["counts"], KOREAN_FONT),
+                          {"color": ORANGE}),
+        }
+    return {
+        "score_chart": (create_bar_chart, ("신용 점수 분포 (최신 월)", score["labels"], score["counts"], "신용 점수", "고객 수")),
+        "trend_chart": (create_line_chart, ("월별 평균 신용 점수", monthly["months"], monthly["values"], "신용 점수")),
+        "profile_chart": (create_bar_chart, ("프로필 유형별 고객 수 (평균 신용 점수)", profile_labels, profile_counts,
+                                             "프로필 유형", "고객 수", '#109618')),
+        "dti_chart": (create_bar_chart, ("부채/연소득 비율 분포", dti["labels"], dti["counts"], "부채/연소득", "고객 수",
+                                         '#ff9900')),
+    }
+
+def get_portfolio_report_key(*params):
+    """
+    포트폴리오 보고서 캐시 키를 계산합니다.
     
-    # AI 분석 결과 섹션
-    y_position = height - 2*cm
-    c.setFont(KOREAN_FONT, 14)
-    c.drawString(2*cm, y_position, "신용도 추세 분석")
+    전체 데이터 버전, 템플릿 버전, 위험 모델 버전, 보고서 인자가 같으면 같은 키가 나옵니다.
+    """
+    version = get_store().data_version()
+    raw = "|".join(["portfolio", version[0] if version else "", str(REPORT_TEMPLATE_VERSION),
+                    str(risk_model_version()), REPORT_CHART_FORMAT] + ["" if p is None else str(p) for p in params])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def generate_portfolio_report(top=TOP_RISK):
+    """
+    전체 고객 포트폴리오 요약 PDF 보고서를 생성합니다.
     
-    # 구분선
-    y_position -= 0.5*cm
-    c.line(2*cm, y_position, width - 2*cm, y_position)
+    집계는 포트폴리오 배열에서 한 번에 계산하고, 차트 생성과 경영진 요약 LLM 호출(한 번)을
+    스레드 풀에서 동시에 실행합니다.
     
-    # 분석 결과 표시
-    y_position -= 1*cm
+    Args:
+        top: 고위험 고객 목록에 넣을 고객 수
     
-    # 분석 결과 줄바꿈 처리
-    lines = draw_wrapped_text(c, trend_analysis, 2*cm, y_position, 70, KOREAN_FONT, 10)
+    Returns:
+        생성된 PDF 파일 이름
     
-    # 페이지 저장
-    c.save()
+    Raises:
+        ValueError: 고객 데이터가 없는 경우
+    """
+    key = get_portfolio_report_key(top)
+    filename = report_filename("portfolio", "all", key)
+    if find_report(filename):
+        return filename
+    
+    aggregates = portfolio_aggregates(top)
+    if not aggregates["customers"]:
+        raise ValueError("포트폴리오에 고객 데이터가 없습니다.")
+    
+    with ThreadPoolExecutor(max_workers=PORTFOLIO_CHART_WORKERS, thread_name_prefix="portfolio-report") as pool:
+        summary_future = pool.submit(summarize_portfolio, aggregates)
+        chart_futures = {}
+        for name, (render, args, *options) in portfolio_charts(aggregates).items():
+            chart_futures[name] = pool.submit(render, *args, **(options[0] if options else {}))
+        images = {name: future.result() for name, future in chart_futures.items()}
+        summary = summary_future.result()
+    
+    # LLM 대체 요약문으로 만든 보고서는 재사용하지 않음 (다음 요청에서 다시 생성)
+    if is_fallback_narrative(summary):
+        filename = report_filename("portfolio", "all", f"{key}_fallback_{uuid.uuid4().hex[:8]}")
+    
+    score, totals = aggregates["score"], aggregates["totals"]
+    tmp_filename = f"{filename}.{uuid.uuid4().hex}.tmp"
+    render_report(
+        "portfolio", tmp_filename,
+        values={
+            "created_at": datetime.now().strftime("%Y년 %m월 %d일"),
+            "customers": aggregates["customers"],
+            "latest_month": aggregates["latest_month"],
+            "mean_score": score["mean"],
+            "median_score": score["median"],
+            "grades": ", ".join(f"{label} {count:,}명" for label, count in aggregates["grades"].items()),
+            "total_debt": totals["debt"] / 1e8,
+            "median_dti": aggregates["dti"]["median"],
+            "overdue_share": totals["overdue_share"] * 100
+        },
+        images=images,
+        texts={"summary": summary, "details": format_portfolio_details(aggregates)},
+        font_name=KOREAN_FONT
+    )
+    publish_report(tmp_filename, filename)
     
-    return filename
\ No newline at end of file
+    return filename
@@ -0,0 +1,273 @@
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.graphics import renderPDF
+from reportlab.graphics.shapes import Drawing
+from app.utils.text_layout import TextFlow
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+# 템플릿 버전 (배치나 문구를 바꾸면 올려서 이전 보고서를 재사용하지 않도록 함)
+REPORT_TEMPLATE_VERSION = 1
+
+# 보고서 공통 머리말 (제목, 생성일, 구분선)
+def _header(title):
+    return [
+        ("text", 2, 2, 18, title),
+        ("labeled", PAGE_WIDTH / cm - 5, 2, 10, "생성일: ", "{created_at}"),
+        ("line", 2, 2.5),
+    ]
+
+# 분석 결과가 길어져 이어지는 페이지의 머리말
+def _continuation(title):
+    return [
+        ("text", 2, 1.3, 10, f"{title} (계속)"),
+        ("line", 2, 1.6),
+    ]
+
+# 보고서 템플릿 정의
+#
+# 좌표는 왼쪽/위쪽 기준 cm 단위이며, 요소 종류는 다음과 같습니다.
+#   정적 요소 (페이지 폼으로 한 번만 그림)
+#     ("text", x, y, 크기, 문자열)
+#     ("line", x, y)                              오른쪽 여백까지 가로선
+#     ("section", y, 제목)                        섹션 제목 + 아래 구분선
+#   값 요소 (보고서마다 채움)
+#     ("labeled", x, y, 크기, 라벨, 값 형식)      라벨은 정적, 값은 라벨 너비만큼 띄워서 그림
+#     ("field", x, y, 크기, 값 형식)
+#     ("image", 이름, x, y, 너비, 높이)            y는 이미지 위쪽 위치 (PNG 또는 벡터 Drawing)
+#     ("flow", 이름, x, y, 크기, 줄 간격)          여러 페이지로 이어지는 본문
+REPORT_TEMPLATES = {
+    "credit": {
+        "title": "신용 분석 보고서",
+        "pages": [
+            _header("신용 분석 보고서") + [
+                ("section", 3.5, "고객 정보"),
+                ("labeled", 2, 5.0, 12, "이름: ", "{name}"),
+                ("labeled", 2, 5.7, 12, "고객 ID: ", "{customer_id}"),
+                ("labeled", 2, 6.4, 12, "신용 점수: ", "{credit_score}"),
+                ("labeled", 2, 7.1, 12, "월 소득: ", "{income:,.0f}원"),
+                ("labeled", 2, 7.8, 12, "월 지출: ", "{expenses:,.0f}원"),
+                ("labeled", 2, 8.5, 12, "저축액: ", "{savings:,.0f}원"),
+                ("labeled", 2, 9.2, 12, "부채 총액: ", "{debt:,.0f}원"),
+                ("labeled", 2, 9.9, 12, "월 대출상환액: ", "{loan_payments:,.0f}원"),
+                ("labeled", 2, 10.6, 12, "연체 횟수: ", "{overdue_payments}"),
+                ("section", 12.1, "AI 분석 결과"),
+                ("flow", "analysis", 2, 13.6, 10, 14),
+            ],
+        ],
+    },
+    "timeseries": {
+        "title": "시계열 데이터 분석 보고서",
+        "pages": [
+            _header("시계열 데이터 분석 보고서") + [
+                ("section", 3.5, "고객 정보"),
+                ("labeled", 2, 5.0, 12, "이름: ", "{name}"),
+                ("labeled", 2, 5.7, 12, "고객 ID: ", "{customer_id}"),
+                ("section", 7.2, "분석 기간"),
+                ("field", 2, 8.7, 12, "{period}"),
+                ("section", 10.2, "신용 점수 추이"),
+                ("image", "credit_score_chart", 2, 11.7, PAGE_WIDTH / cm - 4, 9),
+            ],
+            [
+                ("section", 2, "재정 상태 분석"),
+                ("image", "financial_chart", 1, 3.5, PAGE_WIDTH / cm - 2, 14),
+            ],
+            [
+                ("section", 2, "신용도 추세 분석"),
+                ("flow", "analysis", 2, 3.5, 10, 14),
+            ],
+        ],
+    },
+    "portfolio": {
+        "title": "포트폴리오 요약 보고서",
+        "pages": [
+            _header("포트폴리오 요약 보고서") + [
+                ("section", 3.5, "포트폴리오 개요"),
+                ("labeled", 2, 5.0, 12, "고객 수: ", "{customers:,}명"),
+                ("labeled", 2, 5.7, 12, "기준 월: ", "{latest_month}"),
+                ("labeled", 2, 6.4, 12, "평균 신용 점수: ", "{mean_score:.1f}점 (중앙값 {median_score:.0f}점)"),
+                ("labeled", 2, 7.1, 12, "신용 등급: ", "{grades}"),
+                ("labeled", 2, 7.8, 12, "부채 합계: ", "{total_debt:,.1f}억원"),
+                ("labeled", 2, 8.5, 12, "부채/연소득 중앙값: ", "{median_dti:.2f}"),
+                ("labeled", 2, 9.2, 12, "최근 12개월 연체 고객: ", "{overdue_share:.1f}%"),
+                ("section", 10.7, "경영진 요약"),
+                ("flow", "summary", 2, 12.2, 10, 14),
+            ],
+            [
+                ("section", 2, "신용 점수 분포"),
+                ("image", "score_chart", 2, 3.5, PAGE_WIDTH / cm - 4, 7.5),
+                ("section", 12, "월별 평균 신용 점수"),
+                ("image", "trend_chart", 2, 13.5, PAGE_WIDTH / cm - 4, 7.5),
+            ],
+            [
+                ("section", 2, "프로필 유형별 현황"),
+                ("image", "profile_chart", 2, 3.5, PAGE_WIDTH / cm - 4, 7.5),
+                ("section", 12, "부채/연소득 비율 분포"),
+                ("image", "dti_chart", 2, 13.5, PAGE_WIDTH / cm - 4, 7.5),
+            ],
+            [
+                ("section", 2, "고객군 상세"),
+                ("flow", "details", 2, 3.5, 10, 14),
+            ],
+        ],
+    },
+}
+
+_compiled = {}
+
+
+def _compile_element(element, font_name):
+    """
+    정의 요소 하나를 (정적 그리기 목록, 값 그리기 목록)으로 변환합니다.
+
+    좌표를 pt 단위로 바꾸고, 라벨 너비를 미리 측정해 값 위치를 고정합니다.
+    """
+    kind = element[0]
+    if kind == "text":
+        _, x, y, size, text = element
+        return [("text", x * cm, PAGE_HEIGHT - y * cm, size, text)], []
+    if kind == "line":
+        _, x, y = element
+        return [("line", x * cm, PAGE_HEIGHT - y * cm)], []
+    if kind == "section":
+        _, y, title = element
+        return [
+            ("text", 2 * cm, PAGE_HEIGHT - y * cm, 14, title),
+            ("line", 2 * cm, PAGE_HEIGHT - (y + 0.5) * cm),
+        ], []
+    if kind == "labeled":
+        _, x, y, size, label, fmt = element
+        offset = pdfmetrics.stringWidth(label, font_name, size)
+        return [("text", x * cm, PAGE_HEIGHT - y * cm, size, label)], \
+               [("field", x * cm + offset, PAGE_HEIGHT - y * cm, size, fmt)]
+    if kind == "field":
+        _, x, y, size, fmt = element
+        return [], [("field", x * cm, PAGE_HEIGHT - y * cm, size, fmt)]
+    if kind == "image":
+        _, name, x, y, w, h = element
+        return [], [("image", name, x * cm, PAGE_HEIGHT - (y + h) * cm, w * cm, h * cm)]
+    if kind == "flow":
+        _, name, x, y, size, leading = element
+        return [], [("flow", name, x * cm, PAGE_HEIGHT - y * cm, PAGE_WIDTH - 2 * x * cm, size, leading)]
+    raise ValueError(f"지원하지 않는 템플릿 요소입니다: {kind}")
+
+
+def compile_template(name, font_name):
+    """
+    보고서 템플릿을 페이지별 정적 레이어와 값 레이어로 한 번만 변환합니다.
+
+    Returns:
+        {"title", "pages": [(정적 목록, 값 목록)], "continuation": 정적 목록}
+    """
+    key = (name, font_name)
+    compiled = _compiled.get(key)
+    if compiled is not None:
+        return compiled
+
+    if name not in REPORT_TEMPLATES:
+        raise ValueError(f"지원하지 않는 보고서 종류입니다: {name}")
+    spec = REPORT_TEMPLATES[name]
+
+    pages = []
+    for page in spec["pages"]:
+        static, dynamic = [], []
+        for element in page:
+            s, d = _compile_element(element, font_name)
+            static.extend(s)
+            dynamic.extend(d)
+        pages.append((static, dynamic))
+
+    continuation = []
+    for element in _continuation(spec["title"]):
+        continuation.extend(_compile_element(element, font_name)[0])
+
+    compiled = _compiled[key] = {"title": spec["title"], "pages": pages, "continuation": continuation}
+    return compiled
+
+
+def _draw_static(c, ops, font_name):
+    for op in ops:
+        if op[0] == "text":
+            _, x, y, size, text = op
+            c.setFont(font_name, size)
+            c.drawString(x, y, text)
+        else:
+            _, x, y = op
+            c.line(x, y, PAGE_WIDTH - 2 * cm, y)
+
+
+def _form(c, name, ops, font_name, defined):
+    """정적 레이어를 문서에 한 번만 폼(XObject)으로 정의하고 그립니다."""
+    if name not in defined:
+        c.beginForm(name)
+        _draw_static(c, ops, font_name)
+        c.endForm()
+        defined.add(name)
+    c.doForm(name)
+
+
+def render_report(name, filename, values, images=None, texts=None, font_name="Helvetica"):
+    """
+    템플릿에 보고서 값을 채워 PDF를 만듭니다.
+
+    정적 레이어는 폼으로 한 번 정의해 재사용하고,
+    고객별 값, 차트, 분석 텍스트만 보고서마다 그립니다.
+
+    Args:
+        name: 보고서 종류 (REPORT_TEMPLATES 키)
+        filename: 저장할 PDF 경로
+        values: 값 형식에 채울 값 {이름: 값}
+        images: 이미지 영역에 넣을 이미지 {이름: PNG BytesIO 또는 reportlab Drawing}
+        texts: 본문 영역에 넣을 텍스트 {이름: 문자열}
+        font_name: 글꼴 이름
+
+    Returns:
+        생성된 페이지 수
+    """
+    template = compile_template(name, font_name)
+    images = images or {}
+    texts = texts or {}
+
+    # 스트림 압축, 생성 시각/문서 ID 고정 (같은 내용이면 같은 바이트가 되어 중복 저장 방지)
+    # TTF 글꼴은 reportlab이 사용한 글자만 서브셋으로 포함함
+    c = canvas.Canvas(filename, pagesize=A4, pageCompression=1, invariant=1)
+    defined = set()
+    continuation = lambda canvas_: _form(canvas_, f"{name}_continued", template["continuation"], font_name, defined)
+    pages = 0
+
+    for index, (static, dynamic) in enumerate(template["pages"]):
+        if index:
+            c.showPage()
+        pages += 1
+        _form(c, f"{name}_page{index}", static, font_name, defined)
+
+        for op in dynamic:
+            if op[0] == "field":
+                _, x, y, size, fmt = op
+                c.setFont(font_name, size)
+                c.drawString(x, y, fmt.format(**values))
+            elif op[0] == "image":
+                _, key, x, y, w, h = op
+                image = images[key]
+                if isinstance(image, Drawing):
+                    # 벡터 차트는 영역 크기에 맞춰 캔버스에 직접 그림
+                    c.saveState()
+                    c.translate(x, y)
+                    c.scale(w / image.width, h / image.height)
+                    renderPDF.draw(image, c, 0, 0)
+                    c.restoreState()
+                else:
+                    c.drawImage(ImageReader(image), x, y, width=w, height=h)
+            else:
+                _, key, x, y, w, size, leading = op
+                flow = TextFlow(c, x, y, w, font_name, size, leading, top=PAGE_HEIGHT - 2.5 * cm,
+                                on_new_page=continuation)
+                flow.add(texts.get(key, ""))
+                flow.finish()
+                pages += flow.pages - 1
+
+    c.save()
+    return pages
@@ -0,0 +1,158 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from config.settings import SEMANTIC_CACHE_THRESHOLD
+
+# 고객(데이터 버전)별 최대 저장 질문 수
+MAX_ENTRIES_PER_CUSTOMER = 200
+
+# 메모리에 유지할 최대 고객 수 (오래 사용하지 않은 고객부터 제거)
+MAX_CUSTOMERS = 2000
+
+# 의미에 영향이 적은 질문 끝 표현 (요청/의문 어미)
+_REQUEST_ENDINGS = re.compile(
+    r"(에 대해|에 대하여)?\s*(알려\s*주세요|알려\s*줘|알려\s*주실래요|설명해\s*주세요|설명해\s*줘|"
+    r"해\s*주세요|해\s*줘|인가요|인지|일까요|할까요|어떤가요|어때요|어떻게 되나요|무엇인가요|뭐야|요)$"
+)
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+# 질문의 수치와 단위 (기간, 금액, 비율 등) - 수치가 다르면 유사도가 높아도 다른 질문
+_NUMBER = re.compile(
+    r"(\d+(?:[,.]\d+)*)\s*(개월|달|년|주|일|억\s*원|천만\s*원|백만\s*원|만\s*원|억|천만|백만|만|천|원|%|퍼센트|점|회|건|세|살)?"
+)
+_SPACES = re.compile(r"\s+")
+
+# 한국어는 형태소 분석 없이도 음절 n-gram으로 어미 변화에 강한 유사도를 얻을 수 있음
+# (띄어쓰기 차이를 무시하도록 공백을 제거한 뒤 n-gram 생성)
+_vectorizer = HashingVectorizer(
+    analyzer="char", ngram_range=(2, 3), n_features=2 ** 18,
+    alternate_sign=False, norm="l2", preprocessor=lambda text: text.replace(" ", "")
+)
+
+
+def normalize_question(text):
+    """
+    질문을 비교하기 쉽게 정규화합니다.
+
+    유니코드 정규화, 소문자 변환, 문장 부호 제거 후 요청 어미를 떼어냅니다.
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = _SPACES.sub(" ", _PUNCTUATION.sub(" ", text)).strip()
+    stripped = _REQUEST_ENDINGS.sub("", text).strip()
+    return stripped or text
+
+
+def question_numbers(text):
+    """
+    질문에 나오는 수치를 단위와 함께 추출합니다. (예: "3개월 후 1,000만원" -> ("1000만원", "3개월"))
+
+    어순과 관계없이 비교할 수 있도록 정렬된 튜플로 반환합니다.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return tuple(sorted(
+        number.replace(",", "") + (unit or "").replace(" ", "") for number, unit in _NUMBER.findall(text)
+    ))
+
+
+def embed(questions):
+    """정규화된 질문 목록을 L2 정규화된 희소 벡터 행렬로 변환합니다."""
+    return _vectorizer.transform(questions)
+
+
+class SemanticCache:
+    """
+    고객 데이터 버전별 질문-응답 의미 캐시 (프로세스 내 벡터 인덱스)
+
+    새 질문과 저장된 질문의 코사인 유사도가 임계값 이상이고 질문의 수치(단위 포함)가
+    정확히 같으면 저장된 응답을 재사용합니다. ("3개월 후"와 "6개월 후"는 다른 질문)
+    고객 데이터가 바뀌면(버전 변경) 해당 고객의 이전 항목은 모두 버립니다.
+
+    Args:
+        threshold: 재사용할 최소 코사인 유사도 (0~1)
+    """
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        # customer_id -> {"version", "questions", "numbers", "answers", "matrix"}
+        self._index = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _bucket(self, customer_id, data_version):
+        bucket = self._index.get(customer_id)
+        if bucket is None or bucket["version"] != data_version:
+            return None
+        self._index.move_to_end(customer_id)
+        return bucket
+
+    def lookup(self, customer_id, data_version, question):
+        """
+        유사한 질문의 저장된 응답을 찾습니다.
+
+        Returns:
+            (응답, 유사도) 또는 None
+        """
+        normalized = normalize_question(question)
+        numbers = question_numbers(question)
+        vector = embed([normalized])
+        with self._lock:
+            bucket = self._bucket(customer_id, data_version)
+            if bucket is None or bucket["matrix"] is None:
+                self.misses += 1
+                return None
+            scores = (bucket["matrix"] @ vector.T).toarray().ravel()
+            # 수치가 다른 질문은 후보에서 제외
+            scores[[stored != numbers for stored in bucket["numbers"]]] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return bucket["answers"][best], float(scores[best])
+
+    def store(self, customer_id, data_version, question, answer):
+        """질문과 응답을 저장합니다. (같은 정규화 질문이면 응답만 교체)"""
+        normalized = normalize_question(question)
+        numbers = question_numbers(question)
+        vector = embed([normalized])
+        with self._lock:
+            bucket = self._bucket(customer_id, data_version)
+            if bucket is None:
+                bucket = {"version": data_version, "questions": [], "numbers": [], "answers": [], "matrix": None}
+                self._index[customer_id] = bucket
+                self._index.move_to_end(customer_id)
+                while len(self._index) > MAX_CUSTOMERS:
+                    self._index.popitem(last=False)
+
+            if normalized in bucket["questions"]:
+                bucket["answers"][bucket["questions"].index(normalized)] = answer
+                return
+
+            bucket["questions"].append(normalized)
+            bucket["numbers"].append(numbers)
+            bucket["answers"].append(answer)
+            matrix = vector if bucket["matrix"] is None else sparse.vstack([bucket["matrix"], vector], format="csr")
+            if len(bucket["questions"]) > MAX_ENTRIES_PER_CUSTOMER:
+                del bucket["questions"][0], bucket["numbers"][0], bucket["answers"][0]
+                matrix = matrix[1:]
+            bucket["matrix"] = matrix
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "customers": len(self._index),
+                "entries": sum(len(b["questions"]) for b in self._index.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "threshold": self.threshold
+            }
+
+
+semantic_cache = SemanticCache()
@@ -0,0 +1,283 @@
+import hashlib
+import re
+import time
+import numpy as np
+import openai
+import orjson
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app.services.llm_gateway import chat_completion, LLMUnavailableError
+from app.utils.shared_cache import get_shared_cache
+
+# 요약 방식 (auto: 로컬 추출 요약 후 부족한 텍스트만 LLM, extractive: 로컬만, llm: 모두 LLM)
+SUMMARY_MODES = ("auto", "extractive", "llm")
+
+# 기본 요약 문장 수
+DEFAULT_SENTENCES = 3
+
+# 한 번에 요약할 수 있는 최대 텍스트 수와 텍스트당 최대 길이
+MAX_TEXTS = 50
+MAX_TEXT_CHARS = 20000
+
+# 추출 요약이 원문과 이 코사인 유사도 이상이면 LLM 없이 사용 (auto 모드)
+MIN_COVERAGE = 0.6
+
+# 추출 요약이 이보다 길면 문장을 골라내는 것만으로는 요약이 안 된 것으로 보고 LLM 사용 (auto 모드)
+MAX_EXTRACT_CHARS = 600
+
+# 앞쪽 문장 가산점 (분석 결과는 보통 결론을 먼저 쓰므로 첫 문장에 최대값, 뒤로 갈수록 줄어듦)
+LEAD_BONUS = 0.1
+
+# 이미 고른 문장과 이 이상 비슷한 문장은 건너뜀 (중복 문장 제거)
+MAX_REDUNDANCY = 0.7
+
+# 배치 LLM 호출의 텍스트당 생성 토큰 수와 전체 상한
+LLM_TOKENS_PER_TEXT = 150
+LLM_MAX_TOKENS = 4000
+
+# LLM 호출 한 번에 보낼 최대 텍스트 수 (모든 텍스트의 요약이 생성 토큰 상한 안에 들어가도록 함)
+LLM_TEXTS_PER_CALL = LLM_MAX_TOKENS // LLM_TOKENS_PER_TEXT
+
+# LLM 호출 한 번의 추정 입력 토큰 상한 (estimate_tokens와 같이 글자 수의 절반으로 추정)
+LLM_MAX_INPUT_TOKENS = 12000
+
+# 요약 캐시 유지 시간(초) - 키가 텍스트 해시이므로 내용이 같으면 계속 재사용
+SUMMARY_CACHE_TTL = 7 * 24 * 3600
+
+_MARKDOWN_PREFIX = re.compile(r"^\s*(?:#+|[-*•]|\d+[.)])\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# 한국어는 형태소 분석 없이 음절 n-gram으로 핵심어 가중치를 계산 (어미/조사 변화에 강함)
+_vectorizer_options = {"analyzer": "char_wb", "ngram_range": (2, 3), "sublinear_tf": True}
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_sentences(text):
+    """
+    텍스트를 문장 목록으로 나눕니다.
+
+    Markdown 제목은 문장에서 제외하고, 목록 기호와 번호는 떼어냅니다.
+    """
+    sentences = []
+    for line in (text or "").splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        line = _MARKDOWN_PREFIX.sub("", line).replace("**", "").strip()
+        sentences += [part.strip() for part in _SENTENCE_END.split(line) if len(part.strip()) > 1]
+    return sentences
+
+
+def _select(matrix, count):
+    """
+    문서 중심 벡터와의 유사도(앞쪽 문장 가산)순으로 중복되지 않는 문장 count개를 고릅니다.
+
+    Returns:
+        (고른 문장 번호 목록(원문 순서), 요약과 원문의 코사인 유사도)
+    """
+    centroid = np.asarray(matrix.sum(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if not norm:
+        return list(range(min(count, matrix.shape[0]))), 0.0
+    count_all = matrix.shape[0]
+    scores = matrix @ (centroid / norm) + LEAD_BONUS * (1 - np.arange(count_all) / count_all)
+
+    similarity = (matrix @ matrix.T).toarray()
+    chosen = []
+    for i in np.argsort(-scores, kind="stable").tolist():
+        if len(chosen) >= count:
+            break
+        if any(similarity[i, j] >= MAX_REDUNDANCY for j in chosen):
+            continue
+        chosen.append(i)
+    chosen.sort()
+
+    summary = np.asarray(matrix[chosen].sum(axis=0)).ravel()
+    coverage = float(summary @ centroid / (np.linalg.norm(summary) * norm)) if chosen else 0.0
+    return chosen, coverage
+
+
+def extractive_summaries(texts, sentences=DEFAULT_SENTENCES):
+    """
+    TF-IDF 문장 점수로 텍스트마다 핵심 문장을 골라 요약합니다. (LLM 호출 없음)
+
+    모든 텍스트의 문장을 한 번에 벡터화하여 IDF를 함께 계산하므로
+    여러 텍스트에 공통으로 나오는 상투적인 표현은 점수가 낮아집니다.
+
+    Args:
+        texts: 요약할 텍스트 목록
+        sentences: 텍스트당 요약 문장 수
+
+    Returns:
+        [{"summary", "method", "coverage"}] (method: original-이미 짧은 텍스트, extractive-추출 요약)
+    """
+    split = [split_sentences(text) for text in texts]
+    all_sentences = [sentence for parts in split for sentence in parts]
+    matrix = None
+    if any(len(parts) > sentences for parts in split):
+        matrix = TfidfVectorizer(**_vectorizer_options).fit_transform(all_sentences)
+
+    results, offset = [], 0
+    for text, parts in zip(texts, split):
+        if len(parts) <= sentences:
+            summary = " ".join(parts) or text.strip()
+            results.append({"summary": summary, "method": "original", "coverage": 1.0})
+        else:
+            chosen, coverage = _select(matrix[offset:offset + len(parts)], sentences)
+            results.append({"summary": " ".join(parts[i] for i in chosen), "method": "extractive",
+                            "coverage": round(coverage, 3)})
+        offset += len(parts)
+    return results
+
+
+def needs_llm(result):
+    """추출 요약으로 충분하지 않아 LLM 요약이 필요한지 판단합니다."""
+    return result["coverage"] < MIN_COVERAGE or len(result["summary"]) > MAX_EXTRACT_CHARS
+
+
+def llm_summaries(texts, sentences=DEFAULT_SENTENCES, priority="interactive"):
+    """
+    여러 텍스트를 LLM 호출 한 번으로 요약합니다.
+
+    Returns:
+        입력 순서의 요약문 목록
+
+    Raises:
+        LLMUnavailableError: LLM을 사용할 수 없는 경우
+        ValueError: 응답이 요청한 JSON 형식이 아닌 경우
+    """
+    prompt = f"""
+    아래 JSON 배열의 텍스트 {len(texts)}개를 각각 {sentences}문장 이내로 요약해 주세요.
+    원문에 있는 수치와 사실만 사용하고, 입력 순서대로 다음 JSON 형식으로만 답하세요.
+    {{"summaries": ["첫 번째 요약", "두 번째 요약", ...]}}
+
+    {orjson.dumps(texts).decode("utf-8")}
+    """
+    content = chat_completion(
+        messages=[
+            {"role": "system", "content": "당신은 금융 전문가입니다. 분석 결과를 핵심만 간결하게 요약합니다."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        max_tokens=min(LLM_MAX_TOKENS, LLM_TOKENS_PER_TEXT * len(texts) + 50),
+        priority=priority
+    )
+    try:
+        summaries = orjson.loads(_CODE_FENCE.sub("", (content or "").strip()))["summaries"]
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError("LLM 요약 응답을 해석할 수 없습니다.") from e
+    if not isinstance(summaries, list) or len(summaries) != len(texts):
+        raise ValueError("LLM 요약 응답의 개수가 요청과 다릅니다.")
+    return [str(summary).strip() for summary in summaries]
+
+
+def llm_batches(texts):
+    """
+    LLM으로 요약할 텍스트를 호출 단위로 나눕니다.
+
+    호출마다 추정 입력 토큰이 LLM_MAX_INPUT_TOKENS, 텍스트 수가 LLM_TEXTS_PER_CALL을 넘지 않도록
+    입력 순서대로 채웁니다. (텍스트 하나가 상한을 넘으면 단독으로 보냄)
+
+    Returns:
+        [텍스트 번호 목록]
+    """
+    batches, current, used = [], [], 0
+    for i, text in enumerate(texts):
+        tokens = len(text) // 2
+        if current and (used + tokens > LLM_MAX_INPUT_TOKENS or len(current) >= LLM_TEXTS_PER_CALL):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _cache_key(text, sentences, mode):
+    return f"summary:{mode}:{sentences}:{text_hash(text)}"
+
+
+def summarize_texts(texts, sentences=DEFAULT_SENTENCES, mode="auto", priority="interactive"):
+    """
+    여러 텍스트를 한 번에 요약합니다.
+
+    텍스트 해시로 캐시된 요약은 바로 반환하고, 나머지는 로컬 추출 요약을 먼저 시도합니다.
+    추출 요약으로 부족한 텍스트(auto) 또는 전체(llm)만 모아 입력 토큰/생성 토큰 상한에 맞춘 묶음별로
+    LLM을 호출하며, 묶음의 호출이 실패하면 그 묶음만 추출 요약으로 대신합니다.
+
+    Args:
+        texts: 요약할 텍스트 목록
+        sentences: 텍스트당 요약 문장 수
+        mode: 요약 방식 (auto, extractive, llm)
+        priority: LLM 호출 우선순위 (interactive, batch)
+
+    Returns:
+        {"results": [{"summary", "method", "coverage", "cached"}], "stats": {...}}
+        method: original, extractive, llm, fallback(LLM 대신 추출 요약)
+
+    Raises:
+        ValueError: 지원하지 않는 방식이거나 텍스트 수/길이가 한도를 넘는 경우
+    """
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"지원하지 않는 요약 방식입니다: {mode} ({', '.join(SUMMARY_MODES)} 지원)")
+    if len(texts) > MAX_TEXTS:
+        raise ValueError(f"한 번에 최대 {MAX_TEXTS}개의 텍스트를 요약할 수 있습니다.")
+    if any(len(text) > MAX_TEXT_CHARS for text in texts):
+        raise ValueError(f"텍스트는 {MAX_TEXT_CHARS:,}자 이하여야 합니다.")
+
+    started = time.perf_counter()
+    cache = get_shared_cache()
+    results = [None] * len(texts)
+
+    # 같은 요청 안의 중복 텍스트는 한 번만 요약
+    pending = {}
+    for i, text in enumerate(texts):
+        cached = cache.get_json(_cache_key(text, sentences, mode))
+        if cached is not None:
+            results[i] = {**cached, "cached": True}
+        else:
+            pending.setdefault(text, []).append(i)
+
+    unique = list(pending)
+    local = extractive_summaries(unique, sentences) if unique else []
+    if mode == "extractive":
+        remote = []
+    else:
+        remote = [k for k, result in enumerate(local)
+                  if needs_llm(result) or (mode == "llm" and result["method"] != "original")]
+
+    batches = [[remote[j] for j in batch] for batch in llm_batches([unique[k] for k in remote])]
+    for batch in batches:
+        try:
+            summaries = llm_summaries([unique[k] for k in batch], sentences, priority)
+            for k, summary in zip(batch, summaries):
+                local[k] = {"summary": summary, "method": "llm", "coverage": None}
+        except (LLMUnavailableError, ValueError, openai.BadRequestError):
+            # 컨텍스트 길이 초과 등 요청 자체가 거부된 경우도 이 묶음만 추출 요약으로 대신함
+            for k in batch:
+                local[k]["method"] = "fallback"
+
+    for text, result in zip(unique, local):
+        # 대체 요약은 캐시하지 않아 다음 요청에서 LLM을 다시 시도함
+        if result["method"] != "fallback":
+            cache.set_json(_cache_key(text, sentences, mode), result, SUMMARY_CACHE_TTL)
+        for i in pending[text]:
+            results[i] = {**result, "cached": False}
+
+    methods = [result["method"] for result in results]
+    return {
+        "results": results,
+        "stats": {
+            "texts": len(texts),
+            "cached": sum(result["cached"] for result in results),
+            "original": methods.count("original"),
+            "extractive": methods.count("extractive"),
+            "llm": methods.count("llm"),
+            "fallback": methods.count("fallback"),
+            "llm_calls": len(batches),
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+    }
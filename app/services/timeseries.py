@@ -0,0 +1,139 @@
+import numpy as np
+from datetime import datetime
+from app.utils.monthly_records import METRIC_FIELDS
+
+# 다운샘플링 방식
+DOWNSAMPLE_METHODS = ("lttb", "mean")
+
+
+def _parse_month(value):
+    """YYYY-MM 문자열을 datetime64[D] (해당 월 1일)로 변환합니다."""
+    try:
+        return np.datetime64(datetime.strptime(value, "%Y-%m").strftime("%Y-%m-01"), "D")
+    except ValueError:
+        raise ValueError("날짜 형식은 YYYY-MM이어야 합니다.")
+
+
+def select_range(months, start_date=None, end_date=None):
+    """
+    정렬된 월 배열에서 기간에 해당하는 구간을 이진 탐색으로 찾습니다.
+
+    Args:
+        months: datetime64[D] 배열 (오름차순)
+        start_date: 시작 날짜 (YYYY-MM 형식)
+        end_date: 종료 날짜 (YYYY-MM 형식, 해당 월 포함)
+
+    Returns:
+        slice 객체
+    """
+    start = np.searchsorted(months, _parse_month(start_date), side="left") if start_date else 0
+    if end_date:
+        # 종료 월의 마지막 날까지 포함
+        end_bound = (_parse_month(end_date).astype("datetime64[M]") + 1).astype("datetime64[D]")
+        end = np.searchsorted(months, end_bound, side="left")
+    else:
+        end = len(months)
+    return slice(int(start), int(end))
+
+
+def lttb_indices(y, threshold):
+    """
+    Largest-Triangle-Three-Buckets 알고리즘으로 남길 인덱스를 선택합니다.
+
+    x축은 월 순번(등간격)으로 간주합니다.
+
+    Args:
+        y: 값 배열
+        threshold: 남길 점 수 (3 이상)
+
+    Returns:
+        선택된 인덱스 배열
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    # 첫 점과 마지막 점은 항상 포함하고, 나머지를 (threshold - 2)개 구간으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # 다음 구간의 평균점 (마지막 구간은 마지막 점)
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            avg_x = x[next_lo:next_hi].mean()
+            avg_y = y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def bucket_means(values, threshold):
+    """
+    값 배열을 threshold개 구간으로 나누어 구간 평균을 계산합니다.
+
+    Returns:
+        (구간 시작 인덱스 배열, 구간 평균 배열)
+    """
+    n = len(values)
+    starts = np.linspace(0, n, threshold + 1).astype(np.int64)[:-1]
+    sums = np.add.reduceat(values, starts)
+    counts = np.diff(np.append(starts, n))
+    return starts, sums / counts
+
+
+def build_series(columns, metrics, start_date=None, end_date=None, max_points=None, method="lttb"):
+    """
+    컬럼형 데이터에서 요청한 항목과 기간만 잘라 차트용 시계열을 만듭니다.
+
+    Args:
+        columns: 저장소의 컬럼형 고객 데이터
+        metrics: 반환할 항목 목록
+        start_date: 시작 날짜 (YYYY-MM 형식)
+        end_date: 종료 날짜 (YYYY-MM 형식)
+        max_points: 최대 점 수 (초과 시 다운샘플링)
+        method: 다운샘플링 방식 (lttb: 첫 번째 항목 기준 LTTB, mean: 구간 평균)
+
+    Returns:
+        {"months": [...], "series": {항목: [...]}, "total_points": int, "downsampled": bool}
+    """
+    invalid = [m for m in metrics if m not in METRIC_FIELDS]
+    if invalid or not metrics:
+        raise ValueError(f"지원하지 않는 항목입니다: {', '.join(invalid)} (가능: {', '.join(METRIC_FIELDS)})")
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"지원하지 않는 다운샘플링 방식입니다: {method}")
+
+    window = select_range(columns["month"], start_date, end_date)
+    months = columns["month"][window]
+    total = len(months)
+
+    downsampled = bool(max_points) and total > max_points
+    if not downsampled:
+        series = {m: columns[m][window] for m in metrics}
+    elif method == "lttb":
+        idx = lttb_indices(columns[metrics[0]][window], max_points)
+        months = months[idx]
+        series = {m: columns[m][window][idx] for m in metrics}
+    else:
+        starts, _ = bucket_means(columns[metrics[0]][window], max_points)
+        series = {m: bucket_means(columns[m][window], max_points)[1] for m in metrics}
+        months = months[starts]
+
+    return {
+        "months": np.datetime_as_string(months, unit="D").tolist(),
+        "series": {m: values.tolist() for m, values in series.items()},
+        "total_points": total,
+        "downsampled": downsampled
+    }
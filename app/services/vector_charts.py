@@ -0,0 +1,285 @@
+from datetime import datetime
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.utils import FillPairedData
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.widgets.markers import makeMarker
+
+# 차트 색상 (PNG 차트와 동일)
+BLUE = colors.HexColor("#3366cc")
+RED = colors.HexColor("#dc3912")
+GREEN = colors.HexColor("#109618")
+ORANGE = colors.HexColor("#ff9900")
+PURPLE = colors.HexColor("#990099")
+GRID = colors.HexColor("#cccccc")
+
+# 예측 구간 색상 (90% 구간, 50% 구간)
+BAND_OUTER = colors.HexColor("#c6d5f0")
+BAND_INNER = colors.HexColor("#8faee0")
+
+
+def _chart_rows(customer_data, start_date=None, end_date=None):
+    """기간으로 거른 월별 데이터를 (월 라벨 목록, 행 목록)으로 반환합니다."""
+    rows = sorted(customer_data["monthly_data"], key=lambda d: d["month"])
+    if start_date:
+        rows = [d for d in rows if d["month"][:7] >= start_date]
+    if end_date:
+        rows = [d for d in rows if d["month"][:7] <= end_date]
+    months = [datetime.strptime(d["month"], "%Y-%m-%d").strftime("%Y-%m") for d in rows]
+    return months, rows
+
+
+def _amount_label(value):
+    """금액 축 라벨 (만원 단위)"""
+    return f"{value / 10000:,.0f}만"
+
+
+def _style_axes(chart, months, font_name):
+    chart.categoryAxis.categoryNames = months
+    chart.categoryAxis.labels.angle = 45
+    chart.categoryAxis.labels.boxAnchor = "ne"
+    chart.categoryAxis.labels.fontName = font_name
+    chart.categoryAxis.labels.fontSize = 6
+    # 월이 많으면 라벨을 건너뛰어 겹치지 않게 함
+    step = max(1, len(months) // 12)
+    if step > 1:
+        chart.categoryAxis.categoryNames = [m if i % step == 0 else "" for i, m in enumerate(months)]
+    chart.valueAxis.labels.fontName = font_name
+    chart.valueAxis.labels.fontSize = 6
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = GRID
+    chart.valueAxis.gridStrokeDashArray = (2, 2)
+
+
+def _line_panel(drawing, x, y, width, height, title, months, series, font_name, value_format=None, legend=None,
+                bands=None):
+    """
+    선 그래프 하나를 drawing의 (x, y, width, height) 영역에 추가합니다.
+
+    series 항목은 (값 목록, 색상) 또는 (값 목록, 색상, 점선 패턴)이고,
+    bands 항목 (하한 목록, 상한 목록, 색상)은 두 선 사이를 칠한 구간으로 선보다 먼저 그립니다.
+    값 목록의 None은 그리지 않습니다.
+    """
+    drawing.add(String(x + width / 2, y + height - 10, title, fontName=font_name, fontSize=10, textAnchor="middle"))
+
+    chart = HorizontalLineChart()
+    chart.x, chart.y = x + 40, y + 35
+    chart.width, chart.height = width - 50, height - 55
+    data = []
+    for lower, upper, color in bands or ():
+        data.append(lower)
+        data.append(FillPairedData(upper, len(data) - 1))
+        for row in (len(data) - 2, len(data) - 1):
+            chart.lines[row].strokeColor = color
+            chart.lines[row].fillColor = color
+            chart.lines[row].strokeWidth = 0.5
+    offset = len(data)
+    data.extend(entry[0] for entry in series)
+    chart.data = data
+    _style_axes(chart, months, font_name)
+    if value_format:
+        chart.valueAxis.labelTextFormat = value_format
+    for i, entry in enumerate(series):
+        color = entry[1]
+        line = chart.lines[offset + i]
+        line.strokeColor = color
+        line.strokeWidth = 1.5
+        if len(entry) > 2:
+            line.strokeDashArray = entry[2]
+        else:
+            line.symbol = makeMarker("FilledCircle", size=3, fillColor=color, strokeColor=color)
+    drawing.add(chart)
+
+    if legend:
+        box = Legend()
+        # 예측 구간은 오른쪽으로 퍼지므로 범례를 왼쪽 위에 둠
+        box.x, box.y = (x + 50 if bands else x + width - 60), y + height - 20
+        box.fontName = font_name
+        box.fontSize = 7
+        colors_ = [entry[1] for entry in series] + [color for _, _, color in bands or ()]
+        box.colorNamePairs = list(zip(colors_, legend))
+        box.columnMaximum = len(box.colorNamePairs)
+        drawing.add(box)
+
+
+def _bar_panel(drawing, x, y, width, height, title, labels, values, font_name, color, value_format=None):
+    """막대 그래프 하나를 drawing의 (x, y, width, height) 영역에 추가합니다. (값 축은 0부터)"""
+    drawing.add(String(x + width / 2, y + height - 10, title, fontName=font_name, fontSize=10, textAnchor="middle"))
+    bars = VerticalBarChart()
+    bars.x, bars.y = x + 40, y + 35
+    bars.width, bars.height = width - 50, height - 55
+    bars.data = [list(values)]
+    bars.bars[0].fillColor = color
+    bars.bars[0].strokeColor = None
+    _style_axes(bars, labels, font_name)
+    bars.valueAxis.valueMin = 0
+    if value_format:
+        bars.valueAxis.labelTextFormat = value_format
+    drawing.add(bars)
+
+
+def forecast_series(scores, forecast):
+    """
+    실적 점수와 예측 구간을 같은 월 축에 놓을 수 있도록 None으로 채운 목록들을 만듭니다.
+
+    예측 구간은 마지막 실적 월에서 시작하도록 이어 붙입니다.
+
+    Args:
+        scores: 실적 신용 점수 목록
+        forecast: forecast_customer 결과
+
+    Returns:
+        (실적 목록, {"p5": 목록, ...})
+    """
+    history = list(scores) + [None] * len(forecast["months"])
+    lead = [None] * (len(scores) - 1) + [scores[-1]]
+    bands = {name: lead + list(values) for name, values in forecast["bands"].items()}
+    return history, bands
+
+
+def credit_score_drawing(customer_data, start_date=None, end_date=None, font_name="Helvetica",
+                         width=17 * cm, height=9 * cm, forecast=None):
+    """
+    신용 점수 추이 차트를 벡터 그래픽(Drawing)으로 만듭니다.
+
+    Args:
+        customer_data: 고객 데이터
+        start_date: 시작 날짜 (YYYY-MM 형식)
+        end_date: 종료 날짜 (YYYY-MM 형식)
+        font_name: 글꼴 이름
+        width: 차트 너비(pt)
+        height: 차트 높이(pt)
+        forecast: 예측 구간 (forecast_customer 결과, 선택적) - 중앙값과 50%/90% 구간을 이어서 그림
+
+    Returns:
+        reportlab Drawing
+    """
+    months, rows = _chart_rows(customer_data, start_date, end_date)
+    scores = [d["credit_score"] for d in rows]
+    drawing = Drawing(width, height)
+    if not forecast or not scores:
+        _line_panel(drawing, 0, 0, width, height, "신용 점수 추이", months, [(scores, BLUE)], font_name)
+        return drawing
+
+    history, bands = forecast_series(scores, forecast)
+    _line_panel(drawing, 0, 0, width, height, f"신용 점수 추이 및 {len(forecast['months'])}개월 예측",
+                months + forecast["months"],
+                [(history, BLUE), (bands["p50"], BLUE, (3, 2))], font_name,
+                legend=["실적", "예측 중앙값", "90% 구간", "50% 구간"],
+                bands=[(bands["p5"], bands["p95"], BAND_OUTER), (bands["p25"], bands["p75"], BAND_INNER)])
+    return drawing
+
+
+def financial_drawing(customer_data, start_date=None, end_date=None, font_name="Helvetica",
+                      width=19 * cm, height=14 * cm):
+    """
+    재정 상태 차트(수입/지출, 저축액, 부채, 지출 비율)를 벡터 그래픽(Drawing)으로 만듭니다.
+
+    Args:
+        customer_data: 고객 데이터
+        start_date: 시작 날짜 (YYYY-MM 형식)
+        end_date: 종료 날짜 (YYYY-MM 형식)
+        font_name: 글꼴 이름
+        width: 차트 너비(pt)
+        height: 차트 높이(pt)
+
+    Returns:
+        reportlab Drawing
+    """
+    months, rows = _chart_rows(customer_data, start_date, end_date)
+    income = [d["income"] for d in rows]
+    expenses = [d["expenses"] for d in rows]
+    half_w, half_h = width / 2, height / 2
+
+    drawing = Drawing(width, height)
+    _line_panel(drawing, 0, half_h, half_w, half_h, "월별 수입 및 지출", months,
+                [(income, BLUE), (expenses, RED)], font_name, _amount_label, legend=["수입", "지출"])
+    _line_panel(drawing, half_w, half_h, half_w, half_h, "월별 저축액", months,
+                [([d["savings"] for d in rows], GREEN)], font_name, _amount_label)
+    _line_panel(drawing, 0, 0, half_w, half_h, "월별 부채 총액", months,
+                [([d["debt"] for d in rows], ORANGE)], font_name, _amount_label)
+
+    # 수입 대비 지출 비율 막대 그래프
+    _bar_panel(drawing, half_w, 0, half_w, half_h, "수입 대비 지출 비율", months,
+               [e / i * 100 if i > 0 else 0 for e, i in zip(expenses, income)], font_name, PURPLE, "%d%%")
+    return drawing
+
+
+def bar_drawing(title, labels, values, font_name="Helvetica", width=17 * cm, height=7.5 * cm, color=BLUE,
+                value_format=None):
+    """
+    막대 그래프 하나를 벡터 그래픽(Drawing)으로 만듭니다. (분포, 유형별 집계용)
+
+    Args:
+        title: 차트 제목
+        labels: 막대 라벨 목록
+        values: 막대 값 목록
+        font_name: 글꼴 이름
+        width: 차트 너비(pt)
+        height: 차트 높이(pt)
+        color: 막대 색상
+        value_format: 값 축 라벨 형식 (예: "%d%%" 또는 함수)
+
+    Returns:
+        reportlab Drawing
+    """
+    drawing = Drawing(width, height)
+    _bar_panel(drawing, 0, 0, width, height, title, labels, values, font_name, color, value_format)
+    return drawing
+
+
+def line_drawing(title, labels, values, font_name="Helvetica", width=17 * cm, height=7.5 * cm, color=BLUE):
+    """
+    선 그래프 하나를 벡터 그래픽(Drawing)으로 만듭니다. (값 목록의 None은 그리지 않음)
+
+    Returns:
+        reportlab Drawing
+    """
+    drawing = Drawing(width, height)
+    _line_panel(drawing, 0, 0, width, height, title, labels, [(values, color)], font_name)
+    return drawing
+
+
+if __name__ == "__main__":
+    # PNG 차트와 벡터 차트의 렌더링 시간, PDF 크기 비교
+    import os
+    import sys
+    import tempfile
+    import time
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
+    from reportlab.graphics import renderPDF
+    from reportlab.pdfgen import canvas
+    from app.utils.data_generator import generate_customer_timeseries
+    from app.services.report_generator import create_credit_score_chart, create_financial_chart, KOREAN_FONT
+
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    customer = generate_customer_timeseries("CUST_BENCH", "홍길동", months=months)
+
+    def png_pdf(path):
+        c = canvas.Canvas(path, pagesize=A4)
+        c.drawImage(ImageReader(create_credit_score_chart(customer)), 2 * cm, 15 * cm, width=17 * cm, height=9 * cm)
+        c.showPage()
+        c.drawImage(ImageReader(create_financial_chart(customer)), 1 * cm, 10 * cm, width=19 * cm, height=14 * cm)
+        c.save()
+
+    def vector_pdf(path):
+        c = canvas.Canvas(path, pagesize=A4)
+        renderPDF.draw(credit_score_drawing(customer, font_name=KOREAN_FONT), c, 2 * cm, 15 * cm)
+        c.showPage()
+        renderPDF.draw(financial_drawing(customer, font_name=KOREAN_FONT), c, 1 * cm, 10 * cm)
+        c.save()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, render in (("png", png_pdf), ("vector", vector_pdf)):
+            path = os.path.join(tmp, f"{label}.pdf")
+            render(path)  # 준비 실행 (글꼴/모듈 로딩)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                render(path)
+            elapsed = (time.perf_counter() - started) / repeat
+            print(f"{label:>6}: {elapsed * 1000:8.1f} ms/보고서, {os.path.getsize(path) / 1024:8.1f} KB")
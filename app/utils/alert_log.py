@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import time
+from app.utils.customer_store import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+# 경보 로그 (JSON Lines, 모든 워커가 같은 파일에 추가하고 구독자는 바이트 위치로 이어 읽음)
+ALERTS_DIR = os.path.join(DATA_DIR, "alerts")
+ALERT_LOG_FILENAME = "alerts.jsonl"
+
+# 구독 스트림의 새 경보 확인 간격과 연결 유지 주석 간격(초)
+POLL_INTERVAL = 0.5
+HEARTBEAT_INTERVAL = 15
+
+
+def _log_path():
+    return os.path.join(ALERTS_DIR, ALERT_LOG_FILENAME)
+
+
+def log_end():
+    """현재 경보 로그 끝 위치 (새 구독자의 시작 위치)"""
+    try:
+        return os.path.getsize(_log_path())
+    except FileNotFoundError:
+        return 0
+
+
+def publish_alerts(alerts):
+    """
+    경보를 로그 끝에 추가합니다. (여러 워커가 동시에 호출해도 줄 단위로 기록됨)
+
+    Returns:
+        기록된 경보 수
+    """
+    if not alerts:
+        return 0
+    os.makedirs(ALERTS_DIR, exist_ok=True)
+    payload = "".join(json.dumps(alert, ensure_ascii=False) + "\n" for alert in alerts).encode("utf-8")
+    with open(_log_path(), 'ab') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.write(payload)
+            f.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    return len(alerts)
+
+
+def read_alerts(after=0, limit=1000):
+    """
+    위치 after 이후의 경보를 읽습니다.
+
+    Args:
+        after: 이전에 읽은 마지막 위치 (경보 id)
+        limit: 최대 경보 수
+
+    Returns:
+        ([(id, 경보)], 다음 위치) - id는 경보 줄 끝의 바이트 위치
+    """
+    try:
+        f = open(_log_path(), 'rb')
+    except FileNotFoundError:
+        return [], after
+    with f:
+        f.seek(after)
+        alerts, position = [], after
+        for line in f:
+            # 아직 기록 중인 마지막 줄은 다음에 읽음
+            if not line.endswith(b"\n"):
+                break
+            position += len(line)
+            alerts.append((position, json.loads(line)))
+            if len(alerts) >= limit:
+                break
+    return alerts, position
+
+
+def recent_alerts(limit=100, chunk_size=1 << 16):
+    """
+    최근 경보를 최신순으로 반환합니다. (파일 끝부분만 읽음)
+
+    Returns:
+        [{"id", ...경보}]
+    """
+    end = log_end()
+    if not end:
+        return []
+
+    start = end
+    with open(_log_path(), 'rb') as f:
+        while True:
+            start = max(0, start - chunk_size)
+            f.seek(start)
+            data = f.read(end - start)
+            if start == 0 or data.count(b"\n") > limit:
+                break
+
+    # 줄 중간에서 시작했으면 첫 조각을, 기록 중인 마지막 줄은 버림
+    if start > 0:
+        cut = data.index(b"\n") + 1
+        data, start = data[cut:], start + cut
+    data = data[:data.rfind(b"\n") + 1]
+
+    alerts, position = [], start
+    for line in data.splitlines(keepends=True):
+        position += len(line)
+        alerts.append({"id": position, **json.loads(line)})
+    return alerts[::-1][:limit]
+
+
+async def follow_alerts(after=None, customer_id=None, kinds=None):
+    """
+    경보를 Server-Sent Events 형식으로 계속 내보냅니다.
+
+    Args:
+        after: 이어서 받을 위치 (Last-Event-ID, None이면 지금부터)
+        customer_id: 특정 고객의 경보만 받기
+        kinds: 받을 경보 종류 집합 (None이면 전체)
+
+    Yields:
+        SSE 이벤트 문자열
+    """
+    position = log_end() if after is None else after
+    last_event = time.monotonic()
+    yield "retry: 3000\n\n"
+    while True:
+        alerts, position = await asyncio.to_thread(read_alerts, position)
+        for alert_id, alert in alerts:
+            if customer_id and alert["customer_id"] != customer_id:
+                continue
+            if kinds and alert["kind"] not in kinds:
+                continue
+            yield f"id: {alert_id}\nevent: alert\ndata: {json.dumps(alert, ensure_ascii=False)}\n\n"
+            last_event = time.monotonic()
+
+        if not alerts:
+            await asyncio.sleep(POLL_INTERVAL)
+        if time.monotonic() - last_event >= HEARTBEAT_INTERVAL:
+            # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+            yield ": keep-alive\n\n"
+            last_event = time.monotonic()
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+from app.utils.customer_store import DATA_DIR, write_json_atomic
+
+# 분석 결과 저장 디렉토리
+ANALYSES_DIR = os.path.join(DATA_DIR, "analyses")
+
+_lock = threading.Lock()
+
+
+def _analysis_path(customer_id):
+    return os.path.join(ANALYSES_DIR, f"analysis_{customer_id}.json")
+
+
+def _read(customer_id):
+    filepath = _analysis_path(customer_id)
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_analyses(records):
+    """
+    분석 결과를 고객별 파일에 저장합니다.
+
+    Args:
+        records: [{"customer_id", "analysis_type", "result", "data_version", "source"}] 목록
+
+    Returns:
+        저장된 결과 수
+    """
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record["customer_id"], []).append(record)
+
+    with _lock:
+        os.makedirs(ANALYSES_DIR, exist_ok=True)
+        for customer_id, items in grouped.items():
+            analyses = _read(customer_id)
+            for item in items:
+                analyses[item["analysis_type"]] = {
+                    "result": item["result"],
+                    "data_version": item.get("data_version"),
+                    "source": item.get("source", "online"),
+                    "created_at": time.time()
+                }
+            write_json_atomic(_analysis_path(customer_id), analyses)
+
+    return sum(len(items) for items in grouped.values())
+
+
+def save_analysis(customer_id, analysis_type, result, data_version=None, source="online"):
+    """분석 결과 한 건을 저장합니다."""
+    return save_analyses([{
+        "customer_id": customer_id,
+        "analysis_type": analysis_type,
+        "result": result,
+        "data_version": data_version,
+        "source": source
+    }])
+
+
+def get_analyses(customer_id, data_version=None):
+    """
+    고객의 저장된 분석 결과를 반환합니다.
+
+    Args:
+        customer_id: 고객 ID
+        data_version: 지정하면 해당 데이터 버전으로 만든 결과만 반환
+
+    Returns:
+        {분석 유형: 저장 레코드}
+    """
+    with _lock:
+        analyses = _read(customer_id)
+    if data_version is not None:
+        analyses = {k: v for k, v in analyses.items() if v.get("data_version") == data_version}
+    return analyses
+
+
+def get_analysis(customer_id, analysis_type, data_version=None):
+    """특정 유형의 저장된 분석 결과를 반환합니다. (없으면 None)"""
+    return get_analyses(customer_id, data_version).get(analysis_type)
@@ -0,0 +1,783 @@
+import json
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import time
+import zlib
+from glob import glob
+import orjson
+from app.models.customer import CustomerTimeSeriesData, MonthlyCustomerData
+from app.utils.shared_cache import get_shared_cache
+from app.utils.name_index import NameIndex
+from app.utils.monthly_records import MonthlyRecords
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+# 데이터 저장 디렉토리 설정
+DATA_DIR = "data"
+STORE_DIRNAME = "store"
+MANIFEST_FILENAME = "manifest.json"
+LOCK_FILENAME = ".lock"
+
+# 샤드 수 (고객 ID 해시 기준으로 추가 로그를 분산)
+NUM_SHARDS = 16
+
+# 샤드 로그 항목이 이 수를 넘으면 고객 파일로 압축(compaction)
+COMPACTION_THRESHOLD = 500
+
+# 워커마다 메모리에 유지할 최대 고객 수 (나머지는 워커 간 공유 캐시에서 다시 읽음)
+LOCAL_CACHE_CUSTOMERS = 2000
+
+
+def shard_of(customer_id):
+    """고객 ID가 속한 샤드 번호를 반환합니다."""
+    return zlib.crc32(customer_id.encode("utf-8")) % NUM_SHARDS
+
+
+def write_json_atomic(filepath, data, indent=2):
+    """
+    임시 파일에 쓴 뒤 교체하여 부분 기록된 파일이 남지 않도록 저장합니다.
+
+    orjson으로 한 번에 직렬화하므로 json.dump보다 훨씬 빠릅니다. (indent는 2 또는 None)
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=option))
+    os.replace(tmp_path, filepath)
+
+
+def _new_generation():
+    """
+    전체 데이터 재생성 시 바뀌는 세대 번호
+
+    프로세스 재시작 후에도 이전 세대와 겹치지 않도록 생성 시각(ms)을 사용합니다.
+    """
+    return time.time_ns() // 1_000_000
+
+
+def month_key(month):
+    """월별 데이터의 달력 월 (YYYY-MM) - 고객별로 한 달에 한 건만 저장"""
+    return month[:7]
+
+
+class LRUCache(OrderedDict):
+    """최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 버리는 dict"""
+
+    def __init__(self, maxsize=LOCAL_CACHE_CUSTOMERS):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _empty_summary():
+    return {
+        "months": 0,
+        "first_month": None,
+        "last_month": None,
+        "latest": None,
+        "credit_score_sum": 0,
+        "credit_score_min": None,
+        "credit_score_max": None,
+        "overdue_total": 0
+    }
+
+
+def _update_summary(summary, row):
+    """
+    월별 데이터 한 건을 파생 지표에 반영합니다.
+
+    월 데이터는 항상 시간순으로 추가되므로 전체를 다시 계산하지 않고 누적값만 갱신합니다.
+    """
+    score = row["credit_score"]
+    summary["months"] += 1
+    if summary["first_month"] is None:
+        summary["first_month"] = row["month"]
+    summary["last_month"] = row["month"]
+    summary["latest"] = dict(row)
+    summary["credit_score_sum"] += score
+    summary["credit_score_min"] = score if summary["credit_score_min"] is None else min(summary["credit_score_min"], score)
+    summary["credit_score_max"] = score if summary["credit_score_max"] is None else max(summary["credit_score_max"], score)
+    summary["overdue_total"] += row.get("overdue_payments") or 0
+    return summary
+
+
+def _build_entry(customer):
+    """고객 데이터로부터 매니페스트 항목을 생성합니다."""
+    summary = _empty_summary()
+    for row in sorted(customer.get("monthly_data", []), key=lambda x: x["month"]):
+        _update_summary(summary, row)
+
+    return {
+        "name": customer["name"],
+        "profile_type": customer.get("profile_type"),
+        "shard": shard_of(customer["customer_id"]),
+        "version": 1,
+        "updated_at": time.time(),
+        "summary": summary
+    }
+
+
+class CustomerStore:
+    """
+    고객 데이터 저장소
+
+    기본 데이터는 `customer_{id}.json` 파일에 두고, 새로 들어오는 월별 데이터는
+    샤드별 추가 전용 로그(append-only log)에 기록합니다. 로그가 일정 크기를 넘으면
+    해당 샤드의 고객 파일에만 병합(compaction)하므로 전체 데이터셋을 다시 쓰지 않습니다.
+    고객 목록과 파생 지표는 매니페스트(manifest)에서 제자리 갱신됩니다.
+    워커별 고객 데이터/모델 캐시는 최근 사용한 cache_size명(기본 LOCAL_CACHE_CUSTOMERS)까지만 유지합니다.
+
+    여러 워커 프로세스가 같은 디렉토리를 공유할 수 있도록 쓰기는 파일 잠금으로 직렬화하고,
+    다른 프로세스가 매니페스트를 바꾸면 변경된 고객의 로컬 캐시만 버린 뒤 다시 읽습니다.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, cache_size=None):
+        self.data_dir = data_dir
+        self.store_dir = os.path.join(data_dir, STORE_DIRNAME)
+        self._lock = threading.RLock()
+        self._manifest = None
+        self._manifest_stamp = None
+        cache_size = cache_size or LOCAL_CACHE_CUSTOMERS
+        self._cache = LRUCache(cache_size)
+        self._models = LRUCache(cache_size)
+        self._index = None
+        self._columns = LRUCache(cache_size)
+        self._names = None
+        self._names_key = None
+
+    # ------------------------------------------------------------------
+    # 경로
+    # ------------------------------------------------------------------
+    def _customer_path(self, customer_id):
+        return os.path.join(self.data_dir, f"customer_{customer_id}.json")
+
+    def _manifest_path(self):
+        return os.path.join(self.store_dir, MANIFEST_FILENAME)
+
+    def _log_path(self, shard):
+        return os.path.join(self.store_dir, f"shard_{shard:02d}.log")
+
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        """스레드 잠금과 프로세스 간 파일 잠금을 함께 잡습니다."""
+        with self._lock:
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(os.path.join(self.store_dir, LOCK_FILENAME), 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_lock(self):
+        return self._file_lock(exclusive=True)
+
+    # ------------------------------------------------------------------
+    # 매니페스트
+    # ------------------------------------------------------------------
+    def _stamp(self):
+        """매니페스트 파일 식별값 (원자적 교체 시 inode가 바뀜)"""
+        try:
+            stat = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load_manifest(self):
+        stamp = self._stamp()
+        if self._manifest is not None and (stamp is None or stamp == self._manifest_stamp):
+            return self._manifest
+
+        if stamp is None:
+            self._manifest = self._bootstrap_manifest()
+            return self._manifest
+
+        # 다른 프로세스가 갱신한 매니페스트를 읽고, 바뀐 고객의 로컬 캐시만 제거
+        with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if self._manifest is not None:
+            self._evict_changed(self._manifest, manifest)
+        self._manifest = manifest
+        self._manifest_stamp = stamp
+        return self._manifest
+
+    def _evict_changed(self, old, new):
+        self._index = None
+        if old.get("generation") != new.get("generation"):
+            self._cache.clear()
+            self._models.clear()
+            self._columns.clear()
+            return
+
+        old_customers, new_customers = old["customers"], new["customers"]
+        for customer_id in list(self._cache) + list(self._models) + list(self._columns):
+            old_entry = old_customers.get(customer_id)
+            new_entry = new_customers.get(customer_id)
+            if not old_entry or not new_entry or old_entry["version"] != new_entry["version"]:
+                self._cache.pop(customer_id, None)
+                self._models.pop(customer_id, None)
+                self._columns.pop(customer_id, None)
+
+    def _bootstrap_manifest(self):
+        """기존 JSON 파일만 있는 경우 매니페스트를 한 번 생성합니다."""
+        customers = []
+        all_customers_path = os.path.join(self.data_dir, "customer_data.json")
+        if os.path.exists(all_customers_path):
+            with open(all_customers_path, 'r', encoding='utf-8') as f:
+                customers = json.load(f)
+            # 개별 고객 파일이 없으면 함께 생성
+            for customer in customers:
+                if not os.path.exists(self._customer_path(customer["customer_id"])):
+                    write_json_atomic(self._customer_path(customer["customer_id"]), customer)
+        else:
+            for filepath in sorted(glob(os.path.join(self.data_dir, "customer_*.json"))):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    customers.append(json.load(f))
+
+        manifest = {
+            "generation": _new_generation(),
+            "version": 1,
+            "updated_at": time.time(),
+            "customers": {c["customer_id"]: _build_entry(c) for c in customers},
+            "pending": {}
+        }
+        if customers:
+            self._save_manifest(manifest)
+        return manifest
+
+    def _save_manifest(self, manifest=None):
+        os.makedirs(self.store_dir, exist_ok=True)
+        write_json_atomic(self._manifest_path(), manifest or self._manifest, indent=None)
+        self._manifest_stamp = self._stamp()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @property
+    def version(self):
+        """저장소 전체 데이터 버전"""
+        with self._lock:
+            return self._load_manifest()["version"]
+
+    def data_version(self, customer_id=None):
+        """
+        데이터 버전 태그와 마지막 수정 시각을 반환합니다. (HTTP 캐시 검증용)
+
+        매니페스트만 참조하므로 고객 파일을 읽지 않습니다.
+
+        Args:
+            customer_id: 고객 ID (None이면 저장소 전체)
+
+        Returns:
+            (버전 태그, 수정 시각 epoch) 또는 고객이 없으면 None
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            generation = manifest.get("generation", 0)
+            if customer_id is None:
+                return f"{generation}.{manifest['version']}", manifest.get("updated_at")
+
+            entry = manifest["customers"].get(customer_id)
+            if entry is None:
+                return None
+            return f"{generation}.{entry['version']}", entry.get("updated_at")
+
+    def customer_versions(self):
+        """
+        전체 데이터 버전과 고객별 버전을 같은 매니페스트 시점으로 반환합니다. (변경된 고객 확인용)
+
+        Returns:
+            (버전 태그, 세대 번호, {고객 ID: 고객 버전})
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            generation = manifest.get("generation", 0)
+            versions = {customer_id: entry["version"] for customer_id, entry in manifest["customers"].items()}
+            return f"{generation}.{manifest['version']}", generation, versions
+
+    def customer_ids(self):
+        """등록된 고객 ID 목록을 반환합니다."""
+        with self._lock:
+            return list(self._load_manifest()["customers"].keys())
+
+    def _id_index(self):
+        """정렬된 고객 ID 목록(전체 및 프로필 유형별) 인덱스를 반환합니다."""
+        if self._index is None:
+            index = {None: []}
+            for customer_id, entry in self._load_manifest()["customers"].items():
+                index[None].append(customer_id)
+                index.setdefault(entry.get("profile_type"), []).append(customer_id)
+            for ids in index.values():
+                ids.sort()
+            self._index = index
+        return self._index
+
+    def list_customers(self, profile_type=None, after=None, limit=100):
+        """
+        매니페스트만으로 고객 목록을 페이지 단위로 반환합니다. (월별 데이터는 읽지 않음)
+
+        Args:
+            profile_type: 프로필 유형 필터
+            after: 이 고객 ID 다음부터 반환 (커서)
+            limit: 최대 반환 수
+
+        Returns:
+            ([(고객 ID, 매니페스트 항목)], 다음 커서 고객 ID 또는 None, 전체 건수)
+        """
+        with self._lock:
+            ids = self._id_index().get(profile_type, [])
+            start = bisect_right(ids, after) if after else 0
+            page_ids = ids[start:start + limit]
+            customers = self._load_manifest()["customers"]
+
+            next_after = page_ids[-1] if start + limit < len(ids) else None
+            return [(cid, customers[cid]) for cid in page_ids], next_after, len(ids)
+
+    def get_entry(self, customer_id):
+        """고객의 매니페스트 항목(이름, 프로필, 버전, 파생 지표)을 반환합니다."""
+        with self._lock:
+            return self._load_manifest()["customers"].get(customer_id)
+
+    def get_customer(self, customer_id):
+        """
+        고객 데이터를 반환합니다.
+
+        기본 파일에 샤드 로그의 미병합 데이터를 더한 결과를 캐시합니다.
+        monthly_data는 dict 호환 뷰를 돌려주는 MonthlyRecords입니다. (JSON 직렬화는 to_dicts 사용)
+
+        Args:
+            customer_id: 고객 ID
+
+        Returns:
+            고객 데이터 (없으면 None)
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            if customer_id in self._cache:
+                return self._cache[customer_id]
+
+            entry = manifest["customers"].get(customer_id)
+            if entry is None:
+                return None
+
+            # 워커 간 공유 캐시 (고객마다 한 항목만 두고 데이터 버전이 다르면 덮어씀)
+            shared_key = f"customer:{customer_id}"
+            version = f"{manifest.get('generation')}.{entry['version']}"
+            shared = get_shared_cache().get_json(shared_key)
+            customer = shared["customer"] if shared and shared.get("version") == version else None
+
+            if customer is None:
+                filepath = self._customer_path(customer_id)
+                if not os.path.exists(filepath):
+                    return None
+
+                # 다른 프로세스의 병합(compaction)과 겹치지 않도록 공유 잠금 하에 파일과 로그를 읽음
+                with self._file_lock(exclusive=False):
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        customer = json.load(f)
+                    pending_rows = self._read_log(entry["shard"]).get(customer_id, [])
+
+                last_month = customer["monthly_data"][-1]["month"] if customer["monthly_data"] else ""
+                customer["monthly_data"].extend(row for row in pending_rows if row["month"] > last_month)
+                customer["monthly_data"].sort(key=lambda x: x["month"])
+                get_shared_cache().set_json(shared_key, {"version": version, "customer": customer})
+
+            # 로컬 캐시에는 월별 데이터를 압축 목록으로 보관 (dict처럼 읽을 수 있음)
+            customer["monthly_data"] = MonthlyRecords(customer["monthly_data"])
+            self._cache[customer_id] = customer
+            return customer
+
+    def get_customer_model(self, customer_id):
+        """
+        검증된 고객 모델을 반환합니다.
+
+        모델은 고객별로 한 번만 생성하여 캐시하고, 월별 데이터가 추가되면 제자리 갱신합니다.
+
+        Args:
+            customer_id: 고객 ID
+
+        Returns:
+            CustomerTimeSeriesData (없으면 None)
+        """
+        with self._lock:
+            model = self._models.get(customer_id)
+            if model is None:
+                customer = self.get_customer(customer_id)
+                if customer is None:
+                    return None
+                model = CustomerTimeSeriesData.model_validate(
+                    {**customer, "monthly_data": customer["monthly_data"].to_dicts()})
+                self._models[customer_id] = model
+            return model
+
+    def get_columns(self, customer_id):
+        """
+        고객의 월별 데이터를 항목별 numpy 배열(컬럼)로 반환합니다.
+
+        캐시된 MonthlyRecords의 배열을 복사 없이 가리키는 읽기 전용 뷰입니다.
+
+        Returns:
+            {"month": datetime64[D] 배열, 각 수치 항목: float64 배열} (없으면 None)
+        """
+        with self._lock:
+            columns = self._columns.get(customer_id)
+            if columns is None:
+                customer = self.get_customer(customer_id)
+                if customer is None:
+                    return None
+                columns = customer["monthly_data"].columns()
+                self._columns[customer_id] = columns
+            return columns
+
+    def name_index(self):
+        """
+        고객 이름 검색 인덱스를 반환합니다.
+
+        이름은 바뀌지 않고 고객은 추가만 되므로 세대나 고객 수가 바뀔 때만 다시 만듭니다.
+        (월별 데이터 추가로는 다시 만들지 않음)
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            key = (manifest.get("generation"), len(manifest["customers"]))
+            if self._names is None or self._names_key != key:
+                self._names = NameIndex((cid, entry["name"]) for cid, entry in manifest["customers"].items())
+                self._names_key = key
+            return self._names
+
+    def find_ids_by_name(self, customer_name):
+        """이름이 일치하는 모든 고객 ID를 등록 순서대로 반환합니다."""
+        return self.name_index().exact(customer_name)
+
+    def find_id_by_name(self, customer_name):
+        """이름이 일치하는 첫 번째 고객 ID를 반환합니다."""
+        customer_ids = self.find_ids_by_name(customer_name)
+        return customer_ids[0] if customer_ids else None
+
+    def find_by_name(self, customer_name):
+        """이름이 일치하는 첫 번째 고객 데이터를 반환합니다."""
+        customer_id = self.find_id_by_name(customer_name)
+        return self.get_customer(customer_id) if customer_id else None
+
+    def load_all(self):
+        """모든 고객 데이터를 반환합니다."""
+        return [c for c in (self.get_customer(cid) for cid in self.customer_ids()) if c]
+
+    def read_customers(self, customer_ids):
+        """
+        여러 고객 데이터를 한 번의 공유 잠금으로 읽습니다. (전체 내보내기용)
+
+        로컬 캐시에 있는 고객은 그대로 사용하고, 나머지는 캐시에 담지 않으므로
+        전체 고객을 차례로 읽어도 메모리 사용량이 늘지 않습니다.
+        샤드 로그는 호출마다 샤드당 한 번만 읽습니다.
+
+        Args:
+            customer_ids: 고객 ID 목록
+
+        Returns:
+            고객 데이터 목록 (없는 고객은 제외)
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            customers, missing = {}, []
+            for customer_id in customer_ids:
+                if customer_id in self._cache:
+                    customers[customer_id] = self._cache[customer_id]
+                elif customer_id in manifest["customers"]:
+                    missing.append(customer_id)
+
+            if missing:
+                shards = {manifest["customers"][cid]["shard"] for cid in missing}
+                with self._file_lock(exclusive=False):
+                    pending = {}
+                    for shard in shards:
+                        pending.update(self._read_log(shard))
+                    for customer_id in missing:
+                        try:
+                            with open(self._customer_path(customer_id), 'rb') as f:
+                                customer = orjson.loads(f.read())
+                        except FileNotFoundError:
+                            continue
+                        rows = pending.get(customer_id)
+                        if rows:
+                            last_month = customer["monthly_data"][-1]["month"] if customer["monthly_data"] else ""
+                            customer["monthly_data"].extend(row for row in rows if row["month"] > last_month)
+                            customer["monthly_data"].sort(key=lambda x: x["month"])
+                        customers[customer_id] = customer
+
+            return [customers[cid] for cid in customer_ids if cid in customers]
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def replace_all(self, customers):
+        """
+        전체 고객 데이터를 새로 저장합니다. (고객 데이터 생성 시 사용)
+
+        Args:
+            customers: 고객 데이터 목록
+
+        Returns:
+            전체 고객 데이터 파일 경로
+        """
+        with self._write_lock():
+            os.makedirs(self.data_dir, exist_ok=True)
+            filepath = os.path.join(self.data_dir, "customer_data.json")
+            write_json_atomic(filepath, customers)
+
+            for customer in customers:
+                write_json_atomic(self._customer_path(customer["customer_id"]), customer)
+
+            # 이전 샤드 로그 제거
+            for shard in range(NUM_SHARDS):
+                if os.path.exists(self._log_path(shard)):
+                    os.remove(self._log_path(shard))
+
+            self._manifest = {
+                "generation": _new_generation(),
+                "version": 1,
+                "updated_at": time.time(),
+                "customers": {c["customer_id"]: _build_entry(c) for c in customers},
+                "pending": {}
+            }
+            self._save_manifest()
+            self._cache.clear()
+            self._models.clear()
+            self._index = None
+            self._columns.clear()
+
+            return filepath
+
+    def append_monthly_data(self, customer_id, rows):
+        """
+        기존 고객에게 월별 데이터를 추가합니다.
+
+        Args:
+            customer_id: 고객 ID
+            rows: 추가할 월별 데이터 목록 (month는 YYYY-MM-DD 문자열)
+
+        Returns:
+            (갱신된 매니페스트 항목, 압축이 필요한 샤드 번호 또는 None)
+
+        Raises:
+            KeyError: 고객이 존재하지 않는 경우
+            ValueError: 추가할 월이 기존 마지막 월과 같은 달이거나 이전인 경우
+        """
+        rows = sorted(rows, key=lambda x: x["month"])
+
+        with self._write_lock():
+            manifest = self._load_manifest()
+            entry = manifest["customers"].get(customer_id)
+            if entry is None:
+                raise KeyError(customer_id)
+
+            last_month = entry["summary"]["last_month"]
+            previous = last_month
+            # 포트폴리오 배열과 이상 탐지는 달력 월 단위이므로 같은 달의 두 번째 데이터는 받지 않음
+            for row in rows:
+                if previous is not None and month_key(row["month"]) <= month_key(previous):
+                    raise ValueError(f"추가할 월({row['month']})은 마지막 월({previous})의 다음 달 이후여야 합니다.")
+                previous = row["month"]
+
+            # 1) 추가 전용 로그에 기록
+            shard = entry["shard"]
+            os.makedirs(self.store_dir, exist_ok=True)
+            with open(self._log_path(shard), 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({"customer_id": customer_id, **row}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            # 2) 캐시와 파생 지표를 제자리 갱신
+            cached = self._cache.get(customer_id)
+            model = self._models.get(customer_id)
+            for row in rows:
+                _update_summary(entry["summary"], row)
+                if cached is not None:
+                    cached["monthly_data"].append(dict(row))
+                if model is not None:
+                    model.append(MonthlyCustomerData.model_validate(row))
+
+            self._columns.pop(customer_id, None)
+
+            now = time.time()
+            entry["version"] += 1
+            entry["updated_at"] = now
+            manifest["version"] += 1
+            manifest["updated_at"] = now
+            pending = manifest["pending"].get(str(shard), 0) + len(rows)
+            manifest["pending"][str(shard)] = pending
+            self._save_manifest()
+
+            return entry, (shard if pending >= COMPACTION_THRESHOLD else None)
+
+    def import_batch(self, customers):
+        """
+        여러 고객의 월별 데이터를 한 번의 잠금과 매니페스트 저장으로 기록합니다. (대량 가져오기용)
+
+        새 고객은 고객 파일을 만들고, 기존 고객은 마지막 월 이후의 데이터만 샤드 로그에 추가합니다.
+
+        Args:
+            customers: [{"customer_id", "name", "profile_type", "monthly_data": 시간순 월별 데이터(달마다 한 건)}] 목록
+
+        Returns:
+            {"created", "updated", "rows", "rejected": [(고객 ID, 월, 사유)], "compact": [압축이 필요한 샤드],
+             "appended": [(고객 ID, 가져오기 전 마지막 월(새 고객은 None), 기록된 월별 데이터)]}
+        """
+        created, updated, imported, rejected, appended = 0, 0, 0, [], []
+        logs = {}
+
+        with self._write_lock():
+            manifest = self._load_manifest()
+            now = time.time()
+            for customer in customers:
+                customer_id, rows = customer["customer_id"], customer["monthly_data"]
+                entry = manifest["customers"].get(customer_id)
+
+                if entry is None:
+                    if not customer.get("name"):
+                        rejected.extend((customer_id, row["month"], "신규 고객의 name 누락") for row in rows)
+                        continue
+                    record = {
+                        "customer_id": customer_id,
+                        "name": customer["name"],
+                        "profile_type": customer.get("profile_type"),
+                        "monthly_data": rows
+                    }
+                    write_json_atomic(self._customer_path(customer_id), record)
+                    manifest["customers"][customer_id] = _build_entry(record)
+                    appended.append((customer_id, None, rows))
+                    created += 1
+                    imported += len(rows)
+                    continue
+
+                last_month = entry["summary"]["last_month"]
+                if last_month is not None:
+                    last_key = month_key(last_month)
+                    rejected.extend((customer_id, row["month"], "마지막 월 이전 데이터")
+                                    for row in rows if month_key(row["month"]) <= last_key)
+                    rows = [row for row in rows if month_key(row["month"]) > last_key]
+                if not rows:
+                    continue
+
+                lines = logs.setdefault(entry["shard"], [])
+                for row in rows:
+                    lines.append(json.dumps({"customer_id": customer_id, **row}, ensure_ascii=False))
+                    _update_summary(entry["summary"], row)
+                appended.append((customer_id, last_month, rows))
+                entry["version"] += 1
+                entry["updated_at"] = now
+                self._cache.pop(customer_id, None)
+                self._models.pop(customer_id, None)
+                self._columns.pop(customer_id, None)
+                updated += 1
+                imported += len(rows)
+
+            # 샤드별로 한 번씩 로그에 추가
+            os.makedirs(self.store_dir, exist_ok=True)
+            compact = []
+            for shard, lines in logs.items():
+                with open(self._log_path(shard), 'a', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                pending = manifest["pending"].get(str(shard), 0) + len(lines)
+                manifest["pending"][str(shard)] = pending
+                if pending >= COMPACTION_THRESHOLD:
+                    compact.append(shard)
+
+            if created or updated:
+                manifest["version"] += 1
+                manifest["updated_at"] = now
+                self._index = None
+                self._save_manifest()
+
+        return {"created": created, "updated": updated, "rows": imported, "rejected": rejected, "compact": compact,
+                "appended": appended}
+
+    def _read_log(self, shard):
+        """샤드 로그를 고객별 월 데이터로 묶어 반환합니다."""
+        grouped = {}
+        log_path = self._log_path(shard)
+        if not os.path.exists(log_path):
+            return grouped
+
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                grouped.setdefault(row.pop("customer_id"), []).append(row)
+        return grouped
+
+    def compact(self, shard=None):
+        """
+        샤드 로그를 고객 파일에 병합하고 로그를 비웁니다.
+
+        Args:
+            shard: 병합할 샤드 번호 (None이면 모든 샤드)
+
+        Returns:
+            병합된 월별 데이터 수
+        """
+        shards = range(NUM_SHARDS) if shard is None else [shard]
+        merged = 0
+
+        with self._write_lock():
+            manifest = self._load_manifest()
+            for s in shards:
+                grouped = self._read_log(s)
+                for customer_id, rows in grouped.items():
+                    filepath = self._customer_path(customer_id)
+                    if not os.path.exists(filepath):
+                        continue
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        customer = json.load(f)
+                    customer["monthly_data"].extend(rows)
+                    customer["monthly_data"].sort(key=lambda x: x["month"])
+                    write_json_atomic(filepath, customer)
+                    merged += len(rows)
+
+                if os.path.exists(self._log_path(s)):
+                    os.remove(self._log_path(s))
+                manifest["pending"].pop(str(s), None)
+
+            self._save_manifest()
+
+        return merged
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """프로세스 전역 고객 저장소를 반환합니다."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CustomerStore()
+    return _store
@@ -1,7 +1,17 @@
 import random
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
+from app.utils.customer_store import get_store
+
+# 신용 점수 범위
+CREDIT_SCORE_MIN, CREDIT_SCORE_MAX = 300, 850
+
+# 월별 신용 점수 변동 범위 (정수, 균등 분포)
+CREDIT_SCORE_STEP = (-10, 15)
+
+# 연체 발생 시 추가 감점 범위
+OVERDUE_PENALTY = (5, 15)
 
 def generate_customer_timeseries(customer_id: str, name: str, months: int = 12, 
                                 profile_type: str = "average"):
@@ -55,9 +65,10 @@ def generate_customer_timeseries(customer_id: str, name: str, months: int = 12,
     initial_debt = initial_income * random.uniform(*profile["debt_ratio"])
     initial_loan_payments = initial_debt * random.uniform(0.02, 0.05)
     
-    # 월별 데이터 생성
+    # 월별 데이터 생성 (지난달까지 달력 월마다 1일자로 한 건, 저장소와 가져오기의 "한 달에 한 건" 규칙과 같음)
     monthly_data = []
-    start_date = datetime.now() - timedelta(days=30 * months)
+    now = datetime.now()
+    start_index = now.year * 12 + now.month - 1 - months
     
     credit_score = initial_credit_score
     income = initial_income
@@ -68,17 +79,18 @@ def generate_customer_timeseries(customer_id: str, name: str, months: int = 12,
     
     for i in range(months):
         # 날짜 계산
-        current_month = start_date + timedelta(days=30 * i)
+        year, month = divmod(start_index + i, 12)
+        current_month = datetime(year, month + 1, 1)
         
         # 변동성 추가
-        credit_score_change = random.randint(-10, 15)
+        credit_score_change = random.randint(*CREDIT_SCORE_STEP)
         income_change = random.uniform(-0.03, 0.05)
         expenses_change = random.uniform(-0.05, 0.08)
         savings_change = random.uniform(-0.1, 0.15)
         debt_change = random.uniform(-0.03, 0.04)
         
         # 값 업데이트
-        credit_score = max(300, min(850, credit_score + credit_score_change))
+        credit_score = max(CREDIT_SCORE_MIN, min(CREDIT_SCORE_MAX, credit_score + credit_score_change))
         income = max(2000000, income * (1 + income_change))
         expenses = max(1000000, expenses * (1 + expenses_change))
         savings = max(0, savings * (1 + savings_change))
@@ -90,7 +102,7 @@ def generate_customer_timeseries(customer_id: str, name: str, months: int = 12,
         if random.random() < profile["overdue_prob"]:
             overdue = random.randint(1, 2)
             # 연체 시 신용점수 추가 감소
-            credit_score = max(300, credit_score - random.randint(5, 15))
+            credit_score = max(CREDIT_SCORE_MIN, credit_score - random.randint(*OVERDUE_PENALTY))
         
         # 월별 데이터 추가
         monthly_data.append({
@@ -169,32 +181,18 @@ def load_customer_data(customer_id=None, customer_name=None):
     Returns:
         고객 데이터 또는 모든 고객 데이터 리스트
     """
-    data_dir = "data"
+    store = get_store()
     
     # 특정 고객 ID로 검색
     if customer_id:
-        filepath = os.path.join(data_dir, f"customer_{customer_id}.json")
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
-    
-    # 모든 고객 데이터 로드
-    all_customers_path = os.path.join(data_dir, "customer_data.json")
-    if not os.path.exists(all_customers_path):
-        return []
-    
-    with open(all_customers_path, 'r', encoding='utf-8') as f:
-        customers = json.load(f)
+        return store.get_customer(customer_id)
     
     # 이름으로 검색
     if customer_name:
-        for customer in customers:
-            if customer["name"] == customer_name:
-                return customer
-        return None
+        return store.find_by_name(customer_name)
     
-    return customers
+    # 모든 고객 데이터 로드
+    return store.load_all()
 
 def save_to_json(data, filename="customer_data.json"):
     """
@@ -215,14 +213,9 @@ if __name__ == "__main__":
     # 5명의 고객 데이터 생성
     customers = generate_multiple_customers(5)
     
-    # JSON 파일로 저장
-    filepath = save_to_json(customers)
+    # JSON 파일로 저장 (전체 파일, 개별 고객 파일, 저장소 매니페스트)
+    filepath = get_store().replace_all(customers)
     print(f"고객 데이터가 {filepath}에 저장되었습니다.")
     
-    # 개별 고객 파일로도 저장
     for customer in customers:
-        customer_filepath = save_to_json(
-            customer, 
-            f"customer_{customer['customer_id']}.json"
-        )
-        print(f"고객 {customer['name']}의 데이터가 {customer_filepath}에 저장되었습니다.")
\ No newline at end of file
+        print(f"고객 {customer['name']}({customer['customer_id']})의 데이터가 저장되었습니다.")
\ No newline at end of file
@@ -0,0 +1,56 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+
+# 클라이언트가 매 요청마다 ETag로 재검증하도록 설정
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    """데이터 버전 등 구성 요소로부터 약한(weak) ETag를 만듭니다."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def cache_headers(etag, last_modified=None):
+    """
+    캐시 검증 헤더를 만듭니다.
+
+    Args:
+        etag: ETag 값
+        last_modified: 마지막 수정 시각 (epoch 초)
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag, last_modified=None):
+    """
+    조건부 요청(If-None-Match / If-Modified-Since)이 현재 버전과 일치하는지 확인합니다.
+
+    If-None-Match가 있으면 그것만 비교합니다. (RFC 9110)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # 약한 비교: W/ 접두어를 무시하고 태그만 비교
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= int(since)
+
+    return False
+
+
+def not_modified(etag, last_modified=None):
+    """본문 없는 304 응답을 반환합니다."""
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
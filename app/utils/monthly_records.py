@@ -0,0 +1,201 @@
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+# 월별 데이터의 수치 항목
+METRIC_FIELDS = ("credit_score", "income", "expenses", "savings", "debt", "loan_payments", "overdue_payments")
+
+# 월별 데이터 한 건의 항목 (dict 형식과 같은 순서)
+RECORD_FIELDS = ("month",) + METRIC_FIELDS
+
+_FIELD_INDEX = {field: k for k, field in enumerate(METRIC_FIELDS)}
+
+
+def _number(value):
+    # JSON 파일과 같이 정수로 저장된 값(원 단위 금액, 점수, 횟수)은 정수로 돌려줌
+    return int(value) if value.is_integer() else value
+
+
+class MonthlyRecord(Mapping):
+    """
+    MonthlyRecords의 한 월을 가리키는 읽기 전용 dict 호환 뷰
+
+    row["month"], row.get("debt"), dict(row), {**row} 등 기존 dict 사용 코드가 그대로 동작합니다.
+    값을 따로 복사해 두지 않으므로 접근할 때만 잠시 만들어집니다.
+    """
+
+    __slots__ = ("_records", "_index")
+
+    def __init__(self, records, index):
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, key):
+        if key == "month":
+            return str(self._records._months[self._index])
+        return _number(float(self._records._values[self._index, _FIELD_INDEX[key]]))
+
+    def __iter__(self):
+        return iter(RECORD_FIELDS)
+
+    def __len__(self):
+        return len(RECORD_FIELDS)
+
+    def __contains__(self, key):
+        return key == "month" or key in _FIELD_INDEX
+
+    def to_dict(self):
+        return {field: self[field] for field in RECORD_FIELDS}
+
+    def __repr__(self):
+        return f"MonthlyRecord({self.to_dict()!r})"
+
+
+class MonthlyRecords(Sequence):
+    """
+    고객 한 명의 월별 데이터를 항목별 배열에 담은 압축 목록
+
+    월은 datetime64[D] 배열, 수치 항목은 (월 수, 항목 수) float64 배열 하나에 저장하므로
+    월 하나가 64바이트만 차지합니다. (문자열 키 8개짜리 dict는 월마다 500바이트 이상)
+    항목을 꺼내면 MonthlyRecord 뷰를 돌려주어 dict 목록처럼 읽을 수 있고,
+    분석 코드는 columns()로 복사 없이 항목별 배열을 얻습니다.
+
+    Args:
+        rows: 월별 데이터 dict 목록 (month는 YYYY-MM-DD 문자열)
+    """
+
+    __slots__ = ("_months", "_values", "_size")
+
+    def __init__(self, rows=()):
+        rows = list(rows)
+        self._size = len(rows)
+        self._months = np.array([row["month"][:10] for row in rows], dtype="datetime64[D]")
+        self._values = np.array(
+            [[row.get(field) or 0 for field in METRIC_FIELDS] for row in rows], dtype=np.float64
+        ).reshape(self._size, len(METRIC_FIELDS))
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            records = MonthlyRecords()
+            records._months = self._months[:self._size][index].copy()
+            records._values = self._values[:self._size][index].copy()
+            records._size = len(records._months)
+            return records
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("월별 데이터 범위를 벗어났습니다.")
+        return MonthlyRecord(self, index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield MonthlyRecord(self, i)
+
+    def _reserve(self, capacity):
+        months = np.empty(capacity, dtype="datetime64[D]")
+        values = np.empty((capacity, len(METRIC_FIELDS)), dtype=np.float64)
+        months[:self._size] = self._months[:self._size]
+        values[:self._size] = self._values[:self._size]
+        self._months, self._values = months, values
+
+    def append(self, row):
+        """월별 데이터 한 건을 끝에 추가합니다. (배열 용량은 두 배씩 늘림)"""
+        if self._size == len(self._months):
+            self._reserve(max(4, self._size * 2))
+        self._months[self._size] = np.datetime64(row["month"][:10], "D")
+        self._values[self._size] = [row.get(field) or 0 for field in METRIC_FIELDS]
+        self._size += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def sort(self, key=None, reverse=False):
+        """월 순서(기본) 또는 key 함수 순서로 제자리 정렬합니다."""
+        if key is None:
+            order = np.argsort(self._months[:self._size], kind="stable")
+            if reverse:
+                order = order[::-1]
+        else:
+            order = sorted(range(self._size), key=lambda i: key(MonthlyRecord(self, i)), reverse=reverse)
+        self._months[:self._size] = self._months[:self._size][order]
+        self._values[:self._size] = self._values[:self._size][order]
+
+    def columns(self):
+        """
+        항목별 배열을 복사 없이 반환합니다. (읽기 전용 뷰)
+
+        Returns:
+            {"month": datetime64[D] 배열, 각 수치 항목: float64 배열}
+        """
+        columns = {"month": self._months[:self._size]}
+        for field, k in _FIELD_INDEX.items():
+            columns[field] = self._values[:self._size, k]
+        for array in columns.values():
+            array.flags.writeable = False
+        return columns
+
+    def to_dicts(self):
+        """dict 목록으로 변환합니다. (JSON 직렬화용)"""
+        return [record.to_dict() for record in self]
+
+    @property
+    def nbytes(self):
+        return self._months.nbytes + self._values.nbytes
+
+    def __repr__(self):
+        return f"MonthlyRecords({self._size}개월)"
+
+
+if __name__ == "__main__":
+    # 월별 데이터 표현별 상주 메모리 측정 (고객-월 한 건당 바이트)
+    import gc
+    import random
+    import sys
+    import tracemalloc
+    from datetime import date
+    from app.models.customer import MonthlyCustomerData
+
+    customers = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    months = 12
+    random.seed(0)
+
+    def make_rows():
+        # JSON 파일에서 읽은 것과 같이 월마다 새 문자열/정수 객체를 만듦
+        return [{
+            "month": date(2024 + m // 12, m % 12 + 1, 1).isoformat(),
+            "credit_score": random.randint(300, 850),
+            "income": round(random.uniform(2e6, 1e7)),
+            "expenses": round(random.uniform(1e6, 5e6)),
+            "savings": round(random.uniform(0, 5e7)),
+            "debt": round(random.uniform(0, 1e8)),
+            "loan_payments": round(random.uniform(0, 3e6)),
+            "overdue_payments": random.choice((0, 0, 0, 1, 2))
+        } for m in range(months)]
+
+    def measure(label, build):
+        source = [make_rows() for _ in range(customers)]
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        data = build(source)
+        del source
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print(f"{label:>22}: {used / (customers * months):8.1f} 바이트/고객-월 (전체 {used / 2 ** 20:8.1f} MiB)")
+        return data
+
+    print(f"고객 {customers:,}명 × {months}개월")
+    # dict 목록은 원본 자체가 결과이므로 원본 생성부터 측정
+    tracemalloc.start()
+    rows = [make_rows() for _ in range(customers)]
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{'dict 목록 (기존)':>22}: {used / (customers * months):8.1f} 바이트/고객-월 (전체 {used / 2 ** 20:8.1f} MiB)")
+    del rows
+    measure("MonthlyCustomerData", lambda source: [[MonthlyCustomerData.model_validate(r) for r in c] for c in source])
+    measure("MonthlyRecords", lambda source: [MonthlyRecords(c) for c in source])
@@ -0,0 +1,258 @@
+import unicodedata
+from bisect import bisect_left
+from itertools import accumulate, chain
+import numpy as np
+
+# 한글 음절 분해 (유니코드 한글 음절 = 초성 19 × 중성 21 × 종성 28)
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 오타 허용 거리 (자모 단위 편집 거리, 음절 하나의 받침/모음 오타는 대부분 1)
+MAX_TYPO_DISTANCE = 1
+
+# 검색 결과 일치 유형 (순위 순)
+MATCH_TYPES = ("exact", "prefix", "initial", "fuzzy")
+
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def normalize_name(text):
+    """검색용 이름 정규화 (NFC 결합, 공백 제거, 소문자)"""
+    return "".join(unicodedata.normalize("NFC", text or "").split()).lower()
+
+
+def to_jamo(text):
+    """
+    한글 음절을 자모로 분해합니다. (예: 김민준 → ㄱㅣㅁㅁㅣㄴㅈㅜㄴ)
+
+    음절 중간까지만 입력한 검색어도 자모 단위로는 이름의 접두어가 됩니다.
+    """
+    out = []
+    for char in text:
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            out.append(CHOSEONG[code // 588])
+            out.append(JUNGSEONG[code % 588 // 28])
+            out.append(JONGSEONG[code % 28])
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def to_initials(text):
+    """한글 음절을 초성으로 바꿉니다. (예: 김민준 → ㄱㅁㅈ, 한글이 아닌 문자는 그대로)"""
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_BASE) // 588] if HANGUL_BASE <= ord(char) <= HANGUL_LAST else char
+        for char in text
+    )
+
+
+def is_initial_query(text):
+    """초성이 하나 이상 포함된 검색어인지 확인합니다. (예: ㄱㅁㅈ, 김ㅁㅈ)"""
+    return any(char in _CHOSEONG_SET for char in text)
+
+
+def _deletions(jamo):
+    """자모 하나를 지운 변형과 원문 (편집 거리 1 이내 후보를 찾는 열쇠)"""
+    return {jamo} | {jamo[:i] + jamo[i + 1:] for i in range(len(jamo))}
+
+
+def edit_distance(a, b, limit):
+    """
+    편집 거리를 계산합니다. limit를 넘는 것이 확실해지면 limit + 1을 반환합니다.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    고객 이름 검색 인덱스 (접두어, 초성, 오타 허용 검색)
+
+    같은 이름의 고객이 많으므로 서로 다른 이름만 색인하고 이름마다 고객 ID 목록을 둡니다.
+    - 접두어: 자모로 분해한 이름의 정렬 목록에서 이진 탐색
+    - 초성: 초성 문자열의 정렬 목록에서 이진 탐색
+    - 오타: 자모 하나를 지운 변형의 해시 정렬 배열에서 후보를 찾은 뒤 자모 편집 거리로 확인
+
+    정렬 순서별 고객 수 누적합을 두어 일치 고객 총수도 이름을 훑지 않고 계산합니다.
+    """
+
+    def __init__(self, customers):
+        """
+        Args:
+            customers: (고객 ID, 이름) 목록 - 같은 이름 안에서는 이 순서를 유지
+        """
+        position, names, ids = {}, [], []
+        for customer_id, name in customers:
+            key = normalize_name(name)
+            if not key:
+                continue
+            i = position.get(key)
+            if i is None:
+                i = position[key] = len(names)
+                names.append(name)
+                ids.append([])
+            ids[i].append(customer_id)
+
+        self._position = position
+        self._names = names
+        self._ids = ids
+        self._jamo = [to_jamo(key) for key in position]
+        self._lengths = np.array([len(jamo) for jamo in self._jamo], dtype=np.int32)
+        counts = [len(customer_ids) for customer_ids in ids]
+
+        self._jamo_order = sorted(range(len(names)), key=self._jamo.__getitem__)
+        self._jamo_keys = [self._jamo[i] for i in self._jamo_order]
+        self._jamo_totals = [0, *accumulate(counts[i] for i in self._jamo_order)]
+
+        initials = [to_initials(key) for key in position]
+        self._initial_order = sorted(range(len(names)), key=initials.__getitem__)
+        self._initial_keys = [initials[i] for i in self._initial_order]
+        self._initial_totals = [0, *accumulate(counts[i] for i in self._initial_order)]
+
+        # 편집 거리 1인 두 문자열은 자모 하나를 지운 변형(또는 원문)을 반드시 공유함
+        hashes, owners = [], []
+        for i, jamo in enumerate(self._jamo):
+            for variant in _deletions(jamo):
+                hashes.append(hash(variant))
+                owners.append(i)
+        hashes = np.array(hashes, dtype=np.int64)
+        order = np.argsort(hashes, kind="stable")
+        self._variant_hashes = hashes[order]
+        self._variant_owners = np.array(owners, dtype=np.int32)[order]
+
+    def __len__(self):
+        return sum(len(customer_ids) for customer_ids in self._ids)
+
+    @property
+    def distinct_names(self):
+        return len(self._names)
+
+    def exact(self, name):
+        """이름이 정확히 일치하는 고객 ID 목록"""
+        i = self._position.get(normalize_name(name))
+        return list(self._ids[i]) if i is not None else []
+
+    @staticmethod
+    def _prefix(keys, query):
+        """정렬된 키 목록에서 query로 시작하는 구간 [start, end)"""
+        start = bisect_left(keys, query)
+        return start, bisect_left(keys, query + "\uffff", start)
+
+    def _fuzzy(self, jamo):
+        """
+        자모 편집 거리가 MAX_TYPO_DISTANCE 이내인 이름을 [(거리, 이름 번호)]로 반환합니다. (접두어 일치 이름 제외)
+
+        검색어의 변형마다 해시 배열을 이진 탐색하므로 이름 수와 관계없이 검색어 길이만큼만 찾습니다.
+        """
+        keys = np.array([hash(variant) for variant in _deletions(jamo)], dtype=np.int64)
+        starts = np.searchsorted(self._variant_hashes, keys, side="left")
+        ends = np.searchsorted(self._variant_hashes, keys, side="right")
+        candidates = {i for start, end in zip(starts.tolist(), ends.tolist())
+                      for i in self._variant_owners[start:end].tolist()}
+
+        matches = []
+        for i in candidates:
+            if self._jamo[i].startswith(jamo):
+                continue
+            # 해시 충돌과 자리 바꿈(편집 거리 2)을 걸러냄
+            distance = edit_distance(jamo, self._jamo[i], MAX_TYPO_DISTANCE)
+            if distance <= MAX_TYPO_DISTANCE:
+                matches.append((distance, i))
+        # 같은 거리면 고객이 많은 (흔한) 이름 먼저
+        matches.sort(key=lambda m: (m[0], -len(self._ids[m[1]]), self._jamo[m[1]]))
+        return matches
+
+    def search(self, query, limit=20, fuzzy=True):
+        """
+        이름으로 고객을 검색하여 순위순으로 반환합니다.
+
+        순위: 정확히 일치 → 접두어 일치(자모 사전순) → 초성 일치 → 오타 허용 일치(편집 거리순)
+
+        Args:
+            query: 검색어 (예: 김민준, 김민, 김미, ㄱㅁㅈ, 김ㅁㅈ, 김민존)
+            limit: 최대 반환 고객 수
+            fuzzy: 오타 허용 검색 여부
+
+        Returns:
+            ([{"customer_id", "name", "match", "distance"}], 일치 고객 총수)
+        """
+        key = normalize_name(query)
+        if not key:
+            return [], 0
+
+        if is_initial_query(key):
+            start, end = self._prefix(self._initial_keys, to_initials(key))
+            names = self._initial_order[start:end]
+            fixed = [(pos, char) for pos, char in enumerate(key) if char not in _CHOSEONG_SET]
+            if fixed:
+                # 음절로 입력한 자리는 음절까지 일치해야 함 (예: 김ㅁㅈ)
+                names = [i for i in names
+                         if all(normalize_name(self._names[i])[pos] == char for pos, char in fixed)]
+                total = sum(len(self._ids[i]) for i in names)
+            else:
+                total = self._initial_totals[end] - self._initial_totals[start]
+            matched = (("initial", 0, i) for i in names)
+        else:
+            jamo = to_jamo(key)
+            start, end = self._prefix(self._jamo_keys, jamo)
+            total = self._jamo_totals[end] - self._jamo_totals[start]
+            fuzzy_matches = self._fuzzy(jamo) if fuzzy else []
+            total += sum(len(self._ids[i]) for _, i in fuzzy_matches)
+            matched = chain(
+                (("exact" if self._jamo[i] == jamo else "prefix", 0, i) for i in self._jamo_order[start:end]),
+                (("fuzzy", distance, i) for distance, i in fuzzy_matches)
+            )
+
+        # 앞 순위부터 필요한 만큼만 펼침
+        results = []
+        for match, distance, i in matched:
+            for customer_id in self._ids[i]:
+                if len(results) >= limit:
+                    return results, total
+                results.append({"customer_id": customer_id, "name": self._names[i], "match": match,
+                                "distance": distance})
+        return results, total
+
+
+if __name__ == "__main__":
+    # 100만 명 이름 인덱스의 생성 시간과 검색 지연 측정
+    import random
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    random.seed(0)
+    surnames = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부황보"
+    syllables = "민서준예도윤시우주원지호훈건현수연하은유진영재성태우동혁승희정아람빛나리혜경미선숙자순옥"
+    customers = [
+        (f"CUST{i:07d}", random.choice(surnames) + random.choice(syllables) + random.choice(syllables))
+        for i in range(count)
+    ]
+
+    started = time.perf_counter()
+    index = NameIndex(customers)
+    print(f"인덱스 생성: {time.perf_counter() - started:.2f}초, 고객 {len(index):,}명, 서로 다른 이름 {index.distinct_names:,}개")
+
+    for query in ("김민준", "김민", "김미", "박", "ㄱㅁㅈ", "김ㅁㅈ", "ㅊ", "김민존", "긴민준", "이서연", "김민즌"):
+        index.search(query)
+        repeat = 200
+        started = time.perf_counter()
+        for _ in range(repeat):
+            results, total = index.search(query)
+        elapsed = (time.perf_counter() - started) / repeat
+        top = results[0] if results else {}
+        print(f"{query:>6}: {elapsed * 1e6:8.1f} µs, 일치 {total:>7,}명, 1위 {top.get('name')} ({top.get('match')})")
@@ -0,0 +1,345 @@
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from app.utils.customer_store import DATA_DIR, get_store, write_json_atomic
+from app.utils.monthly_records import METRIC_FIELDS
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+# 포트폴리오 배열 세그먼트 저장 디렉토리
+PORTFOLIO_DIR = os.path.join(DATA_DIR, "portfolio")
+CURRENT_FILENAME = "current.json"
+LOCK_FILENAME = ".lock"
+
+# 교체 직후에도 이전 세그먼트를 읽는 워커가 있을 수 있으므로 보존할 세그먼트 수
+KEEP_SEGMENTS = 2
+
+# 세그먼트를 만들 때 한 번에 읽을 고객 수 (고객 파일을 직접 읽으므로 이 수만큼만 메모리에 올림)
+READ_BATCH = 5000
+
+# 이전 세대 이후 바뀐 고객이 전체의 이 비율 이하이면 바뀐 행만 다시 읽어 새 세대를 만듦
+PATCH_RATIO = 0.2
+
+
+class PortfolioSegment:
+    """
+    고객 × 월 × 항목 포트폴리오 배열 (읽기 전용 메모리 매핑)
+
+    Attributes:
+        generation: 세그먼트 세대 번호 (게시할 때마다 1씩 증가)
+        data_version: 세그먼트를 만든 저장소 데이터 버전
+        customer_ids: 행 순서의 고객 ID 목록
+        months: 열 순서의 월 (datetime64[M] 배열)
+        metrics: 항목 이름 목록 (METRIC_FIELDS)
+        values: float64 배열 (고객 수, 월 수, 항목 수), 데이터가 없는 월은 NaN
+        versions: 행 순서의 고객 데이터 버전 (int64 배열, 이전 형식 세그먼트는 None)
+    """
+
+    def __init__(self, path, pointer):
+        self.path = path
+        self.generation = pointer["generation"]
+        self.data_version = pointer["data_version"]
+        with open(os.path.join(path, "customers.json"), 'r', encoding='utf-8') as f:
+            self.customer_ids = json.load(f)
+        self.months = np.load(os.path.join(path, "months.npy"), mmap_mode='r')
+        self.values = np.load(os.path.join(path, "values.npy"), mmap_mode='r')
+        versions_path = os.path.join(path, "versions.npy")
+        self.versions = np.load(versions_path) if os.path.exists(versions_path) else None
+        self.metrics = list(METRIC_FIELDS)
+        self._rows = {customer_id: i for i, customer_id in enumerate(self.customer_ids)}
+
+    def customer_values(self, customer_id):
+        """고객 한 명의 (월 수, 항목 수) 배열 뷰를 반환합니다. (없으면 None)"""
+        row = self._rows.get(customer_id)
+        return None if row is None else self.values[row]
+
+    def select(self, customer_ids=None):
+        """
+        고객 ID 순서대로 행을 골라 반환합니다.
+
+        Returns:
+            (고객 ID 목록, (고객 수, 월 수, 항목 수) 배열)
+
+        Raises:
+            KeyError: 포트폴리오에 없는 고객 ID가 있는 경우
+        """
+        if customer_ids is None:
+            return list(self.customer_ids), self.values
+        rows = [self._rows.get(customer_id) for customer_id in customer_ids]
+        missing = [customer_id for customer_id, row in zip(customer_ids, rows) if row is None]
+        if missing:
+            raise KeyError(f"해당 고객 정보를 찾을 수 없습니다: {', '.join(missing[:10])}")
+        return list(customer_ids), self.values[rows]
+
+    def metric(self, field):
+        """항목 하나의 (고객 수, 월 수) 배열 뷰를 반환합니다."""
+        return self.values[:, :, METRIC_FIELDS.index(field)]
+
+    def latest(self):
+        """고객별 마지막 데이터 월의 (고객 수, 항목 수) 배열을 반환합니다."""
+        present = ~np.isnan(self.values[:, :, 0])
+        if not present.size:
+            return np.empty((0, len(METRIC_FIELDS)))
+        last = present.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)
+        latest = self.values[np.arange(len(self.customer_ids)), last]
+        latest[~present.any(axis=1)] = np.nan
+        return latest
+
+
+def _segment_path(generation):
+    return os.path.join(PORTFOLIO_DIR, f"gen_{generation}")
+
+
+def _current_path():
+    return os.path.join(PORTFOLIO_DIR, CURRENT_FILENAME)
+
+
+def _read_pointer():
+    try:
+        with open(_current_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _pointer_stamp():
+    try:
+        stat = os.stat(_current_path())
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _flatten(customers):
+    """
+    고객 데이터 목록을 행 단위 평면 배열로 변환합니다.
+
+    Returns:
+        (고객 순번 배열, 월 배열(datetime64[M]), 값 배열(행 수, 항목 수))
+    """
+    counts = [len(customer["monthly_data"]) for customer in customers]
+    rows = [row for customer in customers for row in customer["monthly_data"]]
+    order = np.repeat(np.arange(len(customers)), counts)
+    months = np.array([row["month"][:7] for row in rows], dtype="datetime64[M]")
+    values = np.array([[row.get(field) or 0 for field in METRIC_FIELDS] for row in rows],
+                      dtype=np.float64).reshape(len(rows), len(METRIC_FIELDS))
+    return order, months, values
+
+
+def _read_customers(store, customer_ids):
+    """
+    고객 파일과 샤드 로그를 READ_BATCH명씩 직접 읽어 평면 배열로 반환합니다.
+
+    store.read_customers를 사용하므로 워커의 고객 캐시를 채우지 않습니다.
+
+    Returns:
+        (읽은 고객 ID 목록, 고객 순번 배열, 월 배열, 값 배열)
+    """
+    found, parts = [], []
+    for start in range(0, len(customer_ids), READ_BATCH):
+        customers = store.read_customers(customer_ids[start:start + READ_BATCH])
+        order, months, values = _flatten(customers)
+        parts.append((order + len(found), months, values))
+        found += [customer["customer_id"] for customer in customers]
+    if not parts:
+        return found, *_flatten([])
+    return found, *(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+def _place(values, rows, axis, months, data):
+    """
+    평면 배열의 행을 포트폴리오 배열의 (고객, 월) 칸에 채웁니다.
+
+    같은 고객의 같은 달 데이터가 여러 건이면 마지막(가장 최근 날짜) 행만 사용합니다.
+    (저장소는 달마다 한 건만 받지만 이전에 저장된 데이터가 덮어써지는 순서를 명시적으로 보장)
+    """
+    if not len(rows):
+        return
+    last = np.r_[(rows[1:] != rows[:-1]) | (months[1:] != months[:-1]), True]
+    values[rows[last], np.searchsorted(axis, months[last])] = data[last]
+
+
+def build_portfolio_arrays(store=None):
+    """
+    저장소의 고객 데이터를 하나의 포트폴리오 배열로 합칩니다.
+
+    Returns:
+        (고객 ID 목록, 월 배열, 값 배열(고객 수, 월 수, 항목 수))
+    """
+    store = store or get_store()
+    customer_ids, rows, months, data = _read_customers(store, store.customer_ids())
+
+    # 고객마다 기록일이 달라도 같은 월끼리 정렬되도록 월 단위 축을 사용
+    axis = np.unique(months)
+    values = np.full((len(customer_ids), len(axis), len(METRIC_FIELDS)), np.nan)
+    _place(values, rows, axis, months, data)
+    return customer_ids, axis, values
+
+
+def patch_portfolio_arrays(previous, changed_ids, store=None):
+    """
+    이전 세그먼트 배열을 복사한 뒤 바뀐 고객의 행만 다시 읽어 채웁니다.
+
+    Args:
+        previous: 이전 세대 PortfolioSegment
+        changed_ids: 이전 세대 이후 추가되거나 데이터가 바뀐 고객 ID 목록
+
+    Returns:
+        (고객 ID 목록, 월 배열, 값 배열) - 새 고객은 끝에 추가
+    """
+    store = store or get_store()
+    read_ids, rows, months, data = _read_customers(store, changed_ids)
+
+    customer_ids = list(previous.customer_ids)
+    positions = dict(previous._rows)
+    for customer_id in read_ids:
+        if customer_id not in positions:
+            positions[customer_id] = len(customer_ids)
+            customer_ids.append(customer_id)
+
+    axis = np.union1d(previous.months, months)
+    values = np.full((len(customer_ids), len(axis), len(METRIC_FIELDS)), np.nan)
+    values[:len(previous.customer_ids), np.searchsorted(axis, previous.months)] = previous.values
+
+    targets = np.array([positions[customer_id] for customer_id in read_ids], dtype=np.int64)
+    values[targets] = np.nan
+    _place(values, targets[rows], axis, months, data)
+    return customer_ids, axis, values
+
+
+def _previous_segment(pointer, store_generation):
+    """같은 저장소 세대로 만든 현재 세그먼트를 반환합니다. (바뀐 행만 갱신할 수 없으면 None)"""
+    if not pointer or pointer.get("store_generation") != store_generation:
+        return None
+    path = _segment_path(pointer["generation"])
+    if not os.path.isdir(path):
+        return None
+    segment = PortfolioSegment(path, pointer)
+    return segment if segment.versions is not None else None
+
+
+def publish_portfolio(store=None, force=False):
+    """
+    현재 저장소 데이터로 새 세그먼트를 만들고 세대 번호를 올려 원자적으로 교체합니다.
+
+    여러 워커가 동시에 호출해도 파일 잠금으로 한 번만 생성합니다.
+    이전 세대 이후 바뀐 고객이 적으면(PATCH_RATIO 이하) 이전 배열에 그 고객의 행만 다시 채우므로
+    월별 데이터 한 건을 추가해도 전체 고객을 다시 읽지 않습니다.
+    고객 데이터는 파일에서 직접 읽어 워커의 고객 캐시를 채우지 않습니다.
+
+    Args:
+        store: 고객 저장소 (기본값: 전역 저장소)
+        force: 데이터 버전이 같아도 전체를 다시 생성할지 여부
+
+    Returns:
+        게시된 세그먼트 정보 {"generation", "data_version", ...}
+    """
+    store = store or get_store()
+    os.makedirs(PORTFOLIO_DIR, exist_ok=True)
+    with open(os.path.join(PORTFOLIO_DIR, LOCK_FILENAME), 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            data_version, store_generation, versions = store.customer_versions()
+            pointer = _read_pointer()
+            if pointer and pointer["data_version"] == data_version and not force:
+                return pointer
+
+            previous = None if force else _previous_segment(pointer, store_generation)
+            changed = None
+            if previous is not None:
+                previous_versions = dict(zip(previous.customer_ids, previous.versions.tolist()))
+                changed = [cid for cid, version in versions.items() if previous_versions.get(cid) != version]
+            if changed is not None and len(changed) <= len(versions) * PATCH_RATIO:
+                customer_ids, months, values = patch_portfolio_arrays(previous, changed, store)
+                mode = "patch"
+            else:
+                customer_ids, months, values = build_portfolio_arrays(store)
+                mode = "full"
+            generation = (pointer["generation"] if pointer else 0) + 1
+
+            # 임시 디렉토리에 모두 쓴 뒤 이름을 바꿔 부분 기록된 세그먼트가 보이지 않도록 함
+            path = _segment_path(generation)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            np.save(os.path.join(tmp_path, "months.npy"), months)
+            np.save(os.path.join(tmp_path, "values.npy"), values)
+            np.save(os.path.join(tmp_path, "versions.npy"),
+                    np.array([versions.get(cid, -1) for cid in customer_ids], dtype=np.int64))
+            with open(os.path.join(tmp_path, "customers.json"), 'w', encoding='utf-8') as f:
+                json.dump(customer_ids, f, ensure_ascii=False)
+            shutil.rmtree(path, ignore_errors=True)
+            os.rename(tmp_path, path)
+
+            pointer = {
+                "generation": generation,
+                "data_version": data_version,
+                "store_generation": store_generation,
+                "build": mode,
+                "changed_customers": len(changed) if mode == "patch" else len(customer_ids),
+                "customers": len(customer_ids),
+                "months": len(months),
+                "metrics": list(METRIC_FIELDS)
+            }
+            write_json_atomic(_current_path(), pointer)
+            _remove_old_segments(generation)
+            return pointer
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _remove_old_segments(generation):
+    """보존 개수를 넘는 이전 세대 세그먼트를 삭제합니다. (이미 매핑한 워커는 계속 읽을 수 있음)"""
+    for name in os.listdir(PORTFOLIO_DIR):
+        if not name.startswith("gen_") or name.endswith(".tmp"):
+            continue
+        try:
+            old_generation = int(name[len("gen_"):])
+        except ValueError:
+            continue
+        if old_generation <= generation - KEEP_SEGMENTS:
+            shutil.rmtree(os.path.join(PORTFOLIO_DIR, name), ignore_errors=True)
+
+
+_segment = None
+_segment_stamp = None
+_segment_lock = threading.Lock()
+
+
+def get_portfolio(store=None):
+    """
+    현재 세대의 포트폴리오 세그먼트를 읽기 전용으로 연결하여 반환합니다.
+
+    세그먼트가 없거나 저장소 데이터가 바뀌었으면 먼저 게시하고,
+    다른 워커가 새 세대를 게시했으면 새 세그먼트로 교체합니다.
+    이전 세그먼트를 참조 중인 요청은 그대로 이전 배열을 사용합니다.
+
+    Returns:
+        PortfolioSegment
+    """
+    global _segment, _segment_stamp
+    store = store or get_store()
+    version = store.data_version()
+    data_version = version[0] if version else None
+
+    segment = _segment
+    if segment is not None and segment.data_version == data_version and _pointer_stamp() == _segment_stamp:
+        return segment
+
+    with _segment_lock:
+        pointer = _read_pointer()
+        if pointer is None or pointer["data_version"] != data_version:
+            publish_portfolio(store)
+        stamp = _pointer_stamp()
+        if _segment is None or stamp != _segment_stamp:
+            pointer = _read_pointer()
+            _segment = PortfolioSegment(_segment_path(pointer["generation"]), pointer)
+            _segment_stamp = stamp
+        return _segment
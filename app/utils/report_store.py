@@ -0,0 +1,124 @@
+import hashlib
+import os
+import shutil
+from app.utils.shared_cache import get_shared_cache
+
+# 보고서 저장 디렉토리 설정
+REPORTS_DIR = "reports"
+
+# 내용 해시로 저장되는 실제 PDF 파일 디렉토리 (보고서 키 파일은 여기로 하드 링크)
+BLOBS_DIR = os.path.join(REPORTS_DIR, "blobs")
+
+# 보고서 재사용 지표 카운터 접두어 (워커 간 공유)
+COUNTER_PREFIX = "report_stats:"
+
+
+def _count(name, amount=1):
+    get_shared_cache().incr(COUNTER_PREFIX + name, amount)
+
+
+def _blob_path(digest):
+    return os.path.join(BLOBS_DIR, digest[:2], f"{digest}.pdf")
+
+
+def _file_digest(filepath):
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def find_report(filename):
+    """
+    이미 생성된 보고서가 있으면 경로를 반환하고 재사용 횟수를 기록합니다.
+
+    Returns:
+        보고서 경로 (없으면 None)
+    """
+    if os.path.exists(filename):
+        _count("hits")
+        return filename
+    return None
+
+
+def record_not_modified():
+    """클라이언트 캐시 검증(304)으로 보고서 전송을 생략한 횟수를 기록합니다."""
+    _count("not_modified")
+
+
+def publish_report(tmp_filename, filename):
+    """
+    생성한 PDF를 내용 해시 저장소에 넣고 보고서 경로에 하드 링크합니다.
+
+    입력이 달라도 결과 PDF가 같으면 실제 파일은 하나만 저장됩니다.
+
+    Args:
+        tmp_filename: 생성이 끝난 임시 PDF 경로
+        filename: 보고서 경로 (보고서 키 기반 이름)
+
+    Returns:
+        보고서 경로
+    """
+    digest = _file_digest(tmp_filename)
+    blob = _blob_path(digest)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+
+    size = os.path.getsize(tmp_filename)
+    if os.path.exists(blob):
+        os.remove(tmp_filename)
+        _count("deduplicated")
+    else:
+        os.replace(tmp_filename, blob)
+        _count("stored_bytes", size)
+
+    # 임시 링크를 만든 뒤 교체하여 다른 워커가 부분 상태를 보지 않도록 함
+    link_tmp = f"{filename}.{os.getpid()}.link"
+    try:
+        os.link(blob, link_tmp)
+    except OSError:
+        # 하드 링크를 지원하지 않는 파일 시스템에서는 복사
+        shutil.copyfile(blob, link_tmp)
+    os.replace(link_tmp, filename)
+
+    _count("misses")
+    _count("generated_bytes", size)
+    return filename
+
+
+def storage_stats():
+    """
+    보고서 저장 용량과 재사용 비율을 반환합니다.
+
+    Returns:
+        {"reports", "blobs", "logical_bytes", "physical_bytes", "saved_bytes", "hits", "misses", "hit_rate", ...}
+    """
+    reports, logical = 0, 0
+    seen_inodes, physical = set(), 0
+    for root, _, files in os.walk(REPORTS_DIR):
+        for name in files:
+            if not name.endswith(".pdf"):
+                continue
+            stat = os.stat(os.path.join(root, name))
+            if os.path.commonpath([root, BLOBS_DIR]) != BLOBS_DIR:
+                reports += 1
+                logical += stat.st_size
+            if stat.st_ino not in seen_inodes:
+                seen_inodes.add(stat.st_ino)
+                physical += stat.st_size
+
+    counters = get_shared_cache().counters(COUNTER_PREFIX)
+    hits = counters.get("hits", 0) + counters.get("not_modified", 0)
+    misses = counters.get("misses", 0)
+    return {
+        "reports": reports,
+        "blobs": len(seen_inodes),
+        "logical_bytes": logical,
+        "physical_bytes": physical,
+        "saved_bytes": logical - physical if logical > physical else 0,
+        "hits": counters.get("hits", 0),
+        "not_modified": counters.get("not_modified", 0),
+        "misses": misses,
+        "deduplicated": counters.get("deduplicated", 0),
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0
+    }
@@ -0,0 +1,13 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjson으로 직렬화하는 JSON 응답 클래스
+
+    표준 json 모듈보다 빠르며, numpy 배열/스칼라와 datetime도 바로 직렬화합니다.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
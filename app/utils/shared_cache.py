@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import threading
+import time
+import orjson
+
+# 여러 워커 프로세스가 함께 쓰는 캐시 파일 (Redis 없이 로컬 SQLite 사용)
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", os.path.join("data", "shared_cache.sqlite3"))
+
+# 기본 캐시 유지 시간(초)
+DEFAULT_TTL = 24 * 3600
+
+# 프로세스마다 이 횟수만큼 쓸 때마다 만료된 항목을 정리 (파일이 끝없이 커지지 않도록 함)
+PURGE_EVERY_WRITES = 1000
+
+
+class SharedCache:
+    """
+    워커 프로세스 간 공유 캐시 (SQLite WAL 모드)
+
+    연결은 프로세스/스레드마다 따로 열어 fork(preload) 이후에도 안전하게 사용합니다.
+    키에 데이터 버전을 포함하면 별도의 무효화 없이 워커 간 일관성이 유지됩니다.
+    만료된 항목은 PURGE_EVERY_WRITES번 쓸 때마다 삭제합니다.
+    """
+
+    def __init__(self, path=SHARED_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.purged = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_bytes(self, key):
+        """캐시된 바이트 값을 반환합니다. (없거나 만료되면 None)"""
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set_bytes(self, key, value, ttl=DEFAULT_TTL):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(value), time.time() + ttl)
+        )
+        self.writes += 1
+        if self.writes % PURGE_EVERY_WRITES == 0:
+            self.purge_expired()
+
+    def get_json(self, key):
+        value = self.get_bytes(key)
+        return orjson.loads(value) if value is not None else None
+
+    def set_json(self, key, value, ttl=DEFAULT_TTL):
+        self.set_bytes(key, orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY), ttl)
+
+    def incr(self, key, amount=1):
+        """정수 카운터를 원자적으로 증가시킵니다. (만료 없음)"""
+        self._conn().execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, amount, float("inf"))
+        )
+
+    def counters(self, prefix):
+        """접두어로 시작하는 카운터를 {이름: 값}으로 반환합니다."""
+        rows = self._conn().execute(
+            "SELECT key, value FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+        ).fetchall()
+        return {key[len(prefix):]: int(value) for key, value in rows}
+
+    def delete_prefix(self, prefix):
+        """접두어로 시작하는 키를 모두 삭제합니다."""
+        self._conn().execute("DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff"))
+
+    def purge_expired(self):
+        """만료된 항목을 정리하고 삭제한 항목 수를 반환합니다."""
+        deleted = self._conn().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+        self.purged += deleted
+        return deleted
+
+    def stats(self):
+        row = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()
+        return {"entries": row[0], "bytes": row[1], "hits": self.hits, "misses": self.misses,
+                "purged": self.purged}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """프로세스 전역 공유 캐시를 반환합니다."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SharedCache()
+    return _cache
@@ -0,0 +1,273 @@
+import re
+from reportlab.pdfbase import pdfmetrics
+from reportlab.lib.units import cm
+
+# 줄 첫머리에 올 수 없는 문자 (닫는 부호, 문장 부호)
+NO_LINE_START = frozenset(".,!?:;)]}%·…”’」』〉》")
+
+# 제목 수준별 글자 크기 배율
+HEADING_SCALE = {1: 1.4, 2: 1.25, 3: 1.1}
+
+# 목록 들여쓰기 (본문 글자 크기 배수, 중첩 한 단계당)
+LIST_INDENT = 1.5
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET_RE = re.compile(r"^(\s*)[-*•·]\s+(.*)$")
+_NUMBERED_RE = re.compile(r"^(\s*)(\d+[.)])\s+(.*)$")
+_INLINE_RE = re.compile(r"\*\*|__|`")
+
+# 단어 너비 캐시 최대 항목 수 (대량 보고서에서도 메모리가 무한히 늘지 않도록 제한)
+WORD_CACHE_SIZE = 100_000
+
+
+class GlyphWidths:
+    """
+    글꼴별 글자/단어 너비 캐시 (글자 크기 1pt 기준)
+
+    pdfmetrics.stringWidth를 글자마다 한 번만 호출하고,
+    같은 단어는 캐시된 너비를 재사용합니다.
+    """
+
+    def __init__(self, font_name):
+        self.font_name = font_name
+        self._glyphs = {}
+        self._words = {}
+
+    def char(self, ch):
+        width = self._glyphs.get(ch)
+        if width is None:
+            width = pdfmetrics.stringWidth(ch, self.font_name, 1.0)
+            self._glyphs[ch] = width
+        return width
+
+    def text(self, text):
+        width = self._words.get(text)
+        if width is None:
+            glyphs = self._glyphs
+            width = 0.0
+            for ch in text:
+                w = glyphs.get(ch)
+                width += w if w is not None else self.char(ch)
+            if len(self._words) < WORD_CACHE_SIZE:
+                self._words[text] = width
+        return width
+
+
+_widths = {}
+
+
+def get_glyph_widths(font_name):
+    """글꼴의 너비 캐시를 반환합니다."""
+    widths = _widths.get(font_name)
+    if widths is None:
+        widths = _widths[font_name] = GlyphWidths(font_name)
+    return widths
+
+
+def _break_word(word, max_width, widths, font_size):
+    """
+    한 줄보다 긴 단어를 글자 단위로 나눕니다. (한글은 음절 사이에서 줄바꿈 가능)
+
+    줄 첫머리 금칙 문자는 앞 줄 끝에 붙입니다.
+    """
+    pieces, start, line_width = [], 0, 0.0
+    for i, ch in enumerate(word):
+        w = widths.char(ch) * font_size
+        if i > start and line_width + w > max_width and ch not in NO_LINE_START:
+            pieces.append(word[start:i])
+            start, line_width = i, 0.0
+        line_width += w
+    pieces.append(word[start:])
+    return pieces
+
+
+def wrap_text(text, max_width, font_name, font_size):
+    """
+    글자 너비를 실측하여 텍스트를 줄 단위로 나눕니다.
+
+    어절(공백) 단위로 채우고, 한 줄에 들어가지 않는 어절만 음절 단위로 나눕니다.
+
+    Args:
+        text: 한 문단 텍스트
+        max_width: 줄 최대 너비(pt)
+        font_name: 글꼴 이름
+        font_size: 글자 크기
+
+    Returns:
+        줄 목록
+    """
+    widths = get_glyph_widths(font_name)
+    space = widths.char(" ") * font_size
+    lines, current, current_width = [], [], 0.0
+
+    for word in text.split():
+        w = widths.text(word) * font_size
+        if current and current_width + space + w <= max_width:
+            current.append(word)
+            current_width += space + w
+            continue
+
+        if current:
+            lines.append(" ".join(current))
+        if w <= max_width:
+            current, current_width = [word], w
+            continue
+
+        pieces = _break_word(word, max_width, widths, font_size)
+        lines.extend(pieces[:-1])
+        current, current_width = [pieces[-1]], widths.text(pieces[-1]) * font_size
+
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def parse_blocks(text):
+    """
+    LLM 응답의 마크다운 형식 줄을 블록으로 나눕니다.
+
+    Returns:
+        [(종류, 수준, 목록 기호, 텍스트)] 목록
+        종류: heading, bullet, numbered, paragraph, blank
+    """
+    blocks = []
+    for raw in (text or "").splitlines():
+        if not raw.strip():
+            if blocks and blocks[-1][0] != "blank":
+                blocks.append(("blank", 0, None, ""))
+            continue
+
+        match = _HEADING_RE.match(raw.strip())
+        if match:
+            blocks.append(("heading", min(len(match.group(1)), 3), None, _INLINE_RE.sub("", match.group(2))))
+            continue
+
+        match = _BULLET_RE.match(raw)
+        if match:
+            level = len(match.group(1).expandtabs(4)) // 2
+            blocks.append(("bullet", level, "•", _INLINE_RE.sub("", match.group(2))))
+            continue
+
+        match = _NUMBERED_RE.match(raw)
+        if match:
+            level = len(match.group(1).expandtabs(4)) // 2
+            blocks.append(("numbered", level, match.group(2), _INLINE_RE.sub("", match.group(3))))
+            continue
+
+        blocks.append(("paragraph", 0, None, _INLINE_RE.sub("", raw.strip())))
+    return blocks
+
+
+class TextFlow:
+    """
+    여러 페이지에 걸쳐 텍스트를 배치하는 흐름 레이아웃
+
+    아래 여백에 닿으면 새 페이지를 추가하고 위쪽 여백부터 이어서 그립니다.
+    페이지마다 한 번의 텍스트 객체로 모아서 그립니다.
+
+    Args:
+        c: reportlab Canvas
+        x: 왼쪽 시작 위치
+        y: 첫 줄 기준선 위치
+        width: 본문 너비
+        font_name: 글꼴 이름
+        font_size: 본문 글자 크기
+        leading: 줄 간격 (기본값: 글자 크기의 1.5배)
+        top: 이어지는 페이지의 첫 줄 위치 (기본값: 페이지 높이 - 2cm)
+        bottom: 아래 여백 위치
+        on_new_page: 새 페이지를 시작할 때 호출할 함수 (머리말 등, Canvas를 인자로 받음)
+    """
+
+    def __init__(self, c, x, y, width, font_name, font_size=10, leading=None, top=None, bottom=2*cm,
+                 on_new_page=None):
+        self.c = c
+        self.x = x
+        self.y = y
+        self.width = width
+        self.font_name = font_name
+        self.font_size = font_size
+        self.leading = leading or font_size * 1.5
+        self.top = top if top is not None else c._pagesize[1] - 2*cm
+        self.bottom = bottom
+        self.on_new_page = on_new_page
+        self.pages = 1
+        self._text = None
+        self._size = None
+
+    def _begin(self):
+        if self._text is None:
+            self._text = self.c.beginText()
+            self._size = None
+
+    def flush(self):
+        """현재 페이지에 모은 텍스트를 그립니다."""
+        if self._text is not None:
+            self.c.drawText(self._text)
+            self._text = None
+
+    def new_page(self):
+        self.flush()
+        self.c.showPage()
+        self.pages += 1
+        if self.on_new_page:
+            self.on_new_page(self.c)
+        self.y = self.top
+
+    def _line(self, x, text, size, leading):
+        if self.y < self.bottom:
+            self.new_page()
+        self._begin()
+        if self._size != size:
+            self._text.setFont(self.font_name, size, leading)
+            self._size = size
+        self._text.setTextOrigin(x, self.y)
+        self._text.textOut(text)
+        self.y -= leading
+
+    def add(self, text):
+        """
+        마크다운 형식 텍스트(제목, 목록, 문단)를 배치합니다.
+
+        Returns:
+            마지막 줄 아래의 y 위치
+        """
+        size, leading = self.font_size, self.leading
+        widths = get_glyph_widths(self.font_name)
+
+        for kind, level, marker, body in parse_blocks(text):
+            if kind == "blank":
+                self.y -= leading * 0.5
+                continue
+
+            if kind == "heading":
+                heading_size = size * HEADING_SCALE[level]
+                heading_leading = leading * HEADING_SCALE[level]
+                lines = wrap_text(body, self.width, self.font_name, heading_size)
+                # 제목만 페이지 끝에 남지 않도록 다음 본문 한 줄 공간까지 확인
+                if self.y - heading_leading * (len(lines) + 0.3) - leading < self.bottom:
+                    self.new_page()
+                elif self.y < self.top:
+                    self.y -= heading_leading * 0.3
+                for line in lines:
+                    self._line(self.x, line, heading_size, heading_leading)
+                continue
+
+            if kind in ("bullet", "numbered"):
+                indent = size * LIST_INDENT * level
+                marker_width = max(widths.text(marker + " ") * size, size * LIST_INDENT)
+                lines = wrap_text(body, self.width - indent - marker_width, self.font_name, size)
+                for i, line in enumerate(lines):
+                    if i == 0:
+                        self._line(self.x + indent, marker, size, 0)
+                    self._line(self.x + indent + marker_width, line, size, leading)
+                continue
+
+            for line in wrap_text(body, self.width, self.font_name, size):
+                self._line(self.x, line, size, leading)
+
+        return self.y
+
+    def finish(self):
+        """남은 텍스트를 그리고 마지막 y 위치를 반환합니다."""
+        self.flush()
+        return self.y
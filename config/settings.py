@@ -6,4 +6,17 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 if not OPENAI_API_KEY:
-    raise ValueError("ERROR: OPENAI_API_KEY가 설정되지 않았습니다! `.env` 파일을 확인하세요.")
\ No newline at end of file
+    raise ValueError("ERROR: OPENAI_API_KEY가 설정되지 않았습니다! `.env` 파일을 확인하세요.")
+
+# OpenAI 요청 한도 (API 키 등급에 맞게 설정)
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+
+# 여러 워커 프로세스가 한도를 공유할 SQLite 파일 (비우면 프로세스 단위로 제한)
+LLM_SCHEDULER_DB = os.getenv("LLM_SCHEDULER_DB")
+
+# 보고서 차트 형식 (vector: PDF 벡터 그래픽, png: 래스터 이미지)
+REPORT_CHART_FORMAT = os.getenv("REPORT_CHART_FORMAT", "vector")
+
+# 의미 캐시: 이 유사도(0~1) 이상인 이전 질문의 답변을 LLM 호출 없이 재사용
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.8"))
@@ -0,0 +1,29 @@
+import multiprocessing
+import os
+
+# 멀티 프로세스 실행 설정: gunicorn app.main:app -c gunicorn.conf.py
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# 워커 수 (기본값: CPU 코어 수, 차트/PDF 생성 같은 CPU 작업을 코어별로 분산)
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# 앱을 마스터에서 한 번 로드한 뒤 fork하여 메모리를 공유 (SQLite 연결은 워커별로 지연 생성)
+preload_app = True
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# LLM 요청 한도를 워커 간에 공유하도록 스케줄러 버킷 파일 기본값 지정
+os.environ.setdefault("LLM_SCHEDULER_DB", os.path.join("data", "llm_scheduler.sqlite3"))
+os.makedirs("data", exist_ok=True)
+
+
+def when_ready(server):
+    # 워커를 띄우기 전에 포트폴리오 배열 세그먼트를 한 번 게시 (워커는 읽기 전용으로 연결)
+    from app.utils.portfolio_arrays import publish_portfolio
+    from app.utils.shared_cache import get_shared_cache
+    publish_portfolio()
+    # 이전 실행에서 남은 만료 항목 정리 (실행 중에는 워커가 쓰기 횟수마다 정리)
+    get_shared_cache().purge_expired()
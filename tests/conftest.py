@@ -0,0 +1,80 @@
+import os
+import random
+
+# config.settings는 API 키가 없으면 가져오기 단계에서 실패하므로 테스트용 값을 먼저 설정 (실제 호출은 하지 않음)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from types import SimpleNamespace
+import orjson
+import pytest
+import app.utils.customer_store as customer_store
+import app.utils.portfolio_arrays as portfolio_arrays
+import app.utils.shared_cache as shared_cache
+import app.services.anomaly_detector as anomaly_detector
+import app.services.credit_scorer as credit_scorer
+import app.services.llm_gateway as llm_gateway
+from app.utils.data_generator import generate_multiple_customers
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    데이터 디렉토리가 비어 있는 임시 작업 디렉토리에서 실행합니다.
+
+    저장 경로가 모두 작업 디렉토리 기준 상대 경로(data/...)이므로 작업 디렉토리를 옮기고
+    프로세스 전역 저장소/캐시/세그먼트를 비워 테스트마다 새로 만들도록 합니다.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports")
+    monkeypatch.setattr(customer_store, "_store", None)
+    monkeypatch.setattr(portfolio_arrays, "_segment", None)
+    monkeypatch.setattr(portfolio_arrays, "_segment_stamp", None)
+    monkeypatch.setattr(shared_cache, "_cache", None)
+    monkeypatch.setattr(anomaly_detector, "_detector", None)
+    monkeypatch.setattr(anomaly_detector, "_detector_generation", None)
+    monkeypatch.setattr(credit_scorer, "_loaded", None)
+    return tmp_path
+
+
+@pytest.fixture
+def store(workdir):
+    """생성 데이터 30명으로 채운 고객 저장소"""
+    random.seed(7)
+    customer_store.get_store().replace_all(generate_multiple_customers(30))
+    return customer_store.get_store()
+
+
+def fill_schema(schema):
+    """JSON 스키마를 만족하는 가장 단순한 값을 만듭니다."""
+    if schema["type"] == "object":
+        return {name: fill_schema(child) for name, child in schema["properties"].items()}
+    if schema["type"] == "array":
+        return [fill_schema(schema["items"])]
+    return schema.get("enum", ["테스트 응답"])[0]
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    LLM 게이트웨이의 OpenAI 클라이언트를 요청을 기록하는 가짜 클라이언트로 바꿉니다.
+
+    구조화 출력 요청에는 스키마를 채운 JSON을, 자유 형식 요청에는 고정 문장을 응답합니다.
+
+    Returns:
+        호출 인자 목록
+    """
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        response_format = kwargs.get("response_format")
+        if response_format:
+            content = orjson.dumps(fill_schema(response_format["json_schema"]["schema"])).decode("utf-8")
+        else:
+            content = "테스트 분석 결과입니다."
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=10, total_tokens=20)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return calls
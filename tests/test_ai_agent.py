@@ -0,0 +1,103 @@
+import json
+import orjson
+import pytest
+from app.services import batch_analysis
+from app.services.ai_analyzer import decision_key
+from app.services.analysis_schemas import ANALYSIS_SCHEMAS
+from app.services.batch_analysis import LocalBatchClient, build_batch_requests, collect_batch, run_batch
+from app.services.credit_scorer import BAND_DECISIONS, model_version
+from app.utils.analysis_store import get_analyses
+
+
+def fill_schema(schema):
+    """JSON 스키마를 만족하는 가장 단순한 값을 만듭니다."""
+    if schema["type"] == "object":
+        return {name: fill_schema(child) for name, child in schema["properties"].items()}
+    if schema["type"] == "array":
+        return [fill_schema(schema["items"])]
+    return schema.get("enum", ["테스트 응답"])[0]
+
+
+def schema_responder(body):
+    """요청의 response_format 스키마대로 응답하는 LocalBatchClient 응답 함수"""
+    return orjson.dumps(fill_schema(body["response_format"]["json_schema"]["schema"])).decode("utf-8")
+
+
+ANALYSIS_TYPES = ["credit_trend", "financial_products", "credit_decision"]
+
+
+def test_build_batch_requests_uses_structured_output(store):
+    customer_ids = store.customer_ids()[:2]
+    requests, versions, skipped, scores = build_batch_requests(customer_ids, ANALYSIS_TYPES)
+
+    assert not skipped
+    assert [r["custom_id"] for r in requests] == [f"{c}:{t}" for c in customer_ids for t in ANALYSIS_TYPES]
+    for request in requests:
+        analysis_type = request["custom_id"].split(":", 1)[1]
+        assert request["url"] == "/v1/chat/completions"
+        assert request["body"]["response_format"]["json_schema"]["name"] == analysis_type
+        assert versions[request["custom_id"]] == store.data_version(request["custom_id"].split(":")[0])[0]
+    # 대출 심사 의견은 모델 결과를 함께 보관
+    assert set(scores) == {f"{c}:credit_decision" for c in customer_ids}
+
+
+def test_batch_round_trip_writes_analysis_store(store):
+    customer_ids = store.customer_ids()[:3]
+    client = LocalBatchClient(schema_responder)
+
+    summary = run_batch(customer_ids, ANALYSIS_TYPES, batch_client=client, poll_interval=0)
+
+    assert summary["status"] == "completed"
+    assert summary["requests"] == summary["saved"] == len(customer_ids) * len(ANALYSIS_TYPES)
+    assert summary["failed"] == []
+
+    # 제출한 JSONL 파일은 요청마다 한 줄
+    with open(batch_analysis._job_path(summary["batch_id"]), encoding="utf-8") as f:
+        job = json.load(f)
+    with open(job["input_file"], encoding="utf-8") as f:
+        assert len([line for line in f if line.strip()]) == summary["requests"]
+
+    key = decision_key(model_version())
+    for customer_id in customer_ids:
+        analyses = get_analyses(customer_id)
+        assert set(analyses) == {"credit_trend", "financial_products", key}
+        for record in analyses.values():
+            assert record["source"] == "batch"
+            assert record["data_version"] == store.data_version(customer_id)[0]
+
+        assert analyses["credit_trend"]["result"] == fill_schema(ANALYSIS_SCHEMAS["credit_trend"])
+        decision = analyses[key]["result"]
+        assert decision["reasons"] == ["테스트 응답"]
+        assert decision["decision"] in BAND_DECISIONS.values()
+        assert decision["model_version"] == model_version()
+        assert 0 <= decision["approval_probability"] <= 1
+
+
+def test_collect_batch_reports_failed_requests(store):
+    customer_ids = store.customer_ids()[:2]
+    calls = []
+
+    def responder(body):
+        # 요청 순서: 고객 0 추세, 고객 0 상품, 고객 1 추세, 고객 1 상품
+        calls.append(body)
+        if body["response_format"]["json_schema"]["name"] == "financial_products":
+            return "JSON이 아닌 응답"
+        if len(calls) == 3:
+            raise RuntimeError("upstream error")
+        return schema_responder(body)
+
+    client = LocalBatchClient(responder)
+    job = batch_analysis.submit_batch(customer_ids, ["credit_trend", "financial_products"], client)
+    result = collect_batch(job["batch_id"], client)
+
+    failed = {item["custom_id"] for item in result["failed"]}
+    assert failed == {f"{customer_ids[0]}:financial_products",
+                      f"{customer_ids[1]}:credit_trend", f"{customer_ids[1]}:financial_products"}
+    assert result["saved"] == 1
+    assert set(get_analyses(customer_ids[0])) == {"credit_trend"}
+    assert get_analyses(customer_ids[1]) == {}
+
+
+def test_build_batch_requests_rejects_unknown_type(store):
+    with pytest.raises(ValueError):
+        build_batch_requests(store.customer_ids()[:1], ["unknown"])
@@ -0,0 +1,79 @@
+import orjson
+import pytest
+from app.services.analysis_schemas import (
+    ANALYSIS_SCHEMAS, analysis_key, parse_analysis, render_analysis, response_format, select_fields
+)
+
+TREND = {
+    "summary": "신용 점수가 꾸준히 올랐습니다.",
+    "trend": "개선",
+    "strengths": ["연체 없음"],
+    "weaknesses": ["높은 부채"],
+    "advice": ["부채 상환"],
+    "loan_products": ["신용 대출"]
+}
+
+
+def test_parse_analysis_accepts_schema_fields():
+    assert parse_analysis("credit_trend", orjson.dumps(TREND)) == TREND
+
+
+@pytest.mark.parametrize("content", [
+    "JSON이 아닌 응답",
+    None,
+    orjson.dumps({**TREND, "trend": "급등"}),
+    orjson.dumps({**TREND, "extra": "추가 필드"}),
+    orjson.dumps({k: v for k, v in TREND.items() if k != "advice"}),
+    orjson.dumps({**TREND, "strengths": "목록이 아님"}),
+    orjson.dumps({**TREND, "advice": [1]}),
+])
+def test_parse_analysis_rejects_invalid_content(content):
+    with pytest.raises(ValueError):
+        parse_analysis("credit_trend", content)
+
+
+def test_response_format_is_strict_schema():
+    fmt = response_format("financial_products")
+    assert fmt["json_schema"]["strict"] is True
+    assert fmt["json_schema"]["schema"] is ANALYSIS_SCHEMAS["financial_products"]
+    # strict 모드는 모든 객체의 모든 속성이 필수
+    loans = ANALYSIS_SCHEMAS["financial_products"]["properties"]["loans"]["items"]
+    assert loans["required"] == list(loans["properties"]) and loans["additionalProperties"] is False
+
+
+def test_render_analysis_markdown():
+    text = render_analysis("credit_trend", TREND)
+    assert text.splitlines()[:2] == ["## 신용도 추세 분석", "신용 점수가 꾸준히 올랐습니다. (추세: 개선)"]
+    assert "### 개선 조언\n- 부채 상환" in text
+
+    products = render_analysis("financial_products", {
+        "loans": [{"name": "햇살론", "reason": "저신용자 대상", "rate": "연 8%", "limit": "1천만원"}],
+        "savings": [], "avoid": ["카드론"]
+    })
+    assert "- 햇살론 (예상 금리 연 8%, 한도 1천만원): 저신용자 대상" in products
+
+
+@pytest.mark.parametrize("rate_range, expected, conditions", [
+    ([4.5, 6.0], "금리 등급: A (연 4.5~6.0%)", []),
+    (None, "금리 등급: D (추가 심사 필요)", ["소득 증빙"]),
+])
+def test_render_credit_decision(rate_range, expected, conditions):
+    fields = {"decision": "승인", "model_version": 2, "approval_probability": 0.8125,
+              "rate_band": "A" if rate_range else "D", "rate_range": rate_range,
+              "reasons": ["연체 없음"], "conditions": conditions}
+
+    text = render_analysis("credit_decision", fields)
+
+    assert "- 심사 의견: 승인 (신용 위험 모델 v2)" in text
+    assert "승인 확률: 81.2%" in text
+    assert expected in text
+    assert ("### 승인 조건" in text) == bool(conditions)
+
+
+def test_analysis_key_and_select_fields():
+    assert analysis_key("credit_trend", None, None) == "credit_trend"
+    assert analysis_key("credit_trend", "2024-01", None) == "credit_trend:2024-01:"
+
+    assert select_fields(TREND, ["trend"]) == {"trend": "개선"}
+    with pytest.raises(KeyError):
+        select_fields(TREND, ["trend", "loans"])
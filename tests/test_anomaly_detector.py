@@ -0,0 +1,78 @@
+import numpy as np
+from app.services.anomaly_detector import AnomalyDetector, get_detector, observe_appended
+
+
+def feed(detector, customer_id, rows, emit=True):
+    """[(월, 신용 점수, 부채, 연체 횟수)]를 반영하고 경보를 반환합니다."""
+    months = np.array([f"{month}-01" for month, *_ in rows], dtype="datetime64[D]")
+    values = np.array([values for _, *values in rows], dtype=np.float64)
+    return detector.update([customer_id] * len(rows), months, values, emit=emit)
+
+
+def steady(months=8, score=700, debt=1000.0):
+    start = np.datetime64("2023-01", "M")
+    return [(str(start + i), score, debt, 0) for i in range(months)]
+
+
+def test_fixed_threshold_alerts():
+    detector = AnomalyDetector()
+    feed(detector, "C1", steady(), emit=False)
+
+    alerts = feed(detector, "C1", [("2023-09", 650, 1500.0, 4)])
+
+    assert {alert["kind"] for alert in alerts} == {"credit_score_drop", "debt_spike", "overdue_spike"}
+    drop = next(alert for alert in alerts if alert["kind"] == "credit_score_drop")
+    assert drop["month"] == "2023-09" and drop["change"] == -50.0
+    assert detector.last_month("C1") == np.datetime64("2023-09", "M")
+
+
+def test_small_changes_do_not_alert():
+    detector = AnomalyDetector()
+    feed(detector, "C1", steady(), emit=False)
+
+    assert feed(detector, "C1", [("2023-09", 695, 1010.0, 1)]) == []
+
+
+def test_z_score_alert_needs_history():
+    history = [("2023-01", 700, 1000.0, 0), ("2023-02", 701, 1000.0, 0), ("2023-03", 700, 1000.0, 0),
+               ("2023-04", 701, 1000.0, 0), ("2023-05", 700, 1000.0, 0)]
+    detector = AnomalyDetector()
+    feed(detector, "C1", history, emit=False)
+    feed(detector, "C2", history[:2], emit=False)
+
+    # 변화가 거의 없던 고객의 15점 하락은 z-점수 경보, 이력이 짧은 고객은 고정 임계값만 적용
+    alerts = feed(detector, "C1", [("2023-06", 685, 1000.0, 0)]) + feed(detector, "C2", [("2023-03", 685, 1000.0, 0)])
+
+    assert [(alert["customer_id"], alert["kind"]) for alert in alerts] == [("C1", "credit_score_drop")]
+    assert alerts[0]["z_score"] <= -3
+
+
+def test_same_or_earlier_month_is_counted_stale():
+    detector = AnomalyDetector()
+    feed(detector, "C1", steady(3), emit=False)
+
+    assert feed(detector, "C1", [("2023-03", 500, 1000.0, 9), ("2023-02", 500, 1000.0, 9)]) == []
+    assert detector.stats()["stale"] == 2
+
+
+def next_row(store, customer_id, **changes):
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    month = np.datetime64(latest["month"][:7], "M") + 1
+    return {**latest, "month": f"{month}-01", **changes}
+
+
+def test_observe_appended_uses_history_before_its_rows(store):
+    customer_id = store.customer_ids()[0]
+    get_detector()
+    spike = next_row(store, customer_id, overdue_payments=6)
+    store.append_monthly_data(customer_id, [spike])
+    normal = next_row(store, customer_id, overdue_payments=0)
+    store.append_monthly_data(customer_id, [normal])
+
+    # 두 번째 추가가 먼저 저장된 뒤 첫 번째 추가의 백그라운드 작업이 실행되어도 기준 이력이 맞아야 함
+    first = observe_appended(customer_id, [spike])
+    second = observe_appended(customer_id, [normal])
+
+    assert "overdue_spike" in {alert["kind"] for alert in first}
+    assert "overdue_spike" not in {alert["kind"] for alert in second}
+    assert get_detector().last_month(customer_id) == np.datetime64(normal["month"][:7], "M")
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from app.services.credit_scorer import (
+    BAND_DECISIONS, FEATURES, build_features, ensure_model, load_model, model_version,
+    rate_band, score_customers, score_factors, train_model
+)
+from app.utils.monthly_records import METRIC_FIELDS
+
+
+def customer_values(months, **fields):
+    """모든 월이 같은 값인 고객 한 명의 (1, 월 수, 항목 수) 배열"""
+    values = np.zeros((1, months, len(METRIC_FIELDS)))
+    for field, value in fields.items():
+        values[0, :, METRIC_FIELDS.index(field)] = value
+    return values
+
+
+def test_ensure_model_trains_first_version_once(store):
+    assert model_version() is None
+    with pytest.raises(ValueError):
+        load_model()
+
+    assert ensure_model() == 1
+    assert ensure_model() == 1
+    _, metadata = load_model()
+    assert metadata["label_source"] == "bootstrap_rules"
+    assert metadata["samples"] == len(store.customer_ids())
+
+
+def test_retraining_increments_version_and_reloads(store):
+    ensure_model()
+    customer_ids = store.customer_ids()
+    labels = {customer_id: i % 2 for i, customer_id in enumerate(customer_ids)}
+
+    metadata = train_model(labels=labels)
+
+    assert metadata["version"] == model_version() == 2
+    assert metadata["label_source"] == "outcomes"
+    assert load_model()[1]["version"] == 2
+    assert score_customers(customer_ids[:1])["model_version"] == 2
+
+    with pytest.raises(ValueError):
+        train_model(labels={customer_id: 1 for customer_id in customer_ids})
+    assert model_version() == 2
+
+
+def test_scores_and_factors_agree(store):
+    ensure_model()
+    customer_ids = store.customer_ids()[:5]
+
+    result = score_customers(customer_ids)
+    assert [s["customer_id"] for s in result["scores"]] == customer_ids
+    for score in result["scores"]:
+        assert 0 <= score["approval_probability"] <= 1
+        assert score["rate_band"] == rate_band(score["approval_probability"])[0]
+
+    decision, factors = score_factors(customer_ids[0], top=3)
+    assert decision["approval_probability"] == result["scores"][0]["approval_probability"]
+    assert decision["decision"] == BAND_DECISIONS[decision["rate_band"]]
+    assert len(factors) == 3
+    assert all(name in FEATURES for name, _, _ in factors)
+    contributions = [abs(c) for _, _, c in factors]
+    assert contributions == sorted(contributions, reverse=True)
+
+
+@pytest.mark.parametrize("probability, band, rates", [
+    (0.95, "A", (4.5, 6.0)),
+    (0.8, "A", (4.5, 6.0)),
+    (0.6, "B", (6.0, 8.5)),
+    (0.45, "C", (8.5, 12.0)),
+    (0.1, "D", None),
+])
+def test_rate_band(probability, band, rates):
+    assert rate_band(probability) == (band, rates)
+
+
+def test_build_features_ratios():
+    values = customer_values(12, credit_score=700, income=4_000_000, expenses=2_000_000,
+                             savings=6_000_000, debt=24_000_000, loan_payments=800_000, overdue_payments=1)
+    values[0, :6, METRIC_FIELDS.index("credit_score")] = np.nan
+    values[0, 5, METRIC_FIELDS.index("credit_score")] = 650
+
+    features = dict(zip(FEATURES, build_features(values)[0]))
+
+    assert features["dti"] == pytest.approx(0.2)
+    assert features["debt_to_income"] == pytest.approx(0.5)
+    assert features["expense_ratio"] == pytest.approx(0.5)
+    assert features["savings_months"] == pytest.approx(3)
+    assert features["overdue_12m"] == 12
+    assert features["score_trend_6m"] == 50
+    assert features["income_volatility"] == 0
+    assert build_features(np.empty((0, 0, len(METRIC_FIELDS)))).shape == (0, len(FEATURES))
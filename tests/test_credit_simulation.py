@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import app.services.credit_simulation as credit_simulation
+from app.services.credit_simulation import (
+    PERCENTILES, PRIOR_DRIFT, _percentiles, fit_credit_walk, forecast_customer, forecast_portfolio
+)
+from app.utils.data_generator import CREDIT_SCORE_MAX, CREDIT_SCORE_MIN
+from app.utils.monthly_records import METRIC_FIELDS
+
+
+def test_same_seed_reproduces_forecast(store):
+    customer_id = store.customer_ids()[0]
+
+    first = forecast_customer(customer_id, paths=500, seed=11)
+    assert forecast_customer(customer_id, paths=500, seed=11) == first
+    assert forecast_customer(customer_id, paths=500, seed=12)["bands"] != first["bands"]
+    assert first["model"]["seed"] == 11
+    assert len(first["months"]) == len(first["bands"]["p50"]) == credit_simulation.DEFAULT_MONTHS_AHEAD
+
+
+def test_customer_forecast_independent_of_batch(store, monkeypatch):
+    customer_ids = store.customer_ids()
+    single = {customer_id: forecast_customer(customer_id, paths=200)["bands"] for customer_id in customer_ids[:3]}
+
+    # 고객을 한 명씩 나누어 시뮬레이션해도 같은 결과
+    monkeypatch.setattr(credit_simulation, "CHUNK_ELEMENTS", 1)
+    portfolio = forecast_portfolio(paths=200)
+
+    assert portfolio["skipped"] == []
+    by_customer = {forecast["customer_id"]: forecast["bands"] for forecast in portfolio["forecasts"]}
+    assert len(by_customer) == len(customer_ids)
+    for customer_id, bands in single.items():
+        assert by_customer[customer_id] == bands
+
+
+def test_bands_are_ordered_and_clipped(store):
+    forecast = forecast_customer(store.customer_ids()[0], paths=500)
+    bands = np.array([forecast["bands"][f"p{p}"] for p in PERCENTILES])
+
+    assert np.all(np.diff(bands, axis=0) >= 0)
+    assert bands.min() >= CREDIT_SCORE_MIN and bands.max() <= CREDIT_SCORE_MAX
+
+
+def test_short_history_is_skipped(store):
+    row = dict(store.get_entry(store.customer_ids()[0])["summary"]["latest"])
+    store.import_batch([{"customer_id": "NEW1", "name": "홍길동", "profile_type": "average", "monthly_data": [row]}])
+
+    with pytest.raises(ValueError):
+        forecast_customer("NEW1", paths=100)
+    assert forecast_portfolio(["NEW1", store.customer_ids()[0]], paths=100)["skipped"] == ["NEW1"]
+    with pytest.raises(KeyError):
+        forecast_portfolio(["UNKNOWN"], paths=100)
+
+
+def test_fit_credit_walk_excludes_overdue_months():
+    values = np.full((1, 6, len(METRIC_FIELDS)), 0.0)
+    values[0, :, METRIC_FIELDS.index("credit_score")] = [600, 610, 620, 580, 590, 600]
+    values[0, 3, METRIC_FIELDS.index("overdue_payments")] = 1
+
+    params = fit_credit_walk(values)
+
+    # 연체 달(-40)은 빼고 +10 네 번을 사전 분포와 가중 평균
+    assert params["drift"][0] == pytest.approx((40 + 3 * PRIOR_DRIFT) / 7)
+    assert params["overdue_rate"][0] == pytest.approx(1 / 6)
+    assert (params["start"][0], params["history"][0], params["last"][0]) == (600, 6, 5)
+
+
+def test_percentiles_match_numpy():
+    simulated = np.random.default_rng(0).normal(size=(2, 3, 101)).astype(np.float32)
+    expected = np.percentile(simulated, PERCENTILES, axis=-1).transpose(1, 2, 0)
+    np.testing.assert_allclose(_percentiles(simulated), expected, rtol=1e-5)
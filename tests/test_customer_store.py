@@ -0,0 +1,104 @@
+import json
+import os
+import numpy as np
+import pytest
+import app.utils.customer_store as customer_store
+from app.utils.customer_store import CustomerStore, shard_of
+
+
+def next_row(store, customer_id, months=1, **changes):
+    """고객의 마지막 월 데이터를 months개월 뒤로 옮긴 행"""
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    month = np.datetime64(latest["month"][:7], "M") + months
+    return {**latest, "month": f"{month}-01", **changes}
+
+
+def test_append_writes_shard_log_and_updates_summary(store):
+    customer_id = store.customer_ids()[0]
+    before = store.get_entry(customer_id)
+    months, version = before["summary"]["months"], before["version"]
+    row = next_row(store, customer_id, credit_score=512)
+
+    entry, compact = store.append_monthly_data(customer_id, [row])
+
+    assert compact is None
+    assert os.path.exists(store._log_path(shard_of(customer_id)))
+    assert entry["version"] == version + 1
+    assert entry["summary"]["months"] == months + 1
+    assert entry["summary"]["last_month"] == row["month"]
+    assert entry["summary"]["credit_score_min"] == 512
+    assert store.get_customer(customer_id)["monthly_data"].to_dicts()[-1]["credit_score"] == 512
+
+    # 다른 프로세스처럼 새 저장소 객체로 읽어도 미병합 로그가 반영됨
+    other = CustomerStore(data_dir=store.data_dir)
+    assert len(other.get_customer(customer_id)["monthly_data"]) == months + 1
+
+
+@pytest.mark.parametrize("months", [0, -1])
+def test_append_rejects_same_or_earlier_month(store, months):
+    customer_id = store.customer_ids()[0]
+    row = next_row(store, customer_id, months=months)
+    row["month"] = row["month"][:8] + "15"  # 같은 달의 다른 날짜도 거부
+
+    with pytest.raises(ValueError):
+        store.append_monthly_data(customer_id, [row])
+    with pytest.raises(KeyError):
+        store.append_monthly_data("UNKNOWN", [row])
+
+
+def test_compact_merges_log_into_customer_file(store, monkeypatch):
+    monkeypatch.setattr(customer_store, "COMPACTION_THRESHOLD", 2)
+    customer_id = store.customer_ids()[0]
+    shard = shard_of(customer_id)
+
+    _, compact = store.append_monthly_data(customer_id, [next_row(store, customer_id)])
+    assert compact is None
+    _, compact = store.append_monthly_data(customer_id, [next_row(store, customer_id)])
+    assert compact == shard
+    expected = store.get_customer(customer_id)["monthly_data"].to_dicts()
+
+    assert store.compact(shard) == 2
+    assert not os.path.exists(store._log_path(shard))
+    with open(store._customer_path(customer_id), encoding="utf-8") as f:
+        assert json.load(f)["monthly_data"] == expected
+    assert CustomerStore(data_dir=store.data_dir).get_customer(customer_id)["monthly_data"].to_dicts() == expected
+
+    # 병합 후 추가도 그대로 동작
+    store.append_monthly_data(customer_id, [next_row(store, customer_id)])
+    assert len(store.get_customer(customer_id)["monthly_data"]) == len(expected) + 1
+
+
+def test_import_batch_reports_appended_rows(store):
+    existing = store.customer_ids()[0]
+    previous = store.get_entry(existing)["summary"]["last_month"]
+    stale = next_row(store, existing, months=0)
+    fresh = next_row(store, existing)
+    new_row = dict(fresh, month="2024-01-01")
+
+    result = store.import_batch([
+        {"customer_id": existing, "name": None, "profile_type": None, "monthly_data": [stale, fresh]},
+        {"customer_id": "NEW1", "name": "홍길동", "profile_type": "average", "monthly_data": [new_row]},
+        {"customer_id": "NEW2", "name": None, "profile_type": None, "monthly_data": [new_row]},
+    ])
+
+    assert (result["created"], result["updated"], result["rows"]) == (1, 1, 2)
+    assert [(customer_id, month) for customer_id, month, _ in result["rejected"]] == \
+        [(existing, stale["month"]), ("NEW2", "2024-01-01")]
+    assert result["appended"] == [(existing, previous, [fresh]), ("NEW1", None, [new_row])]
+    assert store.get_entry(existing)["summary"]["last_month"] == fresh["month"]
+    assert store.find_ids_by_name("홍길동") == ["NEW1"]
+
+
+def test_local_caches_keep_recent_customers_only(store):
+    bounded = CustomerStore(data_dir=store.data_dir, cache_size=5)
+    customer_ids = store.customer_ids()
+
+    for customer_id in customer_ids:
+        assert bounded.get_customer_model(customer_id).customer_id == customer_id
+        bounded.get_columns(customer_id)
+
+    for cache in (bounded._cache, bounded._models, bounded._columns):
+        assert list(cache) == customer_ids[-5:]
+    # 캐시에서 밀려난 고객도 다시 읽을 수 있음
+    assert bounded.get_customer(customer_ids[0])["customer_id"] == customer_ids[0]
+    assert list(bounded._cache)[-1] == customer_ids[0]
@@ -0,0 +1,82 @@
+import gzip
+import io
+import orjson
+import pytest
+from app.services.data_export import check_export_options, export_filename, export_portfolio
+from app.services.data_import import import_customer_file
+from app.utils.customer_store import CustomerStore
+
+
+def exported_customers(store):
+    return {customer_id: store.get_customer(customer_id) for customer_id in store.customer_ids()}
+
+
+def round_trip(store, fmt, compression=None):
+    """내보낸 파일을 빈 저장소로 다시 가져옵니다."""
+    data = b"".join(export_portfolio(fmt, compression, store=store))
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    target = CustomerStore(data_dir="data/round_trip")
+    result = import_customer_file(io.BytesIO(data), fmt, store=target)
+    return target, result
+
+
+def assert_same_customers(source, target):
+    assert target.customer_ids() == source.customer_ids()
+    for customer_id, customer in exported_customers(source).items():
+        copied = target.get_customer(customer_id)
+        assert (copied["name"], copied["profile_type"]) == (customer["name"], customer["profile_type"])
+        assert copied["monthly_data"].to_dicts() == customer["monthly_data"].to_dicts()
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_csv_round_trip(store, compression):
+    target, result = round_trip(store, "csv", compression)
+
+    assert result["rejected_rows"] == 0
+    assert result["created_customers"] == len(store.customer_ids())
+    assert_same_customers(store, target)
+
+
+def test_parquet_round_trip(store):
+    pytest.importorskip("pyarrow")
+    target, result = round_trip(store, "parquet")
+
+    assert result["rejected_rows"] == 0
+    assert_same_customers(store, target)
+
+
+def test_ndjson_rows_and_date_filter(store):
+    months = sorted({row["month"][:7] for customer in exported_customers(store).values()
+                     for row in customer["monthly_data"].to_dicts()})
+    start_date, end_date = months[-3], months[-2]
+
+    lines = b"".join(export_portfolio("ndjson", start_date=start_date, end_date=end_date, store=store)).splitlines()
+    rows = [orjson.loads(line) for line in lines]
+
+    assert {row["month"][:7] for row in rows} == {start_date, end_date}
+    expected = sum(1 for customer in exported_customers(store).values()
+                   for row in customer["monthly_data"].to_dicts() if start_date <= row["month"][:7] <= end_date)
+    assert len(rows) == expected
+
+
+def test_empty_export_keeps_header(store):
+    data = b"".join(export_portfolio("csv", start_date="1990-01", end_date="1990-12", store=store))
+    assert data.decode("utf-8").startswith("customer_id,name,profile_type,month,")
+    assert len(data.splitlines()) == 1
+
+
+@pytest.mark.parametrize("options", [
+    ("xlsx", None, None, None),
+    ("csv", "bz2", None, None),
+    ("csv", None, "2024-13", None),
+    ("csv", None, "2024-05", "2024-01"),
+])
+def test_check_export_options_rejects(options):
+    with pytest.raises(ValueError):
+        check_export_options(*options)
+
+
+def test_export_filename():
+    assert export_filename("csv", "gzip") == "portfolio_export.csv.gz"
+    assert export_filename("parquet", "zstd") == "portfolio_export.parquet"
@@ -0,0 +1,15 @@
+from datetime import datetime
+from app.utils.data_generator import generate_customer_timeseries
+
+
+def test_generator_steps_by_calendar_month():
+    customer = generate_customer_timeseries("C1", "김민준", months=60)
+    months = [row["month"] for row in customer["monthly_data"]]
+
+    assert len(months) == 60
+    assert all(month.endswith("-01") for month in months)
+    # 달마다 한 건, 마지막 달은 지난달
+    assert len({month[:7] for month in months}) == 60 and months == sorted(months)
+    now = datetime.now()
+    previous = (now.year * 12 + now.month - 2)
+    assert months[-1][:7] == f"{previous // 12:04d}-{previous % 12 + 1:02d}"
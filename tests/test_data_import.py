@@ -0,0 +1,78 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.data_import import detect_format, import_customer_file, validate_chunk
+from app.utils.alert_log import read_alerts
+
+
+def csv_file(rows):
+    return io.BytesIO(pd.DataFrame(rows).to_csv(index=False).encode("utf-8"))
+
+
+def next_row(store, customer_id, months=1, **changes):
+    """고객의 마지막 월 데이터를 months개월 뒤로 옮긴 가져오기 행"""
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    month = np.datetime64(latest["month"][:7], "M") + months
+    return {"customer_id": customer_id, **latest, "month": f"{month}-01", **changes}
+
+
+ROW = {"customer_id": "C1", "name": "홍길동", "month": "2024-01-01", "credit_score": 700, "income": 3000000,
+       "expenses": 2000000, "savings": 1000000, "debt": 5000000, "loan_payments": 200000}
+
+
+def test_validate_chunk_rejects_invalid_rows():
+    df = pd.DataFrame([
+        ROW,
+        {**ROW, "customer_id": " "},
+        {**ROW, "month": "2024-13-01"},
+        {**ROW, "month": "2024-02-01", "income": "많음"},
+        {**ROW, "month": "2024-03-01", "credit_score": 700.5},
+        {**ROW, "month": "2024-01-20"},
+        {**ROW, "customer_id": "C2", "overdue_payments": None},
+    ])
+
+    valid, reason = validate_chunk(df)
+
+    assert reason.where(reason.notna(), None).tolist() == [None, "customer_id 누락", "month 형식 오류", "income 숫자 아님",
+                               "credit_score 정수 아님", "중복 월", None]
+    assert valid["customer_id"].tolist() == ["C1", "C2"]
+    assert valid["overdue_payments"].tolist() == [0, 0]
+    assert valid["credit_score"].dtype == np.int64
+    with pytest.raises(ValueError):
+        validate_chunk(df.drop(columns=["debt"]))
+
+
+def test_detect_format():
+    assert detect_format("data.CSV") == "csv"
+    assert detect_format("upload.bin", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("data.xlsx")
+
+
+def test_import_creates_updates_and_alerts(store):
+    customer_id = store.customer_ids()[0]
+    months = store.get_entry(customer_id)["summary"]["months"]
+    latest = store.get_entry(customer_id)["summary"]["latest"]
+    rows = [
+        next_row(store, customer_id, credit_score=latest["credit_score"] - 100, overdue_payments=0),
+        next_row(store, customer_id, months=0),
+        {**ROW, "customer_id": "NEW1"},
+        {**ROW, "customer_id": "NEW2", "name": None},
+        {**ROW, "customer_id": "NEW1", "month": "bad"},
+    ]
+
+    result = import_customer_file(csv_file(rows), "csv")
+
+    assert (result["rows"], result["imported_rows"], result["rejected_rows"]) == (5, 2, 3)
+    assert (result["created_customers"], result["updated_customers"]) == (1, 1)
+    assert result["rejected_by_reason"]["month 형식 오류"] == 1
+    assert {sample["customer_id"] for sample in result["rejected_samples"]} == {customer_id, "NEW2", "NEW1"}
+    assert store.get_entry(customer_id)["summary"]["months"] == months + 1
+    assert store.get_customer("NEW1")["name"] == "홍길동"
+
+    # 기존 고객에 추가된 급락만 경보 (새 고객은 이력으로만 반영)
+    assert result["alerts"] >= 1
+    alerts, _ = read_alerts()
+    assert [(a["customer_id"], a["kind"]) for _, a in alerts if a["kind"] == "credit_score_drop"] == \
+        [(customer_id, "credit_score_drop")]
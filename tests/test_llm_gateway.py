@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+import httpx
+import openai
+import pytest
+import app.services.llm_gateway as llm_gateway
+from app.services.ai_analyzer import analyze_credit_trend, is_fallback_narrative
+from app.services.llm_gateway import CircuitBreaker, LLMUnavailableError, chat_completion
+
+MESSAGES = [{"role": "user", "content": "테스트 질문"}]
+
+
+def status_error(error_class, status_code, headers=None):
+    """지정한 HTTP 상태의 OpenAI SDK 오류"""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return error_class("업스트림 오류", response=response, body=None)
+
+
+def completion(content):
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=10, total_tokens=20)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+@pytest.fixture
+def upstream(workdir, monkeypatch):
+    """
+    미리 정한 순서대로 오류를 던지거나 응답하는 가짜 업스트림
+
+    서킷 브레이커는 테스트마다 새로 만들고, 백오프 대기 시간은 기록만 합니다.
+
+    Returns:
+        outcomes(응답/오류 목록), calls(호출 인자), sleeps(대기 시간)를 담은 객체
+    """
+    state = SimpleNamespace(outcomes=[], calls=[], sleeps=[])
+
+    def create(**kwargs):
+        state.calls.append(kwargs)
+        outcome = state.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return completion(outcome)
+
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setattr(llm_gateway, "breaker", CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    monkeypatch.setattr(llm_gateway.time, "sleep", state.sleeps.append)
+    return state
+
+
+def test_retries_transient_errors_then_succeeds(upstream):
+    upstream.outcomes = [
+        status_error(openai.RateLimitError, 429, {"retry-after": "2"}),
+        status_error(openai.InternalServerError, 503),
+        "정상 응답"
+    ]
+
+    assert chat_completion(MESSAGES, use_cache=False) == "정상 응답"
+    assert len(upstream.calls) == 3
+    # 429 응답의 Retry-After보다 짧게 기다리지 않음
+    assert upstream.sleeps[0] >= 2
+    assert llm_gateway.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_retryable_error_is_raised_without_retry(upstream):
+    upstream.outcomes = [status_error(openai.BadRequestError, 400)]
+
+    with pytest.raises(openai.BadRequestError):
+        chat_completion(MESSAGES, use_cache=False)
+    assert len(upstream.calls) == 1
+    assert upstream.sleeps == []
+    assert llm_gateway.breaker.snapshot()["consecutive_failures"] == 0
+
+
+def test_exhausted_retries_open_breaker_and_short_circuit(upstream):
+    failures = llm_gateway.MAX_RETRIES + 1
+    upstream.outcomes = [status_error(openai.InternalServerError, 500) for _ in range(failures * 2)]
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            chat_completion(MESSAGES, use_cache=False)
+    assert len(upstream.calls) == failures * 2
+    assert llm_gateway.breaker.state == CircuitBreaker.OPEN
+
+    # 서킷이 열리면 업스트림을 호출하지 않고 즉시 실패
+    with pytest.raises(LLMUnavailableError):
+        chat_completion(MESSAGES, use_cache=False)
+    assert len(upstream.calls) == failures * 2
+
+
+def test_half_open_allows_single_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(llm_gateway.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # 복구 확인 호출이 실패하면 다시 열리고, 성공하면 닫힘
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_cached_response_skips_upstream(upstream):
+    upstream.outcomes = ["캐시될 응답"]
+
+    assert chat_completion(MESSAGES) == "캐시될 응답"
+    assert chat_completion(MESSAGES) == "캐시될 응답"
+    assert len(upstream.calls) == 1
+
+
+def test_analysis_falls_back_when_llm_unavailable(store, upstream):
+    llm_gateway.breaker.record_failure()
+    llm_gateway.breaker.record_failure()
+
+    result = analyze_credit_trend(customer_id=store.customer_ids()[0])
+
+    assert is_fallback_narrative(result)
+    assert upstream.calls == []
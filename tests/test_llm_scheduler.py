@@ -0,0 +1,116 @@
+import threading
+import time
+import pytest
+import app.services.llm_scheduler as llm_scheduler
+from app.services.llm_scheduler import LLMScheduler, LocalBuckets, SQLiteBuckets, estimate_tokens
+
+
+class GateBuckets:
+    """열어 준 횟수만큼만 슬롯을 내주는 버킷"""
+
+    def __init__(self):
+        self.available = 0
+
+    def try_acquire(self, amounts):
+        if self.available > 0:
+            self.available -= 1
+            return 0.0
+        return 0.01
+
+    def snapshot(self):
+        return {}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """버킷 보충 시간을 직접 진행시키는 시계"""
+    now = [1000.0]
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(llm_scheduler.time, "time", lambda: now[0])
+    return now
+
+
+def wait_until(condition, timeout=2.0):
+    expires_at = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < expires_at
+        time.sleep(0.005)
+
+
+def test_local_buckets_deduct_and_refill(clock):
+    buckets = LocalBuckets({"requests": 60, "tokens": 600})
+
+    assert buckets.try_acquire({"requests": 1, "tokens": 600}) == 0
+    # 토큰이 부족하면 부족분이 보충될 때까지의 시간을 알려주고 차감하지 않음
+    assert buckets.try_acquire({"requests": 1, "tokens": 300}) == pytest.approx(30)
+    assert buckets.snapshot()["requests"]["available"] == 59
+
+    clock[0] += 30
+    assert buckets.try_acquire({"requests": 1, "tokens": 300}) == 0
+    assert buckets.snapshot()["tokens"]["available"] == 0
+
+
+def test_adjust_refunds_up_to_capacity(clock):
+    buckets = LocalBuckets({"requests": 60, "tokens": 600})
+    scheduler = LLMScheduler(buckets)
+
+    scheduler.acquire(500, timeout=0)
+    scheduler.record_usage(500, 200)
+    assert buckets.snapshot()["tokens"]["available"] == 400
+
+    buckets.adjust("tokens", 10000)
+    assert buckets.snapshot()["tokens"]["available"] == 600
+
+
+def test_sqlite_buckets_are_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "buckets.db")
+    first = SQLiteBuckets({"requests": 2, "tokens": 1000}, path)
+    second = SQLiteBuckets({"requests": 2, "tokens": 1000}, path)
+
+    assert first.try_acquire({"requests": 1, "tokens": 10}) == 0
+    assert second.try_acquire({"requests": 1, "tokens": 10}) == 0
+    assert first.try_acquire({"requests": 1, "tokens": 10}) > 0
+    assert second.snapshot()["requests"]["available"] == 0
+
+
+def test_interactive_requests_go_before_queued_batch():
+    buckets = GateBuckets()
+    scheduler = LLMScheduler(buckets)
+    done = []
+
+    def run(priority):
+        scheduler.acquire(10, priority, timeout=5)
+        done.append(priority)
+
+    batch = threading.Thread(target=run, args=("batch",))
+    batch.start()
+    wait_until(lambda: len(scheduler._heap) == 1)
+    interactive = threading.Thread(target=run, args=("interactive",))
+    interactive.start()
+    wait_until(lambda: len(scheduler._heap) == 2)
+    assert scheduler.snapshot()["queued"] == {"interactive": 1, "batch": 1}
+
+    # 먼저 도착한 배치 요청보다 나중에 온 사용자 요청이 먼저 슬롯을 받음
+    buckets.available = 1
+    interactive.join(2)
+    assert done == ["interactive"]
+    assert batch.is_alive()
+
+    buckets.available = 1
+    batch.join(2)
+    assert done == ["interactive", "batch"]
+
+
+def test_acquire_times_out_and_leaves_queue():
+    scheduler = LLMScheduler(GateBuckets())
+
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(10, "batch", timeout=0.05)
+    assert scheduler._heap == []
+    with pytest.raises(ValueError):
+        scheduler.acquire(10, "unknown")
+
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    messages = [{"role": "system", "content": "가" * 10}, {"role": "user", "content": None}]
+    assert estimate_tokens(messages, 100) == 105
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from app.utils.monthly_records import RECORD_FIELDS, MonthlyRecords
+
+
+def row(month, credit_score=700, debt=1500000.5, **changes):
+    return {"month": month, "credit_score": credit_score, "income": 3000000, "expenses": 2000000,
+            "savings": 1000000, "debt": debt, "loan_payments": 200000, "overdue_payments": 0, **changes}
+
+
+ROWS = [row("2024-01-01"), row("2024-02-01", credit_score=690), row("2024-03-01", overdue_payments=None)]
+
+
+def test_records_read_like_dict_list():
+    records = MonthlyRecords(ROWS)
+
+    assert len(records) == 3
+    assert records[1]["credit_score"] == 690
+    assert records[-1]["month"] == "2024-03-01"
+    assert records[2]["overdue_payments"] == 0
+    # 정수 값은 정수로, 소수 값은 그대로
+    assert type(records[0]["income"]) is int and records[0]["debt"] == 1500000.5
+    assert list(records[0]) == list(RECORD_FIELDS)
+    assert {**records[0]} == records[0].to_dict() == row("2024-01-01")
+    assert "debt" in records[0] and "name" not in records[0]
+    with pytest.raises(IndexError):
+        records[3]
+
+
+def test_append_grows_and_slices_copy():
+    records = MonthlyRecords()
+    for i in range(10):
+        records.append(row(f"2024-{i + 1:02d}-01", credit_score=600 + i))
+
+    assert [r["credit_score"] for r in records] == list(range(600, 610))
+    tail = records[-3:]
+    assert isinstance(tail, MonthlyRecords) and [r["month"] for r in tail][0] == "2024-08-01"
+
+    records.extend([row("2024-11-01")])
+    assert len(records) == 11 and len(tail) == 3
+
+
+def test_sort_and_columns():
+    records = MonthlyRecords(list(reversed(ROWS)))
+    records.sort()
+    assert [r["month"] for r in records] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+
+    records.sort(key=lambda r: r["credit_score"])
+    assert records[0]["credit_score"] == 690
+
+    columns = records.columns()
+    assert columns["month"].dtype == np.dtype("datetime64[D]")
+    np.testing.assert_array_equal(columns["credit_score"], [690, 700, 700])
+    with pytest.raises(ValueError):
+        columns["debt"][0] = 0
+    assert records.to_dicts()[0] == row("2024-02-01", credit_score=690)
@@ -0,0 +1,64 @@
+from app.utils.name_index import NameIndex, edit_distance, to_initials, to_jamo
+
+
+CUSTOMERS = [
+    ("C1", "김민준"), ("C2", "김민준"), ("C3", "김민서"), ("C4", "김미나"),
+    ("C5", "이서연"), ("C6", "박지훈"), ("C7", ""), ("C8", "김 민 준")
+]
+
+
+def test_jamo_and_initials():
+    assert to_jamo("김민준") == "ㄱㅣㅁㅁㅣㄴㅈㅜㄴ"
+    assert to_initials("김민준") == "ㄱㅁㅈ"
+    assert edit_distance(to_jamo("김민존"), to_jamo("김민준"), 1) == 1
+    assert edit_distance("abcd", "badc", 1) == 2
+
+
+def test_exact_groups_same_name_in_input_order():
+    index = NameIndex(CUSTOMERS)
+
+    # 공백은 정규화하므로 같은 이름이고, 빈 이름은 색인하지 않음
+    assert index.exact("김민준") == ["C1", "C2", "C8"]
+    assert index.exact("없는이름") == []
+    assert len(index) == 7
+    assert index.distinct_names == 5
+
+
+def test_search_ranks_exact_prefix_before_fuzzy():
+    index = NameIndex(CUSTOMERS)
+
+    # 자모 단위 접두어이므로 김미나(ㄱㅣㅁㅁㅣㄴㅏ)도 김민(ㄱㅣㅁㅁㅣㄴ)으로 시작함
+    results, total = index.search("김민")
+    assert total == 5
+    assert {r["customer_id"] for r in results} == {"C1", "C2", "C3", "C4", "C8"}
+    assert {r["match"] for r in results} == {"prefix"}
+
+    results, total = index.search("김민준")
+    assert [r["match"] for r in results[:3]] == ["exact"] * 3
+
+    # 음절 중간까지 입력한 검색어도 접두어로 일치
+    results, _ = index.search("김미")
+    assert {r["customer_id"] for r in results} >= {"C1", "C3", "C4"}
+
+
+def test_search_initials_and_typos():
+    index = NameIndex(CUSTOMERS)
+
+    results, total = index.search("ㄱㅁㅈ")
+    assert total == 3 and {r["match"] for r in results} == {"initial"}
+
+    results, total = index.search("김ㅁㅅ")
+    assert [r["customer_id"] for r in results] == ["C3"]
+
+    results, _ = index.search("김민존")
+    assert [(r["customer_id"], r["match"], r["distance"]) for r in results] == \
+        [("C1", "fuzzy", 1), ("C2", "fuzzy", 1), ("C8", "fuzzy", 1)]
+    assert index.search("김민존", fuzzy=False) == ([], 0)
+
+
+def test_search_limit_keeps_total():
+    index = NameIndex([(f"C{i}", "김민준") for i in range(50)])
+
+    results, total = index.search("김민", limit=5)
+
+    assert len(results) == 5 and total == 50
@@ -0,0 +1,67 @@
+import os
+import numpy as np
+from app.utils.monthly_records import METRIC_FIELDS
+from app.utils.portfolio_arrays import (
+    PORTFOLIO_DIR, build_portfolio_arrays, get_portfolio, publish_portfolio
+)
+
+
+def next_row(store, customer_id, months=1, **changes):
+    """고객의 마지막 월 데이터를 months개월 뒤로 옮긴 행"""
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    month = np.datetime64(latest["month"][:7], "M") + months
+    return {**latest, "month": f"{month}-01", **changes}
+
+
+def assert_matches_full_build(segment, store):
+    customer_ids, months, values = build_portfolio_arrays(store)
+    order = [segment.customer_ids.index(customer_id) for customer_id in customer_ids]
+    np.testing.assert_array_equal(segment.months, months)
+    np.testing.assert_array_equal(segment.values[order], values)
+
+
+def test_publish_builds_segment_from_store(store):
+    segment = get_portfolio()
+
+    assert segment.generation == 1
+    assert sorted(segment.customer_ids) == sorted(store.customer_ids())
+    assert segment.values.shape == (len(store.customer_ids()), len(segment.months), len(METRIC_FIELDS))
+    assert_matches_full_build(segment, store)
+
+    customer_id = store.customer_ids()[0]
+    latest = store.get_entry(customer_id)["summary"]["latest"]
+    row = segment.customer_ids.index(customer_id)
+    assert segment.latest()[row][METRIC_FIELDS.index("credit_score")] == latest["credit_score"]
+
+
+def test_append_publishes_patch_matching_full_build(store):
+    publish_portfolio()
+    customer_id = store.customer_ids()[0]
+    # 기존 월 축을 넘어가는 새 월도 반영
+    store.append_monthly_data(customer_id, [next_row(store, customer_id, months=2, credit_score=450)])
+
+    pointer = publish_portfolio()
+    assert (pointer["build"], pointer["changed_customers"], pointer["generation"]) == ("patch", 1, 2)
+
+    segment = get_portfolio()
+    assert segment.generation == 2
+    assert_matches_full_build(segment, store)
+    assert segment.metric("credit_score")[segment.customer_ids.index(customer_id), -1] == 450
+
+    # 같은 데이터 버전이면 다시 만들지 않음
+    assert publish_portfolio()["generation"] == 2
+
+
+def test_new_customers_are_appended_and_old_segments_removed(store):
+    publish_portfolio()
+    new_row = next_row(store, store.customer_ids()[0])
+    store.import_batch([{"customer_id": "NEW1", "name": "홍길동", "profile_type": "average", "monthly_data": [new_row]}])
+
+    pointer = publish_portfolio()
+    assert pointer["build"] == "patch"
+    segment = get_portfolio()
+    assert segment.customer_ids[-1] == "NEW1"
+    assert_matches_full_build(segment, store)
+
+    assert publish_portfolio(force=True)["build"] == "full"
+    assert sorted(name for name in os.listdir(PORTFOLIO_DIR) if name.startswith("gen_")) == ["gen_2", "gen_3"]
@@ -0,0 +1,35 @@
+import numpy as np
+from app.services.credit_scorer import ensure_model
+from app.services.portfolio_summary import format_portfolio_details, portfolio_aggregates
+
+
+def latest_scores(store):
+    return np.array([store.get_entry(cid)["summary"]["latest"]["credit_score"] for cid in store.customer_ids()])
+
+
+def test_aggregates_match_customer_summaries(store):
+    aggregates = portfolio_aggregates(top=5)
+    scores = latest_scores(store)
+
+    assert aggregates["customers"] == len(scores)
+    assert aggregates["score"]["mean"] == round(float(scores.mean()), 1)
+    assert sum(aggregates["score"]["counts"]) == sum(aggregates["grades"].values()) == len(scores)
+    assert sum(row["customers"] for row in aggregates["profiles"]) == len(scores)
+
+    # 모델이 없으면 신용 점수 낮은 순
+    top_scores = [row["credit_score"] for row in aggregates["top_risk"]]
+    assert top_scores == sorted(scores)[:5]
+    assert all(row["approval_probability"] is None for row in aggregates["top_risk"])
+
+
+def test_top_risk_uses_trained_model(store):
+    ensure_model()
+    aggregates = portfolio_aggregates(top=5)
+
+    probabilities = [row["approval_probability"] for row in aggregates["top_risk"]]
+    assert probabilities == sorted(probabilities)
+    assert "v1" in aggregates["risk_source"]
+
+    details = format_portfolio_details(aggregates)
+    assert details.startswith("## 프로필 유형별 현황")
+    assert "## 고위험 고객 상위 5명" in details
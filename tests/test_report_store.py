@@ -0,0 +1,38 @@
+import os
+from app.utils.report_store import find_report, publish_report, record_not_modified, storage_stats
+
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_identical_reports_share_one_blob(workdir):
+    first = publish_report(write("reports/tmp1", b"%PDF same"), "reports/a.pdf")
+    second = publish_report(write("reports/tmp2", b"%PDF same"), "reports/b.pdf")
+    publish_report(write("reports/tmp3", b"%PDF other"), "reports/c.pdf")
+
+    assert os.path.samefile(first, second)
+    assert not os.path.exists("reports/tmp1") and not os.path.exists("reports/tmp2")
+
+    stats = storage_stats()
+    assert (stats["reports"], stats["blobs"], stats["deduplicated"]) == (3, 2, 1)
+    assert stats["logical_bytes"] == 2 * len(b"%PDF same") + len(b"%PDF other")
+    assert stats["saved_bytes"] == len(b"%PDF same")
+
+
+def test_republish_replaces_report_and_counts_reuse(workdir):
+    publish_report(write("reports/tmp", b"%PDF v1"), "reports/a.pdf")
+    publish_report(write("reports/tmp", b"%PDF v2"), "reports/a.pdf")
+    with open("reports/a.pdf", 'rb') as f:
+        assert f.read() == b"%PDF v2"
+
+    assert find_report("reports/a.pdf") == "reports/a.pdf"
+    assert find_report("reports/missing.pdf") is None
+    record_not_modified()
+
+    stats = storage_stats()
+    assert (stats["hits"], stats["not_modified"], stats["misses"]) == (1, 1, 2)
+    assert stats["hit_rate"] == 0.5
+    assert [name for name in os.listdir("reports") if name.endswith(".link")] == []
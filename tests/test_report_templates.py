@@ -0,0 +1,44 @@
+import pytest
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from app.services.report_templates import PAGE_HEIGHT, compile_template, render_report
+
+VALUES = {"name": "Hong", "customer_id": "C1", "credit_score": 700, "income": 3000000, "expenses": 2000000,
+          "savings": 1000000, "debt": 5000000, "loan_payments": 200000, "overdue_payments": 0,
+          "created_at": "2024-01-01"}
+
+
+def test_compile_template_places_values_after_labels():
+    compiled = compile_template("credit", "Helvetica")
+    assert compile_template("credit", "Helvetica") is compiled
+
+    static, dynamic = compiled["pages"][0]
+    name_field = next(op for op in dynamic if op[0] == "field" and op[4] == "{name}")
+    assert name_field[1] == pytest.approx(2 * cm + pdfmetrics.stringWidth("이름: ", "Helvetica", 12))
+    assert name_field[2] == pytest.approx(PAGE_HEIGHT - 5.0 * cm)
+    assert ("text", 2 * cm, PAGE_HEIGHT - 5.0 * cm, 12, "이름: ") in static
+    with pytest.raises(ValueError):
+        compile_template("unknown", "Helvetica")
+
+
+def test_render_report_is_byte_stable(tmp_path):
+    first, second = tmp_path / "first.pdf", tmp_path / "second.pdf"
+
+    assert render_report("credit", str(first), VALUES, texts={"analysis": "Short analysis."}) == 1
+    render_report("credit", str(second), VALUES, texts={"analysis": "Short analysis."})
+
+    # 같은 입력이면 같은 바이트 (보고서 중복 저장 제거의 전제)
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_long_analysis_continues_on_new_pages(tmp_path):
+    filename = tmp_path / "long.pdf"
+    analysis = "\n".join(f"- analysis line {i}" for i in range(200))
+
+    pages = render_report("credit", str(filename), VALUES, texts={"analysis": analysis})
+
+    assert pages > 2
+    data = filename.read_bytes()
+    # 이어지는 페이지 머리말은 폼 하나를 모든 페이지에서 재사용
+    assert data.count(b"/Subtype /Form") == 2
+    assert data.count(b"/Type /Page\n") == pages
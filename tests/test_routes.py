@@ -0,0 +1,220 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.credit_scorer import model_version
+
+
+@pytest.fixture
+def client(store, fake_llm):
+    return TestClient(app)
+
+
+def test_timeseries_report_conditional_get(client, store):
+    customer_id = store.customer_ids()[0]
+    params = {"customer_id": customer_id, "start_date": "2020-01"}
+
+    first = client.get("/api/generate_timeseries_report/", params=params)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] != "no-store"
+
+    again = client.get("/api/generate_timeseries_report/", params=params, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+    # 기간이 다르면 다른 보고서
+    other = client.get("/api/generate_timeseries_report/", params={**params, "start_date": "2021-01"},
+                       headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+def test_first_credit_report_is_keyed_by_trained_model(client, store):
+    customer_id = store.customer_ids()[0]
+    assert model_version() is None
+
+    first = client.get("/api/generate_report/", params={"customer_id": customer_id})
+    assert first.status_code == 200
+    # 보고서 키 계산 전에 첫 모델을 학습하므로 같은 키로 다시 요청하면 304
+    assert model_version() == 1
+    again = client.get("/api/generate_report/", params={"customer_id": customer_id},
+                       headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+
+
+def next_month_row(store, customer_id, **changes):
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    month = np.datetime64(latest["month"][:7], "M") + 1
+    return {**latest, "month": f"{month}-01", **changes}
+
+
+def test_append_monthly_data(client, store):
+    customer_id = store.customer_ids()[0]
+    row = next_month_row(store, customer_id, credit_score=640)
+
+    response = client.post(f"/api/customer/{customer_id}/monthly_data/", json=[row])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["summary"]["last_month"] == row["month"]
+    assert client.get(f"/api/customer/{customer_id}").json()["monthly_data"][-1]["credit_score"] == 640
+
+    # 같은 달 데이터는 400, 없는 고객은 404, 빈 목록은 400
+    assert client.post(f"/api/customer/{customer_id}/monthly_data/", json=[row]).status_code == 400
+    assert client.post("/api/customer/UNKNOWN/monthly_data/", json=[next_month_row(store, customer_id)]).status_code == 404
+    assert client.post(f"/api/customer/{customer_id}/monthly_data/", json=[]).status_code == 400
+
+
+def test_customer_response_matches_stored_data(client, store):
+    customer_id = store.customer_ids()[0]
+    stored = store.get_customer(customer_id)
+
+    response = client.get(f"/api/customer/{customer_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["customer_id"] == customer_id and body["name"] == stored["name"]
+    assert [row["month"] for row in body["monthly_data"]] == [row["month"] for row in stored["monthly_data"]]
+    assert body["monthly_data"][0]["credit_score"] == stored["monthly_data"][0]["credit_score"]
+
+    by_name = client.get(f"/api/customer/name/{stored['name']}")
+    assert by_name.status_code == 200 and by_name.json()["name"] == stored["name"]
+    assert client.get("/api/customer/UNKNOWN").status_code == 404
+    assert client.get("/api/customer/name/없는고객").status_code == 404
+
+
+def test_customer_listing_pages_with_cursor_and_fields(client, store):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, "fields": "id,profile_type,months"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/customers/", params=params).json()
+        assert page["count"] == 30
+        assert all(set(customer) == {"id", "profile_type", "months"} for customer in page["customers"])
+        seen += [customer["id"] for customer in page["customers"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(store.customer_ids())
+
+    premium = client.get("/api/customers/", params={"profile_type": "premium", "fields": "id,profile_type"}).json()
+    assert premium["count"] == len(premium["customers"]) > 0
+    assert {customer["profile_type"] for customer in premium["customers"]} == {"premium"}
+
+    assert client.get("/api/customers/", params={"fields": "id,password"}).status_code == 400
+    assert client.get("/api/customers/", params={"cursor": "_w"}).status_code == 400  # UTF-8이 아닌 커서
+
+
+def test_series_endpoint_downsamples(client, store):
+    customer_id = store.customer_ids()[0]
+    months = [row["month"] for row in store.get_customer(customer_id)["monthly_data"]]
+
+    full = client.get(f"/api/customer/{customer_id}/series", params={"metrics": "credit_score,debt"}).json()
+    assert full["months"] == months and not full["downsampled"]
+    assert set(full["series"]) == {"credit_score", "debt"}
+
+    reduced = client.get(f"/api/customer/{customer_id}/series", params={"max_points": 5}).json()
+    assert reduced["downsampled"] and reduced["total_points"] == len(months)
+    assert len(reduced["months"]) == 5 and reduced["months"][0] == months[0] and reduced["months"][-1] == months[-1]
+
+    assert client.get(f"/api/customer/{customer_id}/series", params={"metrics": "password"}).status_code == 400
+    assert client.get(f"/api/customer/{customer_id}/series", params={"start": "2024/01"}).status_code == 400
+
+
+def test_customer_conditional_get(client, store):
+    customer_id = store.customer_ids()[0]
+    url = f"/api/customer/{customer_id}"
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+    # 목록과 시계열도 같은 데이터 버전으로 검증
+    listing = client.get("/api/customers/")
+    assert client.get("/api/customers/", headers={"If-None-Match": listing.headers["etag"]}).status_code == 304
+
+    # 데이터가 바뀌면 새 ETag로 200
+    client.post(f"{url}/monthly_data/", json=[next_month_row(store, customer_id)])
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert client.get("/api/customers/", headers={"If-None-Match": listing.headers["etag"]}).status_code == 200
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/generate_report/", {"analysis_question": "최근 신용 점수 변화를 설명해 주세요"}),
+    ("/api/generate_timeseries_report/", {}),
+    ("/api/generate_portfolio_report/", {"top": 5}),
+])
+def test_report_conditional_get(client, store, path, params):
+    if path != "/api/generate_portfolio_report/":
+        params = {**params, "customer_id": store.customer_ids()[0]}
+
+    first = client.get(path, params=params)
+    assert first.status_code == 200 and first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    # 저장된 보고서는 다시 생성하지 않고 같은 파일을 반환
+    assert client.get(path, params=params).content == first.content
+
+    # 고객 데이터가 바뀌면 새 보고서
+    customer_id = params.get("customer_id", store.customer_ids()[0])
+    store.append_monthly_data(customer_id, [next_month_row(store, customer_id)])
+    changed = client.get(path, params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_import_endpoint(client, store):
+    customer_id = store.customer_ids()[0]
+    row = next_month_row(store, customer_id)
+    body = "\n".join([",".join(["customer_id", *row]), ",".join([customer_id, *map(str, row.values())])])
+
+    response = client.post("/api/customers/import/", files={"file": ("rows.csv", body.encode("utf-8"), "text/csv")})
+    assert response.status_code == 200
+    assert (response.json()["imported_rows"], response.json()["updated_customers"]) == (1, 1)
+
+    rejected = client.post("/api/customers/import/", files={"file": ("rows.xlsx", b"", "application/octet-stream")})
+    assert rejected.status_code == 400
+
+
+def test_export_endpoint_streams_csv(client, store):
+    response = client.get("/api/customers/export/", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="portfolio_export.csv"'
+    lines = response.text.splitlines()
+    assert lines[0].startswith("customer_id,name,profile_type,month,")
+    assert len(lines) - 1 == sum(store.get_entry(cid)["summary"]["months"] for cid in store.customer_ids())
+
+    assert client.get("/api/customers/export/", params={"format": "xlsx"}).status_code == 400
+
+
+def test_search_finds_imported_customer(client, store):
+    row = next_month_row(store, store.customer_ids()[0])
+    store.import_batch([{"customer_id": "NEW1", "name": "홍길동", "profile_type": "average", "monthly_data": [row]}])
+
+    response = client.get("/api/customers/search/", params={"q": "ㅎㄱㄷ"})
+    assert response.status_code == 200
+    assert [(c["id"], c["match"]) for c in response.json()["customers"]] == [("NEW1", "initial")]
+
+    etag = response.headers["etag"]
+    again = client.get("/api/customers/search/", params={"q": "ㅎㄱㄷ"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+
+def test_summarize_endpoint_caches_results(client):
+    texts = ["한 문장입니다.", " ".join(f"{i}번째 분석 문장은 수치 {i * 7}를 담고 있습니다." for i in range(20))]
+
+    first = client.post("/api/ai/summarize/", params={"mode": "extractive"}, json=texts)
+    assert first.status_code == 200
+    assert [r["method"] for r in first.json()["results"]] == ["original", "extractive"]
+    assert first.json()["stats"]["llm_calls"] == 0
+
+    again = client.post("/api/ai/summarize/", params={"mode": "extractive"}, json=texts)
+    assert [r["cached"] for r in again.json()["results"]] == [True, True]
+
+    assert client.post("/api/ai/summarize/", params={"mode": "unknown"}, json=texts).status_code == 400
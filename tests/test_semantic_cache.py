@@ -0,0 +1,79 @@
+import pytest
+import app.services.semantic_cache as semantic_cache_module
+from app.services.semantic_cache import SemanticCache, normalize_question, question_numbers
+
+QUESTION = "제 신용점수를 올리는 방법을 알려주세요."
+
+
+def test_similar_question_reuses_answer():
+    cache = SemanticCache(threshold=0.8)
+    cache.store("C1", 1, QUESTION, "응답")
+
+    answer, score = cache.lookup("C1", 1, "제 신용 점수를 올리는 방법 알려줘")
+    assert answer == "응답"
+    assert score >= 0.8
+    assert cache.stats()["hits"] == 1
+
+
+def test_threshold_rejects_weaker_match():
+    question = "제 신용점수를 빨리 올리는 방법이 있을까요"
+    loose = SemanticCache(threshold=0.0)
+    loose.store("C1", 1, QUESTION, "응답")
+    _, similarity = loose.lookup("C1", 1, question)
+
+    strict = SemanticCache(threshold=similarity + 0.01)
+    strict.store("C1", 1, QUESTION, "응답")
+    assert strict.lookup("C1", 1, question) is None
+    assert strict.stats()["misses"] == 1
+
+
+def test_different_numbers_are_different_questions():
+    cache = SemanticCache(threshold=0.5)
+    cache.store("C1", 1, "3개월 후 신용점수는 어떻게 되나요?", "3개월 응답")
+    cache.store("C1", 1, "1,000만원 대출이 가능한가요?", "천만원 응답")
+
+    assert cache.lookup("C1", 1, "6개월 후 신용점수는 어떻게 되나요?") is None
+    assert cache.lookup("C1", 1, "3개월 후 신용점수는 어떻게 되나요")[0] == "3개월 응답"
+    assert cache.lookup("C1", 1, "1000만 원 대출이 가능한가요")[0] == "천만원 응답"
+    assert cache.lookup("C1", 1, "1000원 대출이 가능한가요") is None
+
+
+def test_data_version_change_drops_customer_entries():
+    cache = SemanticCache(threshold=0.8)
+    cache.store("C1", 1, QUESTION, "이전 응답")
+
+    assert cache.lookup("C1", 2, QUESTION) is None
+    assert cache.lookup("C2", 1, QUESTION) is None
+    cache.store("C1", 2, QUESTION, "새 응답")
+    assert cache.lookup("C1", 2, QUESTION)[0] == "새 응답"
+    assert cache.lookup("C1", 1, QUESTION) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_store_bounds_entries_and_customers(monkeypatch):
+    monkeypatch.setattr(semantic_cache_module, "MAX_ENTRIES_PER_CUSTOMER", 2)
+    monkeypatch.setattr(semantic_cache_module, "MAX_CUSTOMERS", 2)
+    cache = SemanticCache(threshold=0.99)
+
+    for i, question in enumerate(["연체 기록 영향", "대출 한도 조회", "저축 습관 개선"]):
+        cache.store("C1", 1, question, f"응답{i}")
+    assert cache.lookup("C1", 1, "연체 기록 영향") is None
+    assert cache.lookup("C1", 1, "저축 습관 개선")[0] == "응답2"
+
+    cache.store("C2", 1, QUESTION, "응답")
+    cache.store("C3", 1, QUESTION, "응답")
+    assert cache.stats()["customers"] == 2
+    assert cache.lookup("C1", 1, "저축 습관 개선") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3개월 후 1,000만원", ("1000만원", "3개월")),
+    ("금리 4.5% 와 12 개월", ("12개월", "4.5%")),
+    ("숫자 없음", ()),
+])
+def test_question_numbers(text, expected):
+    assert question_numbers(text) == expected
+
+
+def test_normalize_question_strips_request_endings():
+    assert normalize_question("신용점수를 알려주세요!") == normalize_question("신용점수를 알려 줘")
@@ -0,0 +1,46 @@
+import app.utils.shared_cache as shared_cache
+from app.utils.shared_cache import SharedCache, get_shared_cache
+
+
+def test_round_trip_and_counters(workdir):
+    cache = SharedCache("cache.sqlite3")
+    cache.set_json("a", {"x": 1})
+    cache.incr("count:b", 2)
+    cache.incr("count:b")
+
+    assert cache.get_json("a") == {"x": 1}
+    assert cache.get_bytes("missing") is None
+    assert cache.counters("count:") == {"b": 3}
+    cache.delete_prefix("count:")
+    assert cache.counters("count:") == {}
+
+
+def test_expired_entries_are_purged_on_writes(workdir, monkeypatch):
+    monkeypatch.setattr(shared_cache, "PURGE_EVERY_WRITES", 3)
+    cache = SharedCache("cache.sqlite3")
+    cache.set_bytes("old1", b"x", ttl=-1)
+    cache.set_bytes("old2", b"x", ttl=-1)
+    assert cache.get_bytes("old1") is None
+    assert cache.stats()["entries"] == 2
+
+    cache.set_bytes("new", b"y")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["purged"] == 2
+    assert cache.get_bytes("new") == b"y"
+
+
+def test_customer_entry_is_replaced_when_data_changes(store):
+    customer_id = store.customer_ids()[0]
+    store.get_customer(customer_id)
+    before = get_shared_cache().stats()["entries"]
+
+    latest = dict(store.get_entry(customer_id)["summary"]["latest"])
+    latest["month"] = "2099-01-01"
+    store.append_monthly_data(customer_id, [latest])
+    store._cache.clear()
+
+    assert store.get_customer(customer_id)["monthly_data"].to_dicts()[-1]["month"] == "2099-01-01"
+    # 버전마다 새 항목을 만들지 않고 고객 항목을 덮어씀
+    assert get_shared_cache().stats()["entries"] == before
+    assert get_shared_cache().get_json(f"customer:{customer_id}")["version"] == store.data_version(customer_id)[0]
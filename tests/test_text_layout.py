@@ -0,0 +1,55 @@
+import io
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+from app.utils.text_layout import NO_LINE_START, TextFlow, parse_blocks, wrap_text
+
+FONT = "Helvetica"
+
+
+def test_wrap_text_fits_measured_width():
+    text = " ".join(f"word{i} WWW iii" for i in range(40))
+
+    lines = wrap_text(text, 150, FONT, 10)
+
+    assert " ".join(lines) == text
+    assert all(pdfmetrics.stringWidth(line, FONT, 10) <= 150 for line in lines)
+    # 좁은 글자(i)가 많은 줄은 넓은 글자(W)가 많은 줄보다 많이 담음
+    assert len(wrap_text("i " * 100, 150, FONT, 10)) < len(wrap_text("W " * 100, 150, FONT, 10))
+
+
+def test_long_word_breaks_without_leading_punctuation():
+    word = "A" * 30 + "." * 3 + "B" * 30
+
+    lines = wrap_text(word, 100, FONT, 10)
+
+    assert "".join(lines) == word
+    assert len(lines) > 1
+    assert not any(line[0] in NO_LINE_START for line in lines)
+
+
+def test_parse_blocks():
+    text = "# **제목**\n\n\n본문 `코드`\n- 항목\n  * 중첩 항목\n1. 첫째\n#### 깊은 제목"
+
+    assert parse_blocks(text) == [
+        ("heading", 1, None, "제목"),
+        ("blank", 0, None, ""),
+        ("paragraph", 0, None, "본문 코드"),
+        ("bullet", 0, "•", "항목"),
+        ("bullet", 1, "•", "중첩 항목"),
+        ("numbered", 0, "1.", "첫째"),
+        ("heading", 3, None, "깊은 제목"),
+    ]
+    assert parse_blocks(None) == []
+
+
+def test_text_flow_adds_pages():
+    c = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    started = []
+    flow = TextFlow(c, 50, 800, 400, FONT, on_new_page=started.append)
+
+    flow.add("## Heading\n" + "\n".join(f"- item {i}" for i in range(120)))
+    y = flow.finish()
+
+    assert flow.pages == len(started) + 1 > 1
+    assert flow.bottom - flow.leading <= y < flow.top
@@ -0,0 +1,68 @@
+import httpx
+import openai
+import pytest
+from app.services import text_summarizer
+from app.services.text_summarizer import (LLM_MAX_INPUT_TOKENS, LLM_TEXTS_PER_CALL, extractive_summaries,
+                                          llm_batches, summarize_texts)
+
+
+def long_text(i, sentences=40):
+    return " ".join(f"고객 {i}의 {j}번째 분석 문장은 서로 다른 수치 {i * 100 + j}를 담고 있습니다." for j in range(sentences))
+
+
+def test_llm_batches_respect_text_and_token_limits():
+    short = ["짧은 텍스트"] * (LLM_TEXTS_PER_CALL * 2 + 1)
+    assert [len(batch) for batch in llm_batches(short)] == [LLM_TEXTS_PER_CALL, LLM_TEXTS_PER_CALL, 1]
+
+    texts = ["가" * LLM_MAX_INPUT_TOKENS, "나" * 10, "다" * LLM_MAX_INPUT_TOKENS * 3]
+    batches = llm_batches(texts)
+    assert batches == [[0, 1], [2]]  # 상한을 넘는 텍스트 하나는 단독으로 보냄
+    for batch in batches[:-1]:
+        assert sum(len(texts[i]) // 2 for i in batch) <= LLM_MAX_INPUT_TOKENS
+
+
+def test_extractive_summary_keeps_short_text():
+    results = extractive_summaries(["한 문장입니다.", long_text(1)], sentences=3)
+
+    assert results[0] == {"summary": "한 문장입니다.", "method": "original", "coverage": 1.0}
+    assert results[1]["method"] == "extractive"
+    assert len(text_summarizer.split_sentences(results[1]["summary"])) == 3
+
+
+def test_summarize_texts_calls_llm_per_batch_and_falls_back_per_batch(workdir, monkeypatch):
+    monkeypatch.setattr(text_summarizer, "LLM_TEXTS_PER_CALL", 4)
+    calls = []
+
+    def fake_llm_summaries(texts, sentences, priority):
+        calls.append(list(texts))
+        if len(calls) == 2:
+            request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+            raise openai.BadRequestError("context length exceeded", response=httpx.Response(400, request=request),
+                                         body=None)
+        return [f"요약 {len(calls)}"] * len(texts)
+
+    monkeypatch.setattr(text_summarizer, "llm_summaries", fake_llm_summaries)
+    texts = [long_text(i) for i in range(10)]
+
+    result = summarize_texts(texts, mode="llm")
+
+    assert [len(batch) for batch in calls] == [4, 4, 2]
+    assert result["stats"]["llm_calls"] == 3
+    assert result["stats"]["llm"] == 6 and result["stats"]["fallback"] == 4
+    methods = [r["method"] for r in result["results"]]
+    assert methods == ["llm"] * 4 + ["fallback"] * 4 + ["llm"] * 2
+    # 대체 요약은 같은 요청의 추출 요약 결과 (IDF를 함께 계산)
+    assert result["results"][4]["summary"] == extractive_summaries(texts)[4]["summary"]
+
+    # LLM 결과는 캐시되고, 대체 요약한 텍스트만 다시 LLM을 시도함
+    calls.clear()
+    again = summarize_texts(texts, mode="llm")
+    assert calls == [texts[4:8]]
+    assert again["stats"]["cached"] == 6
+
+
+def test_summarize_texts_rejects_bad_input(workdir):
+    with pytest.raises(ValueError):
+        summarize_texts(["텍스트"], mode="unknown")
+    with pytest.raises(ValueError):
+        summarize_texts(["텍스트"] * (text_summarizer.MAX_TEXTS + 1))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from app.services.timeseries import build_series, bucket_means, lttb_indices, select_range
+
+
+def test_lttb_keeps_endpoints_and_count():
+    y = np.sin(np.linspace(0, 20, 1000))
+    idx = lttb_indices(y, 50)
+
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(500)
+    y[123], y[377] = 100.0, -80.0
+
+    idx = lttb_indices(y, 20)
+
+    assert 123 in idx and 377 in idx
+
+
+@pytest.mark.parametrize("threshold", [2, 10, 11])
+def test_lttb_returns_all_points_when_not_reducing(threshold):
+    np.testing.assert_array_equal(lttb_indices(np.arange(10.0), threshold), np.arange(10))
+
+
+def test_bucket_means():
+    starts, means = bucket_means(np.arange(10.0), 5)
+
+    np.testing.assert_array_equal(starts, [0, 2, 4, 6, 8])
+    np.testing.assert_allclose(means, [0.5, 2.5, 4.5, 6.5, 8.5])
+
+
+def test_build_series_selects_range_and_downsamples():
+    months = np.arange("2000-01", "2010-01", dtype="datetime64[M]").astype("datetime64[D]")
+    scores = 700 + 50 * np.sin(np.arange(len(months)) / 5)
+    columns = {"month": months, "credit_score": scores, "debt": scores * 10}
+
+    window = select_range(months, "2005-01", "2005-12")
+    assert (window.start, window.stop) == (60, 72)
+
+    result = build_series(columns, ["credit_score", "debt"], "2001-01", "2008-12", max_points=24)
+    assert result["total_points"] == 96 and result["downsampled"]
+    assert len(result["months"]) == len(result["series"]["debt"]) == 24
+    assert result["months"][0] == "2001-01-01" and result["months"][-1] == "2008-12-01"
+    # 모든 항목은 첫 항목 기준으로 고른 같은 월의 값
+    np.testing.assert_allclose(np.array(result["series"]["debt"]), np.array(result["series"]["credit_score"]) * 10)
+
+    with pytest.raises(ValueError):
+        build_series(columns, ["unknown"])